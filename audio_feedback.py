@@ -0,0 +1,118 @@
+import io
+import math
+import queue
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+import wave
+
+DEFAULT_BACKEND = "wav"
+
+
+def make_tone_wav(frequency=1000, duration=0.2, rate=22050, volume=0.5):
+    """Renders a sine beep as in-memory WAV bytes."""
+    frames = int(rate * duration)
+    samples = (int(volume * 32767 * math.sin(2 * math.pi * frequency * i / rate)) for i in range(frames))
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b"".join(struct.pack("<h", s) for s in samples))
+    return buffer.getvalue()
+
+
+# --- Backends ---
+class NullBackend:
+    """Plays nothing; counts beeps so tests can assert on them."""
+
+    name = "null"
+
+    def __init__(self):
+        self.played = 0
+
+    def play(self):
+        self.played += 1
+
+
+class BellBackend:
+    """Rings the terminal bell."""
+
+    name = "bell"
+
+    def play(self):
+        sys.stdout.write("\a")
+        sys.stdout.flush()
+
+
+class WavBackend:
+    """Plays a precomputed WAV beep (winsound on Windows, aplay/paplay elsewhere)."""
+
+    name = "wav"
+
+    def __init__(self, frequency=1000, duration=0.2):
+        self.wav = make_tone_wav(frequency, duration)
+        if sys.platform == "win32":
+            import winsound
+            self._winsound = winsound
+            return
+
+        self._winsound = None
+        self._player = shutil.which("aplay") or shutil.which("paplay")
+        if not self._player:
+            raise RuntimeError("No audio player found (install alsa-utils or pulseaudio-utils).")
+
+    def play(self):
+        if self._winsound:
+            self._winsound.PlaySound(self.wav, self._winsound.SND_MEMORY)
+        else:
+            # Both players read the WAV from stdin when given no file, so nothing is written to disk
+            subprocess.run([self._player], input=self.wav, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+BACKENDS = {backend.name: backend for backend in (WavBackend, BellBackend, NullBackend)}
+
+
+def get_audio_backend(name=DEFAULT_BACKEND):
+    """Creates the named backend, falling back to the terminal bell if it cannot run here."""
+    try:
+        return BACKENDS[name]()
+    except (RuntimeError, ImportError, OSError) as e:
+        print(f"Audio backend '{name}' unavailable ({e}); using terminal bell.")
+        return BellBackend()
+
+
+class AudioFeedback:
+    """Plays feedback sounds on a dedicated thread so scanning never waits on audio.
+
+    beep() only enqueues a request. If sounds are still pending the request
+    is dropped, so a burst of scans does not build up a backlog of beeps.
+    """
+
+    def __init__(self, backend=DEFAULT_BACKEND, max_pending=2):
+        self.backend = get_audio_backend(backend) if isinstance(backend, str) else backend
+        self._requests = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="audio-feedback", daemon=True)
+        self._thread.start()
+
+    def beep(self):
+        try:
+            self._requests.put_nowait(True)
+        except queue.Full:
+            pass
+
+    def stop(self):
+        self._requests.put(None)
+        self._thread.join(1.0)
+
+    def _run(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            try:
+                self.backend.play()
+            except Exception as e:
+                print(f"Audio feedback error: {e}")
@@ -0,0 +1,168 @@
+"""Synthetic barcode corpus generator and decode-throughput benchmark suite.
+
+    python barcode_corpus.py generate corpus/            # render every products.barcode
+    python barcode_corpus.py bench corpus/ --json bench.json
+
+`generate` renders EAN-13, CODE128 and QR images for every barcode in the
+products table and writes one folder per distortion level (blur, rotation,
+noise, perspective, scale), each with a manifest.csv of ground truth.
+`bench` runs decoder_benchmark over every folder and reports decodes/sec
+and success rate, so scanner changes can be compared run to run.
+"""
+import argparse
+import csv
+import json
+import os
+import random
+
+import barcode
+import cv2
+import numpy as np
+import qrcode
+from barcode.writer import ImageWriter
+
+from database import get_connection
+from decoder_benchmark import print_report, run_benchmark
+
+CANVAS_SIZE = (640, 480)
+SYMBOLOGIES = ("EAN13", "CODE128", "QRCODE")
+
+# Distortion name -> levels rendered for each barcode
+DISTORTIONS = {
+    "clean": [0],
+    "blur": [1.0, 2.0, 3.0],             # Gaussian sigma in pixels
+    "rotation": [5, 15, 30, 45],         # Degrees
+    "noise": [10, 25, 40],               # Gaussian noise std dev
+    "perspective": [0.05, 0.1, 0.15],    # Corner jitter as a fraction of the code size
+    "scale": [0.35, 0.5, 0.75, 1.25],    # Size relative to the clean render
+}
+
+
+def catalog_barcodes(db_path="cart_database.db"):
+    return [row[0] for row in get_connection(db_path).execute("SELECT barcode FROM products ORDER BY product_id")]
+
+
+def render_code(data, symbology):
+    """Renders one code as a gray image; returns (image, encoded_data) or None if data cannot be encoded."""
+    if symbology == "QRCODE":
+        image = qrcode.make(data, box_size=6, border=4).convert("L")
+        return np.array(image), data
+
+    if symbology == "EAN13":
+        if not (data.isdigit() and len(data) in (12, 13)):
+            return None
+        code = barcode.get("ean13", data[:12], writer=ImageWriter())
+    else:
+        code = barcode.get("code128", data, writer=ImageWriter())
+    image = code.render({"module_width": 0.3, "module_height": 12, "quiet_zone": 6, "write_text": False})
+    # EAN-13 recomputes the check digit, so the ground truth is what was actually drawn
+    return np.array(image.convert("L")), code.get_fullcode()
+
+
+def place_on_canvas(code_image, rng):
+    """Centres the code on a light, slightly uneven background the size of a camera frame."""
+    width, height = CANVAS_SIZE
+    canvas = np.full((height, width), rng.randint(200, 240), np.uint8)
+    canvas = cv2.GaussianBlur(canvas + np.uint8(rng.randint(0, 10)), (0, 0), 5)
+
+    h, w = code_image.shape
+    fit = min(1.0, 0.6 * width / w, 0.6 * height / h)
+    if fit < 1.0:
+        code_image = cv2.resize(code_image, None, fx=fit, fy=fit, interpolation=cv2.INTER_AREA)
+        h, w = code_image.shape
+    y, x = (height - h) // 2, (width - w) // 2
+    canvas[y:y + h, x:x + w] = code_image
+    return canvas, (x, y, w, h)
+
+
+def apply_distortion(canvas, box, kind, level, rng):
+    height, width = canvas.shape
+    border = int(canvas[0, 0])
+
+    if kind == "blur":
+        return cv2.GaussianBlur(canvas, (0, 0), level)
+    if kind == "rotation":
+        matrix = cv2.getRotationMatrix2D((width / 2, height / 2), level, 1.0)
+        return cv2.warpAffine(canvas, matrix, (width, height), borderValue=border)
+    if kind == "noise":
+        noise = np.random.default_rng(rng.randint(0, 2 ** 31)).normal(0, level, canvas.shape)
+        return np.clip(canvas.astype(np.float32) + noise, 0, 255).astype(np.uint8)
+    if kind == "perspective":
+        x, y, w, h = box
+        src = np.float32([[x, y], [x + w, y], [x + w, y + h], [x, y + h]])
+        jitter = level * max(w, h)
+        dst = src + np.float32([[rng.uniform(-jitter, jitter), rng.uniform(-jitter, jitter)] for _ in range(4)])
+        matrix = cv2.getPerspectiveTransform(src, dst)
+        return cv2.warpPerspective(canvas, matrix, (width, height), borderValue=border)
+    if kind == "scale":
+        matrix = cv2.getRotationMatrix2D((width / 2, height / 2), 0, level)
+        interpolation = cv2.INTER_AREA if level < 1 else cv2.INTER_LINEAR
+        return cv2.warpAffine(canvas, matrix, (width, height), flags=interpolation, borderValue=border)
+    return canvas
+
+
+def generate_corpus(out_dir, barcodes, seed=0):
+    """Writes out_dir/<distortion>_<level>/ image folders with manifests; returns the image count."""
+    rng = random.Random(seed)
+    renders = []
+    for data in barcodes:
+        for symbology in SYMBOLOGIES:
+            rendered = render_code(data, symbology)
+            if rendered is not None:
+                renders.append((symbology, rendered[1], rendered[0]))
+
+    count = 0
+    for kind, levels in DISTORTIONS.items():
+        for level in levels:
+            folder = os.path.join(out_dir, kind if kind == "clean" else f"{kind}_{level}")
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, "manifest.csv"), "w", newline="", encoding="utf-8") as f:
+                manifest = csv.writer(f)
+                manifest.writerow(["file", "data", "symbology"])
+                for i, (symbology, data, code_image) in enumerate(renders):
+                    canvas, box = place_on_canvas(code_image, rng)
+                    image = apply_distortion(canvas, box, kind, level, rng)
+                    name = f"{i:05d}_{symbology}.png"
+                    cv2.imwrite(os.path.join(folder, name), image)
+                    manifest.writerow([name, data, symbology])
+                    count += 1
+    return count
+
+
+def run_suite(corpus_dir, backends=None, repeat=1):
+    """Benchmarks every corpus folder; returns {folder: {backend: stats}}."""
+    results = {}
+    for folder in sorted(os.listdir(corpus_dir)):
+        path = os.path.join(corpus_dir, folder)
+        if os.path.isfile(os.path.join(path, "manifest.csv")):
+            results[folder] = run_benchmark(path, backends, repeat=repeat)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic barcode corpus and benchmark decoders on it.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="Render the corpus from the products table")
+    gen.add_argument("out_dir")
+    gen.add_argument("--db", default="cart_database.db")
+    gen.add_argument("--seed", type=int, default=0)
+
+    bench = sub.add_parser("bench", help="Benchmark decoder backends over a generated corpus")
+    bench.add_argument("corpus_dir")
+    bench.add_argument("--backends", nargs="+")
+    bench.add_argument("--repeat", type=int, default=1)
+    bench.add_argument("--json", help="Also write the results to this JSON file")
+
+    args = parser.parse_args()
+    if args.command == "generate":
+        total = generate_corpus(args.out_dir, catalog_barcodes(args.db), args.seed)
+        print(f"{total} images written to '{args.out_dir}'.")
+    else:
+        suite = run_suite(args.corpus_dir, args.backends, args.repeat)
+        for folder, results in suite.items():
+            print(f"\n=== {folder} ===", end="")
+            print_report(results)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(suite, f, indent=2)
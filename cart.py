@@ -1,11 +1,25 @@
 from itertools import product
+import logging
+import os
 import tkinter as tk
 from tkinter import ttk, messagebox, font
-import winsound
-import cv2
-from pyzbar.pyzbar import decode, ZBarSymbol
 import sqlite3
-import threading
+from PIL import Image, ImageDraw, ImageTk
+from scanner import ScannerService, SCANNER_CONFIG
+from audio_feedback import AudioFeedback
+from ui_dispatcher import ScanEventQueue
+from latency import LatencyTracker
+from symbology import SymbologyProfile
+from catalog import CatalogCache
+from catalog_snapshot import SNAPSHOT_PATH, SnapshotCatalog
+from sampling import CatalogSampler
+from product_search import search_products
+from cart_engine import Cart, unit_price
+
+log = logging.getLogger(__name__)
+
+LATENCY_REPORT_PATH = "scan_latency.json"  # Per-stage histograms are written here on exit
+PROFILE_CHECK_MS = 5000  # How often to check whether the catalog changed the symbology profile
 
 # --- Theme Constants ---
 THEME = {
@@ -20,9 +34,32 @@ class SmartCartApp(tk.Frame):
         self.controller = controller
         self.configure(bg=THEME["bg"])
         
-        self.cart_items = {}
+        self.cart = Cart()
         self.total = 0.0
         self.saved = 0.0
+        self.audio = AudioFeedback()
+        self.latency = LatencyTracker()
+        self._overlay_job = None
+        # Only decode the symbologies the catalog uses and drop reads that can't be a catalog code
+        # Products are looked up in memory: from a memory-mapped snapshot if one has been
+        # exported (opens instantly), otherwise from a cache loaded out of the database.
+        # Either one picks up changes in the background.
+        if os.path.exists(SNAPSHOT_PATH):
+            self.catalog = SnapshotCatalog(SNAPSHOT_PATH)
+        else:
+            self.catalog = CatalogCache('cart_database.db').load()
+        self.catalog.start()
+        self.sampler = CatalogSampler(self.catalog)
+        profile = SymbologyProfile.for_catalog(self.catalog, SCANNER_CONFIG["extra_symbols"])
+        self._profile_generation = self.catalog.generation
+        self.scanner = ScannerService(self._on_scan, on_stats=self._on_scanner_stats,
+                                      on_error=lambda msg: self.after(0, self.update_status, msg, "error"),
+                                      tracker=self.latency, profile=profile)
+        self.scan_events = ScanEventQueue(self, self._process_scan_batch)
+        self._pending_products = []   # (product, traced) waiting for a popup; traced = came from a scan
+        self._active_popup = None
+        self._traced_popup = None   # Barcode of the scan the open popup belongs to, until it is confirmed
+        self._awaiting_display = set()   # Added barcodes whose row hasn't been drawn yet
         # self.tax_rate = 0.05
 
         self.fonts = {
@@ -37,8 +74,16 @@ class SmartCartApp(tk.Frame):
 
         self._configure_styles()
         self._create_widgets()
+        # Cart changes reach the table row by row, batched per idle callback
+        self.cart_view = CartTreeRenderer(self.tree, self.cart, self._on_cart_rendered)
+        self.cart.on_change = self.cart_view.changed
         self._update_totals()
         self._toggle_cart_view()
+        self.scan_events.start()
+        self.after(PROFILE_CHECK_MS, self._check_symbology_profile)
+
+        # F12 shows the scan latency overlay
+        self.bind_all("<F12>", lambda e: self.toggle_latency_overlay())
 
     def on_show(self):
         """Called when this screen appears"""
@@ -46,10 +91,38 @@ class SmartCartApp(tk.Frame):
         # Optional: Clear cart if coming from a fresh start
         # self.cart_items = {}
         # self._update_cart_display()
-        # Start background scanning thread
-        self.stop_scanner = False
-        self.scan_thread = threading.Thread(target=self.scan_with_camera, daemon=True)
-        self.scan_thread.start()
+        # Start (or resume) the background scanner
+        self.scan_with_camera()
+
+    def on_hide(self):
+        """Called when another screen is raised (checkout, payment, ...)"""
+        self.pause_scanner()
+
+    def on_close(self):
+        self.scanner.stop()
+        self.audio.stop()
+        self.catalog.stop()
+        self.latency.dump_json(LATENCY_REPORT_PATH)
+
+    def _check_symbology_profile(self):
+        """Rebuilds the scanner's symbology profile after the catalog has reloaded (import, sync, edit)."""
+        if self.catalog.generation != self._profile_generation:
+            self._profile_generation = self.catalog.generation
+            self.scanner.set_profile(SymbologyProfile.for_catalog(self.catalog, SCANNER_CONFIG["extra_symbols"]))
+        self.after(PROFILE_CHECK_MS, self._check_symbology_profile)
+
+    def toggle_latency_overlay(self):
+        if self._overlay_job is not None:
+            self.after_cancel(self._overlay_job)
+            self._overlay_job = None
+            self.latency_overlay.place_forget()
+        else:
+            self.latency_overlay.place(relx=1.0, rely=0.0, anchor="ne", x=-10, y=10)
+            self._refresh_latency_overlay()
+
+    def _refresh_latency_overlay(self):
+        self.latency_overlay.config(text=self.latency.overlay_text())
+        self._overlay_job = self.after(1000, self._refresh_latency_overlay)
 
     def _configure_styles(self):
         style = ttk.Style()
@@ -83,6 +156,11 @@ class SmartCartApp(tk.Frame):
         # Header
         ttk.Label(main_frame, text="SMART CART DASHBOARD", font=self.fonts["header"]).grid(row=0, column=0, sticky="w", pady=(0, 25))
 
+        # Camera Preview (rendered by Tk from the scanner's latest decoded frame)
+        self.preview = CameraPreview(main_frame, lambda: self.scanner, SCANNER_CONFIG["preview_fps"], SCANNER_CONFIG["preview_size"])
+        if SCANNER_CONFIG["preview"]:
+            self.preview.grid(row=0, column=0, sticky="e", pady=(0, 25))
+
         # Cart List
         self.cart_frame = ttk.Frame(main_frame, style='Card.TFrame')
         self.cart_frame.grid(row=1, column=0, sticky="nsew")
@@ -116,12 +194,19 @@ class SmartCartApp(tk.Frame):
         # Buttons
         btn_frame = ttk.Frame(main_frame)
         btn_frame.grid(row=3, column=0, sticky="ew", pady=30)
-        btn_frame.columnconfigure((0, 1, 2, 3), weight=1)
+        btn_frame.columnconfigure((0, 1, 2, 3, 4), weight=1)
 
         ttk.Button(btn_frame, text="📷 SCAN", command=self.scan_with_camera, style='Accent.TButton').grid(row=0, column=0, padx=5, sticky="ew")
-        ttk.Button(btn_frame, text="🎲 SIMULATE", command=self.simulate_scan).grid(row=0, column=1, padx=5, sticky="ew")
-        ttk.Button(btn_frame, text="🗑 REMOVE", command=self.remove_item, style='Danger.TButton').grid(row=0, column=2, padx=5, sticky="ew")
-        ttk.Button(btn_frame, text="✔ CHECKOUT", command=self.checkout, style='Success.TButton').grid(row=0, column=3, padx=5, sticky="ew")
+        # Manual lookup by name (or printed digits) when a label won't scan
+        self.search_panel = ProductSearchPanel(btn_frame, self.add_searched_product)
+        self.search_panel.grid(row=0, column=1, padx=5, sticky="nsew")
+        ttk.Button(btn_frame, text="🎲 SIMULATE", command=self.simulate_scan).grid(row=0, column=2, padx=5, sticky="ew")
+        ttk.Button(btn_frame, text="🗑 REMOVE", command=self.remove_item, style='Danger.TButton').grid(row=0, column=3, padx=5, sticky="ew")
+        ttk.Button(btn_frame, text="✔ CHECKOUT", command=self.checkout, style='Success.TButton').grid(row=0, column=4, padx=5, sticky="ew")
+
+        # Latency Overlay (toggled with F12)
+        self.latency_overlay = tk.Label(self, text="", justify="left", anchor="nw", font=("Courier", 9),
+                                        bg=THEME["card"], fg=THEME["gray"], padx=10, pady=10)
 
         # Status Bar
         self.status_bar = ttk.Label(self, text="Welcome", padding=10, background=THEME["primary"], foreground=THEME["white"])
@@ -129,75 +214,79 @@ class SmartCartApp(tk.Frame):
         
     #scan with camera
     def scan_with_camera(self):
-        # --- TESTING TOGGLE ---
-        SHOW_CAMERA_WINDOW = True  # Set to False to hide the camera view
-        # ----------------------
-
-        active_index = 1
-        cap = cv2.VideoCapture(active_index)
-        
-        if not cap.isOpened():
+        """Starts or resumes the background scanner; returns immediately"""
+        if not self.scanner.start():
             self.update_status("Scanner Error: Camera not found.", "error")
-            return
-
-        last_barcode = None
-
-        while not self.stop_scanner:
-            success, frame = cap.read()
-            if not success:
-                break
-
-            display_frame = cv2.resize(frame, (640, 480))
-            gray = cv2.cvtColor(display_frame, cv2.COLOR_BGR2GRAY)
-
-            detectedBarcodes = decode(gray, symbols=[
-                ZBarSymbol.QRCODE, 
-                ZBarSymbol.EAN13, 
-                ZBarSymbol.CODE128
-            ])
-
-            if not detectedBarcodes:
-                last_barcode = None
-            else:
-                for barcode in detectedBarcodes:
-                    barcode_data = barcode.data.decode('utf-8')
-                    
-                    if barcode_data != last_barcode:
-                        winsound.Beep(1000, 200) 
-                        last_barcode = barcode_data
-                        
-                        # Use self.after to interact with UI from a background thread safely
-                        self.after(0, self._process_barcode, barcode_data)
-            
-            # --- Logic to Hide/Show Window ---
-            if SHOW_CAMERA_WINDOW:
-                cv2.imshow('Background Scanner', display_frame)
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break
-            else:
-                # Still need waitKey for OpenCV to process background events
-                cv2.waitKey(10) 
-
-        cap.release()
-        cv2.destroyAllWindows()
+        elif SCANNER_CONFIG["preview"]:
+            self.preview.start()
+
+    def pause_scanner(self):
+        self.scanner.pause()
+        self.preview.stop()
+
+    def _on_scan(self, barcode, frame):
+        """Called from a decode worker once per physical presentation of a barcode"""
+        barcode_data = barcode.data.decode('utf-8')
+        self.audio.beep()  # Queued; never blocks the scanner
+
+        # Hand off to the Tk loop, which drains scan events in batches
+        self.scan_events.post(barcode_data, frame.captured_at)
+
+    def _on_scanner_stats(self, stats):
+        # Diagnostics only; called from the scanner thread
+        log.debug("Scanner: %s fps captured, %s fps decoded, queue depth %s, %s frames dropped, %s reads rejected",
+                  stats['capture_fps'], stats['decode_fps'], stats['queue_depth'], stats['dropped_frames'],
+                  stats['rejected_reads'])
+        latency = self.scan_events.latency_summary()
+        log.debug("Scan events: capture->queue %s ms, queue->display %s ms over %s batches",
+                  latency['scanner_side']['mean_ms'], latency['ui_side']['mean_ms'], latency['batches'])
         
         
-    def _process_barcode(self, barcode_data):
-        """Helper to handle DB lookup and UI updates on the main thread"""
-        try:
-            conn = sqlite3.connect('cart_database.db')
-            cursor = conn.cursor()
-            cursor.execute("SELECT barcode, product_name, mrp, discount, quantity_value, quantity_unit FROM products WHERE barcode=?", (barcode_data,))
-            product = cursor.fetchone()
-            conn.close()
-
-            if product:
-                ProductPopup(self, product, self.confirm_add_item)
-                self.update_status(f"Previewing: {product[1]}")
+    def _process_scan_batch(self, events):
+        """Runs on the Tk thread: one catalog lookup round and one UI update for every scan since the last tick"""
+        codes = list(dict.fromkeys(event.barcode for event in events))
+        found = self.catalog.lookup(codes)
+
+        for code in codes:
+            if code in found:
+                self.latency.mark(code, "lookup")
             else:
-                self.update_status(f"Barcode {barcode_data} not found.", "error")
-        except sqlite3.Error as e:
-            self.update_status(f"Database error: {e}", "error")
+                self.latency.discard(code)
+        self._pending_products.extend((found[code], True) for code in codes if code in found)
+        missing = [code for code in codes if code not in found]
+        if missing:
+            self.update_status(f"Barcode {', '.join(missing)} not found.", "error")
+        self._show_next_popup()
+
+    def add_searched_product(self, product):
+        """A product picked in the search panel goes through the same popup queue as a scan.
+
+        It is not latency-traced: it never passed through capture, decode or lookup."""
+        self._pending_products.append((product, False))
+        self._show_next_popup()
+
+    def _show_next_popup(self):
+        """Shows queued scans one popup at a time"""
+        if self._active_popup is not None or not self._pending_products:
+            return
+        product, traced = self._pending_products.pop(0)
+        self._active_popup = ProductPopup(self, product, self.confirm_add_item)
+        self._traced_popup = product[0] if traced else None
+        if traced:
+            self.latency.mark(product[0], "popup")
+        self._active_popup.bind("<Destroy>", self._on_popup_closed)
+
+        waiting = len(self._pending_products)
+        self.update_status(f"Previewing: {product[1]}" + (f" (+{waiting} more)" if waiting else ""))
+
+    def _on_popup_closed(self, event):
+        if event.widget is self._active_popup:
+            self._active_popup = None
+            if self._traced_popup is not None:
+                # Closed without confirming: the scan never reaches the cart, so drop its trace
+                self.latency.discard(self._traced_popup)
+                self._traced_popup = None
+            self.after_idle(self._show_next_popup)
 
     #Scan with Camera
     # def scan_with_camera(self):
@@ -263,45 +352,31 @@ class SmartCartApp(tk.Frame):
     # Simulate Scan from Database
     def simulate_scan(self):
         """Simulates scanning a random item from the database."""
-        try:
-            conn = sqlite3.connect('cart_database.db')
-            cursor = conn.cursor()
-            cursor.execute("SELECT barcode, product_name, mrp, discount, quantity_value, quantity_unit FROM products ORDER BY RANDOM() LIMIT 1")
-            product = cursor.fetchone()
-            conn.close()
-
-            if product:
-                ProductPopup(self, product, self.confirm_add_item)
-                self.update_status(f"Previewing: {product[1]}")
-                # barcode, product_name, price, discount, quantity_value, quantity_unit = product
-                # self.add_item(barcode, product_name, price, discount, quantity_value, quantity_unit)
-                # self.update_status(f"Scanned: {product_name}")
-            else:
-                self.update_status("Database is empty. No item to scan.", "error")
-        except sqlite3.Error as e:
-            self.update_status(f"Database error: {e}", "error")
-            messagebox.showinfo("Info", "Error accessing database.")
+        product = self.sampler.random_product()
+
+        if product:
+            ProductPopup(self, product, self.confirm_add_item)
+            self.update_status(f"Previewing: {product[1]}")
+            # barcode, product_name, price, discount, quantity_value, quantity_unit = product
+            # self.add_item(barcode, product_name, price, discount, quantity_value, quantity_unit)
+            # self.update_status(f"Scanned: {product_name}")
+        else:
+            self.update_status("Database is empty. No item to scan.", "error")
 
 
 
     def confirm_add_item(self, product_data, quantity):
         """Callback from popup to finalise the addition"""
         barcode, product_name, price, discount, quantity_value, quantity_unit = product_data
+        if barcode == self._traced_popup:
+            self.latency.mark(barcode, "confirm")
+            self._awaiting_display.add(barcode)
+            self._traced_popup = None
         self.add_item(barcode, product_name, price, discount, quantity_value, quantity_unit, quantity)
 
     def add_item(self, barcode, name, price, discount, quantity_value, quantity_unit, quantity=1):
-        if barcode in self.cart_items:
-            self.cart_items[barcode]['quantity'] += quantity
-        else:
-            self.cart_items[barcode] = {
-                'name': name, 
-                'price': price, 
-                'quantity': quantity, 
-                'discount': discount, 
-                'quantity_value': quantity_value, 
-                'quantity_unit': quantity_unit
-            }
-        self._update_cart_display()
+        self.cart.add(barcode, name, price, discount, quantity_value, quantity_unit, quantity,
+                      self.catalog.tax_rate(barcode))
         self.update_status(f"Added {quantity}x {name}", "success")
     
     
@@ -316,29 +391,20 @@ class SmartCartApp(tk.Frame):
     def remove_item(self):
         selected = self.tree.selection()
         if not selected: return
-        item_name = self.tree.item(selected[0], 'values')[0]
-        
-        # Find barcode by name (inefficient but works for small lists)
-        target_code = next((code for code, det in self.cart_items.items() if det['name'] == item_name), None)
-        if target_code:
-            if self.cart_items[target_code]['quantity'] > 1:
-                self.cart_items[target_code]['quantity'] -= 1
-            else:
-                del self.cart_items[target_code]
-        self._update_cart_display()
-
-    def _update_cart_display(self):
-        for i in self.tree.get_children(): self.tree.delete(i)
-        for code, item in self.cart_items.items():
-            sub_total = item['price'] * item['quantity']
-            discount = round((item['price'] * (item['discount'] / 100)) * item['quantity'], 2)
-            total = sub_total - discount
-            self.tree.insert("", "end", values=(item['name'], item['quantity'], f"₹{item['price']}", f"₹{discount}", f"₹{total}"))
+        # Rows are keyed by barcode
+        if selected[0] in self.cart:
+            self.cart.remove(selected[0])
+
+    def _on_cart_rendered(self, barcodes):
+        """Called by the renderer once a batch of changed rows is on screen."""
+        for code in barcodes & self._awaiting_display:
+            self.latency.mark(code, "display")
+        self._awaiting_display -= barcodes
         self._update_totals()
         self._toggle_cart_view()
 
     def _toggle_cart_view(self):
-        if not self.cart_items:
+        if not self.cart:
             self.empty_cart_label.grid(row=1, column=0, sticky="nsew")
             self.cart_frame.grid_remove()
         else:
@@ -347,11 +413,11 @@ class SmartCartApp(tk.Frame):
 
     # Bottom config
     def _update_totals(self):
-        self.subtotal = sum(i['price'] * i['quantity'] for i in self.cart_items.values())
-        # self.tax = self.subtotal * self.tax_rate
-        # self.total = self.subtotal + self.tax
-        self.discount = sum((i['price'] * (i['discount'] / 100)) * i['quantity'] for i in self.cart_items.values())
-        self.grand_total = self.subtotal - self.discount
+        # The cart keeps its totals current on every change; nothing is summed here
+        totals = self.cart.totals()
+        self.subtotal = totals["subtotal"]
+        self.discount = totals["discount"]
+        self.grand_total = totals["grand_total"]
         self.saved = self.discount
         
         self.subtotal_label.config(text=f"SUBTOTAL: ₹{self.subtotal:.2f}")
@@ -372,7 +438,7 @@ class SmartCartApp(tk.Frame):
     
     def checkout(self):
         """Handles the checkout process with confirmation."""
-        if not self.cart_items:
+        if not self.cart:
             messagebox.showwarning("Empty", "Your cart is empty. Please scan items to checkout.")
             return
 
@@ -381,8 +447,8 @@ class SmartCartApp(tk.Frame):
         confirm = messagebox.askokcancel("Confirm Checkout", checkout_message)
 
         if confirm:
-            self.controller.shared_data["cart_items"] = self.cart_items
-            self.controller.shared_data["cart_info"] = {"grand_total": self.grand_total, "subtotal": self.subtotal, "total_discount": self.saved}
+            self.controller.shared_data["cart_items"] = self.cart.items
+            self.controller.shared_data["cart_info"] = {"grand_total": self.grand_total, "subtotal": self.subtotal, "total_discount": self.saved, "tax": self.cart.totals()["tax"]}
             self.controller.shared_data["pending_checkout"] = True
 
             self.update_status("Redirecting to Login...", "success")
@@ -411,6 +477,176 @@ class SmartCartApp(tk.Frame):
     #     self.controller.show_frame("AuthApp")
     
     
+class CartTreeRenderer:
+    """Keeps a Treeview in step with a Cart by changing only the rows that changed.
+
+    Rows use the barcode as their iid. changed() (the Cart's on_change) only
+    records the barcode; one after_idle callback then updates, inserts or
+    deletes each recorded row, so a burst of scans or quantity changes
+    costs one redraw of the rows involved rather than a rebuild of the table.
+    """
+    def __init__(self, tree, cart, on_flush=None):
+        self.tree = tree
+        self.cart = cart
+        self.on_flush = on_flush
+        self._dirty = {}   # Ordered, so rows added in one batch keep the cart's order
+        self._job = None
+
+    def changed(self, barcode, line=None):
+        self._dirty[barcode] = None
+        if self._job is None:
+            self._job = self.tree.after_idle(self.flush)
+
+    def flush(self):
+        self._job = None
+        dirty, self._dirty = self._dirty, {}
+        for code in dirty:
+            item = self.cart.items.get(code)
+            if item is None:
+                if self.tree.exists(code):
+                    self.tree.delete(code)
+                continue
+            _, discount, total = self.cart.line_total(code)
+            values = (item['name'], item['quantity'], f"₹{item['price']}", f"₹{discount}", f"₹{total}")
+            if self.tree.exists(code):
+                self.tree.item(code, values=values)
+            else:
+                self.tree.insert("", "end", iid=code, values=values)
+        if self.on_flush is not None:
+            self.on_flush(set(dirty))
+
+
+class CameraPreview(tk.Label):
+    """Small live view of the scanner, refreshed at a capped FPS on the Tk thread.
+
+    It only re-renders when the scanner has decoded a new frame, so a static
+    scene costs nothing beyond the poll.
+    """
+    def __init__(self, parent, get_scanner, fps=10, size=(160, 120)):
+        super().__init__(parent, bg=THEME["card"])
+        self.get_scanner = get_scanner
+        self.interval = int(1000 / fps)
+        self.size = size
+        self._shown_seq = None
+        self._photo = None
+        self._job = None
+
+    def start(self):
+        if self._job is None:
+            self._tick()
+
+    def stop(self):
+        if self._job is not None:
+            self.after_cancel(self._job)
+            self._job = None
+
+    def _tick(self):
+        scanner = self.get_scanner()
+        latest = scanner.latest_frame() if scanner else None
+        if latest and latest[0].seq != self._shown_seq:
+            self._render(*latest)
+        self._job = self.after(self.interval, self._tick)
+
+    def _render(self, frame, barcodes):
+        height, width = frame.image.shape[:2]
+        image = Image.fromarray(frame.image[:, :, ::-1]).resize(self.size)
+        sx, sy = self.size[0] / width, self.size[1] / height
+        draw = ImageDraw.Draw(image)
+        for barcode in barcodes:
+            x, y, w, h = barcode.rect
+            draw.rectangle([x * sx, y * sy, (x + w) * sx, (y + h) * sy], outline=THEME["success"], width=2)
+
+        # Keep a reference so the image is not garbage collected
+        self._photo = ImageTk.PhotoImage(image)
+        self.config(image=self._photo)
+        self._shown_seq = frame.seq
+
+
+class ProductSearchPanel(tk.Frame):
+    """Search-as-you-type product lookup for items whose barcode won't scan.
+
+    Each pause in typing runs one search_products() query; matches drop
+    down above the entry and Enter, a double click or picking a row hands
+    the product to on_select.
+    """
+    def __init__(self, parent, on_select, delay_ms=150, limit=8):
+        super().__init__(parent, bg=THEME["card"])
+        self.on_select = on_select
+        self.delay_ms = delay_ms
+        self.limit = limit
+        self._matches = []
+        self._job = None
+
+        tk.Label(self, text="🔍", bg=THEME["card"], fg=THEME["gray"]).pack(side="left", padx=(10, 0))
+        self.query = tk.StringVar()
+        self.entry = tk.Entry(self, textvariable=self.query, bg=THEME["card"], fg=THEME["white"],
+                              insertbackground=THEME["white"], relief="flat", font=("Helvetica", 11), width=16)
+        self.entry.pack(side="left", fill="both", expand=True, padx=(5, 10), ipady=8)
+
+        self.results = tk.Listbox(self.winfo_toplevel(), bg=THEME["card"], fg=THEME["white"], height=limit,
+                                  selectbackground=THEME["primary"], relief="flat", font=("Helvetica", 11),
+                                  activestyle="none", highlightthickness=1, highlightcolor=THEME["primary"])
+
+        self.query.trace_add("write", lambda *args: self._schedule())
+        self.entry.bind("<Return>", self._choose)
+        self.entry.bind("<Down>", self._focus_results)
+        self.entry.bind("<Escape>", lambda e: self.clear())
+        self.results.bind("<Return>", self._choose)
+        self.results.bind("<Double-Button-1>", self._choose)
+        self.results.bind("<Escape>", lambda e: self.clear())
+
+    def clear(self):
+        self.query.set("")
+        self._hide()
+
+    def _schedule(self):
+        if self._job is not None:
+            self.after_cancel(self._job)
+        self._job = self.after(self.delay_ms, self._search)
+
+    def _search(self):
+        self._job = None
+        text = self.query.get().strip()
+        if not text:
+            self._hide()
+            return
+        try:
+            self._matches = search_products(text, self.limit)
+        except sqlite3.Error:
+            log.exception("Product search failed")
+            self._matches = []
+
+        self.results.delete(0, "end")
+        if not self._matches:
+            self.results.insert("end", "No matching products")
+        for barcode, name, price, *_ in self._matches:
+            self.results.insert("end", f"{name}  ·  ₹{price:.2f}")
+        self.results.config(height=max(len(self._matches), 1))
+        # Drop "down" above the entry, since the button row sits at the bottom of the window
+        self.results.place(in_=self, relx=0, rely=0, relwidth=1, anchor="sw", y=-4)
+        self.results.lift()
+
+    def _focus_results(self, event=None):
+        if self._matches:
+            self.results.focus_set()
+            self.results.selection_clear(0, "end")
+            self.results.selection_set(0)
+            self.results.activate(0)
+
+    def _choose(self, event=None):
+        if not self._matches:
+            return
+        selection = self.results.curselection()
+        product = self._matches[selection[0] if selection else 0]
+        self.clear()
+        self.entry.focus_set()
+        self.on_select(product)
+
+    def _hide(self):
+        self._matches = []
+        self.results.place_forget()
+
+
 class ProductPopup(tk.Toplevel):
     def __init__(self, parent, product_data, callback):
         super().__init__(parent)
@@ -436,7 +672,7 @@ class ProductPopup(tk.Toplevel):
         # Product Price info
         mrp = product_data[2]
         disc = product_data[3]
-        final_price = round(mrp - (mrp * disc/100), 2)
+        final_price = round(unit_price(mrp, disc), 2)
         tk.Label(self, text=f"Price: ₹{final_price} (MRP: ₹{mrp})", bg=THEME["card"], fg=THEME["gray"], font=("Helvetica", 11)).pack(pady=5)
 
         # Quantity Selector
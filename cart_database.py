@@ -1,9 +1,12 @@
 import sqlite3
 
-def setup_database():
+from database import DB_PATH, close_connection, get_connection
+from migrations import migrate
+
+def setup_database(db_path=DB_PATH):
     """Creates and populates the SQLite database with sample product data."""
     try:
-        conn = sqlite3.connect('cart_database.db')
+        conn = get_connection(db_path)
         cursor = conn.cursor()
 
         
@@ -127,16 +130,19 @@ def setup_database():
 
         cursor.executemany("INSERT OR IGNORE INTO orders (user_id, cart_id, total_amount, payment_status) VALUES (?,?,?,?)", sample_orders)
 
+        # The tables above are the original schema; migrations/ takes it from there
+        applied = migrate(conn)
+        if applied:
+            print(f"Applied schema migrations: {', '.join(map(str, applied))}")
 
         conn.commit()
-        print("Database 'cart_database.db' created and populated successfully.")
+        print(f"Database '{db_path}' created and populated successfully.")
         print(f"{len(products)} sample products added.")
 
     except sqlite3.Error as e:
         print(f"Database error: {e}")
     finally:
-        if conn:
-            conn.close()
+        close_connection(db_path)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,142 @@
+"""Cart contents and running totals, with no Tk dependency.
+
+SmartCartApp, the headless scanner harness and simulators all keep a cart
+the same way: Cart.items maps barcode to a line dict (name, price,
+quantity, discount, quantity_value, quantity_unit, tax_rate). Totals are
+kept up to date on every add(), remove() or set_quantity() by applying
+the changed line's difference, so each change costs O(1) however many
+lines the cart has, instead of a pass over every line.
+
+Prices are MRPs with GST included, so tax is the part of the discounted
+price that is tax; grand_total is what the customer pays.
+
+    cart = Cart()
+    cart.add("8901058851298", "Maggi Noodles", 14.0, 5.0, 70, "g", quantity=2, tax_rate=12)
+    cart.totals()   # {"subtotal": 28.0, "discount": 1.4, "tax": 2.85, "grand_total": 26.6, ...}
+"""
+
+
+def unit_price(price, discount):
+    """Price after a percentage discount."""
+    return price - price * discount / 100
+
+
+def line_amounts(line):
+    """(gross, discount, tax) for a line dict, before rounding."""
+    gross = line['price'] * line['quantity']
+    discount = gross * line['discount'] / 100
+    rate = line.get('tax_rate', 0.0)
+    tax = (gross - discount) * rate / (100 + rate)
+    return gross, discount, tax
+
+
+class Cart:
+    """Cart lines keyed by barcode, with incrementally maintained totals.
+
+    on_change, if given, is called as on_change(barcode, line) after each
+    change; line is None when the barcode left the cart.
+    """
+
+    def __init__(self, on_change=None):
+        self.items = {}
+        self.on_change = on_change
+        self._amounts = {}
+        self._clear_totals()
+
+    def _clear_totals(self):
+        self.subtotal = 0.0
+        self.discount = 0.0
+        self.tax = 0.0
+        self.units = 0
+
+    def _apply(self, barcode, line):
+        """Replaces barcode's contribution to the totals with line's (None removes it)."""
+        old_gross, old_discount, old_tax = self._amounts.pop(barcode, (0.0, 0.0, 0.0))
+        old_units = self.items[barcode]['quantity'] if barcode in self.items else 0
+        if line is None:
+            self.items.pop(barcode, None)
+            amounts = (0.0, 0.0, 0.0)
+        else:
+            self.items[barcode] = line
+            amounts = self._amounts[barcode] = line_amounts(line)
+
+        if not self.items:
+            # Start exactly from zero again rather than carry float residue forward
+            self._clear_totals()
+        else:
+            self.subtotal += amounts[0] - old_gross
+            self.discount += amounts[1] - old_discount
+            self.tax += amounts[2] - old_tax
+            self.units += (line['quantity'] if line else 0) - old_units
+        if self.on_change is not None:
+            self.on_change(barcode, line)
+        return line
+
+    # --- Changes ---
+    def add(self, barcode, name, price, discount, quantity_value, quantity_unit, quantity=1, tax_rate=0.0):
+        """Adds quantity of a product (merging with an existing line) and returns the line."""
+        line = self.items.get(barcode)
+        if line is not None:
+            line = dict(line, quantity=line['quantity'] + quantity)
+        else:
+            line = {
+                'name': name,
+                'price': price,
+                'quantity': quantity,
+                'discount': discount,
+                'quantity_value': quantity_value,
+                'quantity_unit': quantity_unit,
+                'tax_rate': tax_rate or 0.0,
+            }
+        return self._apply(barcode, line)
+
+    def set_quantity(self, barcode, quantity):
+        """Sets a line's quantity; 0 or less removes it. Returns the line, or None if removed."""
+        if barcode not in self.items:
+            raise KeyError(barcode)
+        if quantity <= 0:
+            return self._apply(barcode, None)
+        return self._apply(barcode, dict(self.items[barcode], quantity=quantity))
+
+    def remove(self, barcode, quantity=1):
+        """Takes quantity units of barcode out of the cart. Returns the line, or None if it is gone."""
+        return self.set_quantity(barcode, self.items[barcode]['quantity'] - quantity)
+
+    def discard(self, barcode):
+        """Removes barcode's line entirely, if present."""
+        if barcode in self.items:
+            self._apply(barcode, None)
+
+    def clear(self):
+        for barcode in list(self.items):
+            self._apply(barcode, None)
+
+    # --- Reading ---
+    @property
+    def grand_total(self):
+        return self.subtotal - self.discount
+
+    def line_total(self, barcode):
+        """(gross, discount, net) for one line, rounded to paise."""
+        gross, discount, _ = self._amounts[barcode]
+        return round(gross, 2), round(discount, 2), round(gross - discount, 2)
+
+    def totals(self):
+        """Cart totals rounded to paise."""
+        return {
+            "subtotal": round(self.subtotal, 2),
+            "discount": round(self.discount, 2),
+            "tax": round(self.tax, 2),
+            "grand_total": round(self.grand_total, 2),
+            "lines": len(self.items),
+            "units": self.units,
+        }
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, barcode):
+        return barcode in self.items
+
+    def __iter__(self):
+        return iter(self.items.items())
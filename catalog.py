@@ -0,0 +1,193 @@
+"""In-memory product catalog with cheap change detection.
+
+CatalogCache loads the products table once into a dict keyed by barcode, so
+a scan lookup is a dict access instead of a connect + SELECT on the Tk
+thread. Changes made by other connections (the stock manager, an import,
+another till) are picked up by refresh():
+
+* PRAGMA data_version tells us, without reading any table, whether anyone
+  else has committed since we last looked. Usually they haven't and
+  refresh() returns straight away.
+* The product_changes table, filled by triggers on products (see
+  migrations/0004_product_change_log.sql), lists which barcodes changed
+  after a given version, so only those rows are re-read. If the log is
+  missing or has been pruned past our version, we reload everything.
+"""
+import sqlite3
+import threading
+
+import database
+
+# Columns a lookup returns, in the order ProductPopup and add_item expect
+PRODUCT_COLUMNS = ("barcode", "product_name", "mrp", "discount", "quantity_value", "quantity_unit")
+# Read with them, but kept apart so product tuples keep their shape
+_SELECT = f"SELECT {', '.join(PRODUCT_COLUMNS)}, tax_rate FROM products"
+
+
+class CatalogCache:
+    """Product rows keyed by barcode, refreshed incrementally from the database.
+
+    get()/lookup() never touch the database. refresh() can be called from
+    any thread (the cache owns its connection and serialises access to it);
+    start(interval) runs it on a background thread so the UI never waits on
+    disk. A refresh builds new dicts and swaps them in, so a lookup running
+    on another thread never sees one half-updated.
+    """
+
+    def __init__(self, db_path="cart_database.db"):
+        self.db_path = db_path
+        self.products = {}
+        self.tax_rates = {}
+        self.version = 0
+        self.loaded = False
+        self.full_loads = 0
+        self.incremental_loads = 0
+        self._data_version = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    # --- Lookups ---
+    def get(self, barcode):
+        """The product tuple for barcode (see PRODUCT_COLUMNS), or None."""
+        return self.products.get(barcode)
+
+    def lookup(self, barcodes):
+        """{barcode: product} for every barcode in the catalog."""
+        products = self.products
+        return {code: products[code] for code in barcodes if code in products}
+
+    def tax_rate(self, barcode):
+        """GST rate (percent) for barcode, or None."""
+        return self.tax_rates.get(barcode)
+
+    def barcodes(self):
+        return list(self.products)
+
+    def __len__(self):
+        return len(self.products)
+
+    def __contains__(self, barcode):
+        return barcode in self.products
+
+    @property
+    def generation(self):
+        """Changes every time the cache reloads anything."""
+        return self.full_loads + self.incremental_loads
+
+    # --- Loading ---
+    def load(self):
+        """Reads the whole catalog. Returns self so it can be chained after the constructor."""
+        with self._lock:
+            conn = self._connect()
+            self._data_version = self._read_data_version(conn)
+            self._full_load(conn)
+        return self
+
+    def refresh(self):
+        """Applies changes committed by other connections. Returns True if anything was reloaded."""
+        with self._lock:
+            conn = self._connect()
+            data_version = self._read_data_version(conn)
+            if data_version == self._data_version and self.loaded:
+                return False
+            self._data_version = data_version
+
+            try:
+                changes = conn.execute(
+                    "SELECT version, barcode, op FROM product_changes WHERE version > ? ORDER BY version",
+                    (self.version,)).fetchall()
+            except sqlite3.OperationalError:
+                # No change log in this database
+                self._full_load(conn)
+                return True
+
+            latest = self._latest_version(conn)
+            expected_first = self.version + 1
+            if not self.loaded or (latest > self.version and (not changes or changes[0][0] != expected_first)):
+                # First load, or the log was pruned past what we have
+                self._full_load(conn)
+                return True
+            if not changes:
+                return False
+
+            self._apply_changes(conn, changes)
+            return True
+
+    def _full_load(self, conn):
+        self.version = self._latest_version(conn)
+        rows = conn.execute(_SELECT).fetchall()
+        self.products = {row[0]: row[:-1] for row in rows}
+        self.tax_rates = {row[0]: row[-1] for row in rows}
+        self.loaded = True
+        self.full_loads += 1
+
+    def _apply_changes(self, conn, changes):
+        latest = {}
+        for version, barcode, op in changes:
+            latest[barcode] = op
+        upserts = [code for code, op in latest.items() if op == "upsert"]
+
+        rows = []
+        for start in range(0, len(upserts), 500):
+            chunk = upserts[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(conn.execute(f"{_SELECT} WHERE barcode IN ({placeholders})", chunk))
+
+        products, tax_rates = dict(self.products), dict(self.tax_rates)
+        for code, op in latest.items():
+            if op == "delete":
+                products.pop(code, None)
+                tax_rates.pop(code, None)
+        for row in rows:
+            products[row[0]] = row[:-1]
+            tax_rates[row[0]] = row[-1]
+        # Swapped whole: lookups on other threads iterate the old dicts undisturbed
+        self.products, self.tax_rates = products, tax_rates
+        self.version = changes[-1][0]
+        self.incremental_loads += 1
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = database.connect(self.db_path, check_same_thread=False)
+        return self._conn
+
+    @staticmethod
+    def _latest_version(conn):
+        """Highest version ever logged, even if those rows have since been pruned."""
+        try:
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'product_changes'").fetchone()
+        except sqlite3.OperationalError:
+            return 0
+        return row[0] if row else 0
+
+    @staticmethod
+    def _read_data_version(conn):
+        return conn.execute("PRAGMA data_version").fetchone()[0]
+
+    # --- Background refresh ---
+    def start(self, interval=2.0):
+        """Refreshes every interval seconds on a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="catalog-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(2.0)
+            self._thread = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _run(self, interval):
+        while not self._stop_event.wait(interval):
+            try:
+                self.refresh()
+            except sqlite3.Error as e:
+                print(f"Catalog refresh failed: {e}")
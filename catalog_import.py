@@ -0,0 +1,249 @@
+"""Streaming bulk importer for vendor price files.
+
+    python catalog_import.py prices.csv [--db cart_database.db] [--rejects rejects.csv]
+    python catalog_import.py prices.jsonl --format jsonl --rebuild-indexes yes
+
+Rows are streamed (never loaded all at once), validated, and upserted into
+products by barcode in chunks of executemany, all inside one transaction.
+Carts keep reading the previous catalog until the import commits, since
+the database runs in WAL mode. Columns missing from the file are left
+alone on existing products and take DEFAULTS on new ones.
+
+For large imports the triggers that keep the full-text search index
+(products_fts) in step are dropped before loading, and the index is rebuilt
+once at the end, which is much cheaper than updating it row by row. The
+change-log triggers stay: they only fire for rows that actually change,
+and catalog sync depends on every change being logged.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sqlite3
+import time
+
+import database
+
+COLUMNS = ("barcode", "product_name", "mrp", "discount", "tax_rate",
+           "quantity_value", "quantity_unit", "stock_quantity", "reorder_level")
+REQUIRED = ("barcode", "product_name", "mrp")
+REAL_COLUMNS = ("mrp", "discount", "tax_rate", "quantity_value")
+INT_COLUMNS = ("stock_quantity", "reorder_level")
+
+# Used for NOT NULL columns a new product's row does not provide
+DEFAULTS = {"discount": 0.0, "tax_rate": 0.0, "quantity_value": 1.0, "quantity_unit": "pcs",
+            "stock_quantity": 0, "reorder_level": 0}
+
+# Common vendor header names
+ALIASES = {"name": "product_name", "price": "mrp", "tax": "tax_rate", "unit": "quantity_unit",
+           "stock": "stock_quantity", "ean": "barcode", "upc": "barcode", "gtin": "barcode"}
+
+CHUNK_SIZE = 20000
+
+
+class RowError(ValueError):
+    """A row that can't be imported. raw, if set, is the source text of a row that didn't parse."""
+
+    def __init__(self, message, raw=None):
+        super().__init__(message)
+        self.raw = raw
+
+
+# Readers yield (line number, raw row); a line that can't be parsed comes through as a RowError
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield number, RowError(f"invalid JSON: {e.msg} at column {e.colno}", line)
+
+
+READERS = {"csv": read_csv, "jsonl": read_jsonl}
+
+
+def normalise(raw):
+    """Maps vendor column names onto COLUMNS and drops everything else."""
+    if not isinstance(raw, dict):
+        raise RowError("row is not an object")
+    row = {}
+    for key, value in raw.items():
+        if key is None:
+            continue
+        key = key.strip().lower()
+        key = ALIASES.get(key, key)
+        if isinstance(value, str):
+            value = value.strip()
+        if key in COLUMNS and value not in (None, ""):
+            row[key] = value
+    return row
+
+
+def validate(row):
+    """Returns row with typed values, or raises RowError."""
+    for column in REQUIRED:
+        if row.get(column) in (None, ""):
+            raise RowError(f"missing {column}")
+    barcode = str(row["barcode"])
+    if any(ch.isspace() for ch in barcode):
+        raise RowError(f"barcode {barcode!r} contains whitespace")
+    row["barcode"] = barcode
+
+    for column in REAL_COLUMNS + INT_COLUMNS:
+        if column not in row:
+            continue
+        value = row[column]
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise RowError(f"{column} {value!r} is not a number")
+        # float() accepts "nan" and "inf", which would end up as NULL or nonsense prices
+        if not math.isfinite(number):
+            raise RowError(f"{column} {value!r} is not a finite number")
+        if number < 0:
+            raise RowError(f"{column} is negative")
+        row[column] = number if column in REAL_COLUMNS else int(number)
+    return row
+
+
+def search_triggers(conn):
+    """[(name, sql)] for the triggers that keep products_fts in step with products."""
+    return conn.execute("SELECT name, sql FROM sqlite_master "
+                        "WHERE type = 'trigger' AND tbl_name = 'products' AND name LIKE 'products_fts%'").fetchall()
+
+
+def upsert_sql(columns):
+    """Upsert by barcode that inserts every column but only updates the given ones."""
+    updated = [c for c in columns if c != "barcode"]
+    # Unchanged rows are skipped, so a nightly reload only writes (and logs) what moved
+    return (f"INSERT INTO products ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+            f"ON CONFLICT(barcode) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in updated)} "
+            f"WHERE ({', '.join(f'products.{c}' for c in updated)}) "
+            f"IS NOT ({', '.join(f'excluded.{c}' for c in updated)})")
+
+
+def _flush(conn, columns, chunk):
+    """Upserts chunk and returns the number of rows inserted or actually changed."""
+    if not chunk:
+        return 0
+    # rowcount leaves out rows the upsert's WHERE skipped and changes made by triggers
+    return conn.executemany(upsert_sql(columns), chunk).rowcount
+
+
+def row_values(row):
+    """A row dict as a COLUMNS tuple, with DEFAULTS for anything it lacks."""
+    return tuple(row[c] if c in row else DEFAULTS[c] for c in COLUMNS)
+
+
+def import_catalog(path, db_path=database.DB_PATH, fmt=None, rebuild_indexes=None, chunk_size=CHUNK_SIZE,
+                   rejects=None):
+    """Streams path into products and returns a report dict.
+
+    rebuild_indexes: whether to suspend the search index triggers and
+    rebuild products_fts at the end; True/False, or None to decide from the
+    file size compared with the current catalog. rejects: optional list that gets
+    (line, reason, raw_row) for every rejected row.
+    """
+    fmt = fmt or ("jsonl" if path.lower().endswith((".jsonl", ".ndjson")) else "csv")
+    rows = READERS[fmt](path)
+    started = time.perf_counter()
+
+    conn = database.connect(db_path, isolation_level=None)
+    report = {"file": path, "rows": 0, "upserted": 0, "rejected": 0, "search_rebuilt": False}
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        existing = conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+        triggers = search_triggers(conn)
+        if rebuild_indexes is None:
+            # Rough row estimate: vendor rows are well under 200 bytes each
+            rebuild_indexes = os.path.getsize(path) / 200 > existing / 2
+        rebuild_indexes = rebuild_indexes and bool(triggers)
+        if rebuild_indexes:
+            for name, _ in triggers:
+                conn.execute(f"DROP TRIGGER {name}")
+
+        # Rows are batched per set of columns they provide, so a blank cell never
+        # overwrites an existing value. A change of column set flushes the batch,
+        # which keeps rows applied in file order.
+        columns = None
+        chunk = []
+        for line, raw in rows:
+            report["rows"] += 1
+            try:
+                if isinstance(raw, RowError):
+                    raise raw
+                row = validate(normalise(raw))
+            except RowError as e:
+                report["rejected"] += 1
+                if rejects is not None:
+                    rejects.append((line, str(e), raw if e.raw is None else e.raw))
+                continue
+            row_columns = tuple(c for c in COLUMNS if c in row)
+            if row_columns != columns or len(chunk) >= chunk_size:
+                report["upserted"] += _flush(conn, columns, chunk)
+                columns, chunk = row_columns, []
+            chunk.append(row_values(row))
+        report["upserted"] += _flush(conn, columns, chunk)
+
+        if rebuild_indexes:
+            for _, trigger_sql in triggers:
+                conn.execute(trigger_sql)
+            conn.execute("INSERT INTO products_fts (products_fts) VALUES ('rebuild')")
+            report["search_rebuilt"] = True
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+    elapsed = time.perf_counter() - started
+    report["elapsed_s"] = round(elapsed, 2)
+    report["rows_per_s"] = round(report["rows"] / elapsed) if elapsed else 0
+    return report
+
+
+def write_rejects(path, rejects):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["line", "reason", "row"])
+        for line, reason, raw in rejects:
+            # Unparsed lines are written as they were in the file
+            writer.writerow([line, reason, raw if isinstance(raw, str) else json.dumps(raw)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import a vendor price file into products.")
+    parser.add_argument("file", help="CSV (with header) or JSONL price file")
+    parser.add_argument("--db", default=database.DB_PATH, help="Product database")
+    parser.add_argument("--format", choices=list(READERS), help="Input format (default: from the file extension)")
+    parser.add_argument("--rebuild-indexes", choices=["auto", "yes", "no"], default="auto",
+                        help="Rebuild the product search index once at the end instead of row by row")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows per executemany batch")
+    parser.add_argument("--rejects", help="Write rejected rows and reasons to this CSV file")
+    args = parser.parse_args()
+
+    rebuild = {"auto": None, "yes": True, "no": False}[args.rebuild_indexes]
+    rejected_rows = [] if args.rejects else None
+    try:
+        result = import_catalog(args.file, args.db, args.format, rebuild, args.chunk_size, rejected_rows)
+    except (OSError, sqlite3.Error, csv.Error, ValueError) as e:
+        # ValueError covers UnicodeDecodeError from a file that isn't UTF-8
+        raise SystemExit(f"Import failed: {e}")
+    if args.rejects:
+        write_rejects(args.rejects, rejected_rows)
+    print(f"Read {result['rows']} rows: {result['upserted']} new or changed, {result['rejected']} rejected, "
+          f"in {result['elapsed_s']} s, {result['rows_per_s']} rows/s"
+          f"{'; search index rebuilt' if result['search_rebuilt'] else ''}.")
@@ -0,0 +1,251 @@
+"""Memory-mapped, read-only catalog snapshots.
+
+export_snapshot() writes the products table as a CompactCatalog image:
+a fixed header, a section table and 8-byte aligned sections holding the
+sorted barcode keys, the parallel price arrays and the name blob. Each
+export goes to its own versioned data file (catalog.snapshot.<version>);
+catalog.snapshot itself is a one-line pointer to the current data file,
+swapped with os.replace. Readers therefore only ever see a complete
+snapshot, and a data file that is still mapped never has to be replaced
+(which Windows would refuse).
+
+load_snapshot() maps the file and wraps memoryviews over it, so opening
+even a million-SKU catalog reads a few pages rather than building
+anything; lookups fault in only the pages they touch. SnapshotCatalog
+keeps the current snapshot and swaps to a new one when the file is
+replaced.
+
+    python catalog_snapshot.py export [--db cart_database.db] [--out catalog.snapshot]
+    python catalog_snapshot.py info [catalog.snapshot]
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+
+from catalog import CatalogCache
+from compact_catalog import CompactCatalog
+from database import DB_PATH, get_connection, read_transaction
+from symbology import SymbologyProfile
+
+SNAPSHOT_PATH = "catalog.snapshot"
+MAGIC = b"CARTSNAP"
+FORMAT_VERSION = 1
+
+# magic, format version, byte order (1 = little), section count, catalog version, created_at
+_HEADER = struct.Struct("<8sIIIQd")
+# name, typecode, offset, length in bytes
+_SECTION = struct.Struct("<16s4sQQ")
+_ALIGN = 8
+
+# CompactCatalog buffers stored as sections, with their array typecodes
+_ARRAYS = (("keys", "q"), ("mrp", "d"), ("discount", "d"), ("tax_rates", "d"), ("quantity_value", "d"),
+           ("unit_index", "H"), ("name_index", "I"), ("name_offsets", "Q"), ("names", "B"))
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def export_snapshot(db_path=DB_PATH, path=SNAPSHOT_PATH):
+    """Writes the products table to path atomically and returns the snapshot's catalog version."""
+    conn = get_connection(db_path)
+    # Read the version and the rows in one transaction so they describe the same catalog
+    with read_transaction(conn):
+        version = CatalogCache._latest_version(conn)
+        catalog = CompactCatalog.from_database(db_path)
+
+    meta = {
+        "units": catalog.units,
+        "fallback": catalog.fallback,
+        "symbology": SymbologyProfile(catalog.barcodes()).describe(),
+    }
+    buffers = [(name, code, getattr(catalog, name)) for name, code in _ARRAYS]
+    buffers.append(("meta", "B", json.dumps(meta).encode("utf-8")))
+
+    offset = _HEADER.size + _SECTION.size * len(buffers)
+    sections = []
+    for name, code, buffer in buffers:
+        offset += -offset % _ALIGN
+        length = memoryview(buffer).nbytes
+        sections.append((name, code, offset, length))
+        offset += length
+
+    data_path = f"{path}.{version}-{time.time_ns()}"
+    with open(data_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 1 if sys.byteorder == "little" else 0,
+                             len(sections), version, time.time()))
+        for name, code, offset, length in sections:
+            f.write(_SECTION.pack(name.encode(), code.encode(), offset, length))
+        for (name, code, offset, length), (_, _, buffer) in zip(sections, buffers):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(memoryview(buffer).cast("B"))
+        f.flush()
+        os.fsync(f.fileno())
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(os.path.basename(data_path))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _prune(path, keep=(data_path,))
+    return version
+
+
+def _prune(path, keep):
+    """Deletes older data files; ones a cart still has mapped are left for the next export."""
+    folder = os.path.dirname(os.path.abspath(path))
+    prefix = os.path.basename(path) + "."
+    keep = {os.path.basename(p) for p in keep}
+    for name in os.listdir(folder):
+        if name.startswith(prefix) and name not in keep and not name.startswith(prefix + "tmp"):
+            try:
+                os.remove(os.path.join(folder, name))
+            except OSError:
+                pass
+
+
+def data_file(path=SNAPSHOT_PATH):
+    """The data file the pointer at path currently names."""
+    with open(path, encoding="utf-8") as f:
+        name = f.read().strip()
+    return os.path.join(os.path.dirname(os.path.abspath(path)), name)
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """Maps the current snapshot and returns a CompactCatalog over it, with .version and .symbology set."""
+    path = data_file(path)
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    if len(view) < _HEADER.size:
+        raise SnapshotError(f"{path} is too short to be a catalog snapshot")
+    magic, format_version, little, count, version, created_at = _HEADER.unpack_from(view)
+    if magic != MAGIC or format_version != FORMAT_VERSION:
+        raise SnapshotError(f"{path} is not a version {FORMAT_VERSION} catalog snapshot")
+    if bool(little) != (sys.byteorder == "little"):
+        raise SnapshotError(f"{path} was written on a machine with a different byte order")
+
+    sections = {}
+    for i in range(count):
+        name, code, offset, length = _SECTION.unpack_from(view, _HEADER.size + i * _SECTION.size)
+        name, code = name.rstrip(b"\0").decode(), code.rstrip(b"\0").decode()
+        if offset + length > len(view):
+            raise SnapshotError(f"{path} is truncated")
+        sections[name] = view[offset:offset + length].cast(code)
+
+    meta = json.loads(str(sections.pop("meta"), "utf-8"))
+    catalog = CompactCatalog(units=meta["units"], fallback=meta["fallback"], names=sections.pop("names"),
+                             tax_rate=sections.pop("tax_rates"), **sections)
+    catalog.version = version
+    catalog.created_at = created_at
+    catalog.symbology = meta["symbology"]
+    return catalog
+
+
+class SnapshotCatalog:
+    """The current catalog snapshot, swapped for a newer one when the file is replaced.
+
+    Has the same lookup API as CatalogCache. refresh() checks the pointer
+    file's identity (one stat call) and maps the new snapshot before switching the
+    reference, so lookups running during a swap see either the old or the
+    new catalog, never a mix. start(interval) polls on a daemon thread.
+    """
+
+    def __init__(self, path=SNAPSHOT_PATH):
+        self.path = path
+        self.generation = 0
+        self.current = None
+        self._stamp = None
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.refresh()
+
+    def refresh(self):
+        """Maps the snapshot file if it changed since the last call. Returns True on a swap."""
+        stat = os.stat(self.path)
+        stamp = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if stamp == self._stamp:
+            return False
+        self.current = load_snapshot(self.path)
+        self._stamp = stamp
+        self.generation += 1
+        return True
+
+    # --- Lookups ---
+    @property
+    def version(self):
+        return self.current.version
+
+    @property
+    def symbology(self):
+        return self.current.symbology
+
+    def get(self, barcode):
+        return self.current.get(barcode)
+
+    def lookup(self, barcodes):
+        return self.current.lookup(barcodes)
+
+    def barcodes(self):
+        return self.current.barcodes()
+
+    def product_at(self, row):
+        return self.current.product_at(row)
+
+    def tax_rate(self, barcode):
+        return self.current.tax_rate(barcode)
+
+    def __len__(self):
+        return len(self.current)
+
+    def __contains__(self, barcode):
+        return barcode in self.current
+
+    # --- Background refresh ---
+    def start(self, interval=2.0):
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="snapshot-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(2.0)
+            self._thread = None
+
+    def _run(self, interval):
+        while not self._stop_event.wait(interval):
+            try:
+                self.refresh()
+            except (OSError, SnapshotError) as e:
+                print(f"Catalog snapshot refresh failed: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export or inspect memory-mapped catalog snapshots.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export_parser = sub.add_parser("export", help="Write the products table to a snapshot file")
+    export_parser.add_argument("--db", default=DB_PATH, help="Product database")
+    export_parser.add_argument("--out", default=SNAPSHOT_PATH, help="Snapshot file to (atomically) replace")
+    info_parser = sub.add_parser("info", help="Show a snapshot's version and size")
+    info_parser.add_argument("path", nargs="?", default=SNAPSHOT_PATH)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        started = time.perf_counter()
+        exported = export_snapshot(args.db, args.out)
+        print(f"Wrote {args.out} (catalog version {exported}) in {time.perf_counter() - started:.2f} s")
+    else:
+        started = time.perf_counter()
+        snapshot = load_snapshot(args.path)
+        opened_ms = (time.perf_counter() - started) * 1000
+        print(f"{args.path}: {len(snapshot)} products, catalog version {snapshot.version}, "
+              f"exported {time.ctime(snapshot.created_at)}, opened in {opened_ms:.2f} ms")
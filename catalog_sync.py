@@ -0,0 +1,250 @@
+"""Incremental catalog sync from a store master database to cart databases.
+
+The master's product_changes table (filled by triggers, see migrations/)
+gives every catalog change a monotonically increasing version. A cart
+remembers the last version it applied in sync_state and asks only for
+changes after it; a price change therefore costs each cart one row, not
+a copy of the database. If the master's log has been pruned past the
+cart's version, the master answers with the full catalog instead.
+
+Transports are pluggable: LocalTransport reads a master database file
+directly and HttpTransport talks to `python catalog_sync.py serve`.
+
+A cart that reads its catalog from a snapshot (catalog_snapshot.py) never
+looks at the database, so when a pull changes something the snapshot is
+re-exported; the cart's snapshot watcher then swaps to it.
+
+    python catalog_sync.py serve --db master.db --port 8765
+    python catalog_sync.py pull --from http://store-server:8765 [--db cart_database.db] [--every 30]
+    python catalog_sync.py pull --from master.db
+"""
+import argparse
+import json
+import os
+import sqlite3
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from catalog import CatalogCache
+from catalog_import import DEFAULTS, row_values, upsert_sql
+from catalog_snapshot import SNAPSHOT_PATH, export_snapshot
+from database import DB_PATH, get_connection, read_transaction, transaction
+from migrations import migrate
+
+# Catalog columns carts receive; stock levels stay with the master
+SYNC_COLUMNS = ("barcode", "product_name", "mrp", "discount", "tax_rate", "quantity_value", "quantity_unit")
+PAGE_SIZE = 5000
+
+
+# --- Master side ---
+def _rows_by_barcode(conn, barcodes):
+    rows = {}
+    barcodes = list(barcodes)
+    for start in range(0, len(barcodes), 500):
+        chunk = barcodes[start:start + 500]
+        placeholders = ",".join("?" * len(chunk))
+        for row in conn.execute(f"SELECT {', '.join(SYNC_COLUMNS)} FROM products WHERE barcode IN ({placeholders})",
+                                chunk):
+            rows[row[0]] = list(row)
+    return rows
+
+
+def changes_since(conn, since, limit=PAGE_SIZE):
+    """One page of catalog changes after version since.
+
+    Returns {"version", "latest", "reset", "upserts", "deletes"}. upserts are
+    current SYNC_COLUMNS rows; "version" is the version to ask from next.
+    With reset=True upserts hold the whole catalog and every product not in
+    it should be deleted.
+    """
+    # One read transaction, so the version and the rows describe the same catalog
+    with read_transaction(conn):
+        latest = CatalogCache._latest_version(conn)
+        oldest = conn.execute("SELECT MIN(version) FROM product_changes").fetchone()[0]
+        if since > latest or (since < latest and (oldest is None or oldest > since + 1)):
+            # The log no longer covers the gap (or the cart is ahead of a rebuilt master)
+            rows = conn.execute(f"SELECT {', '.join(SYNC_COLUMNS)} FROM products").fetchall()
+            return {"version": latest, "latest": latest, "reset": True,
+                    "upserts": [list(row) for row in rows], "deletes": []}
+
+        changes = conn.execute("SELECT version, barcode, op FROM product_changes WHERE version > ? "
+                               "ORDER BY version LIMIT ?", (since, limit)).fetchall()
+        last_op = {}
+        for _, barcode, op in changes:
+            last_op[barcode] = op
+        current = _rows_by_barcode(conn, [code for code, op in last_op.items() if op == "upsert"])
+    return {
+        "version": changes[-1][0] if changes else since,
+        "latest": latest,
+        "reset": False,
+        # A product upserted and then deleted later in the log has no current row; its delete follows
+        "upserts": [current[code] for code, op in last_op.items() if op == "upsert" and code in current],
+        "deletes": [code for code, op in last_op.items() if op == "delete"],
+    }
+
+
+# --- Transports ---
+class LocalTransport:
+    """Reads changes straight from a master database file."""
+
+    def __init__(self, master_db):
+        self.master_db = master_db
+        self.source = f"file:{master_db}"
+
+    def fetch(self, since, limit=PAGE_SIZE):
+        return changes_since(get_connection(self.master_db), since, limit)
+
+
+class HttpTransport:
+    """Fetches changes from `catalog_sync.py serve` on the store server."""
+
+    def __init__(self, base_url, timeout=10.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.source = self.base_url
+
+    def fetch(self, since, limit=PAGE_SIZE):
+        query = urllib.parse.urlencode({"since": since, "limit": limit})
+        with urllib.request.urlopen(f"{self.base_url}/changes?{query}", timeout=self.timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+
+def open_transport(spec):
+    """HttpTransport for http(s) URLs, LocalTransport for anything else (a database path)."""
+    if spec.startswith(("http://", "https://")):
+        return HttpTransport(spec)
+    return LocalTransport(spec)
+
+
+# --- Cart side ---
+def local_version(conn, source):
+    row = conn.execute("SELECT version FROM sync_state WHERE source = ?", (source,)).fetchone()
+    return row[0] if row else 0
+
+
+def sync(transport, db_path=DB_PATH, page_size=PAGE_SIZE, snapshot_path=None):
+    """Pulls every change since the last sync and applies it in one transaction. Returns a report dict.
+
+    If snapshot_path names an existing catalog snapshot, it is re-exported
+    once changes have been applied.
+    """
+    started = time.perf_counter()
+    since = start = local_version(get_connection(db_path), transport.source)
+
+    # Download first, so the local write transaction is short and all-or-nothing
+    pages = []
+    while True:
+        page = transport.fetch(since, page_size)
+        pages.append(page)
+        if page["reset"] or page["version"] >= page["latest"] or page["version"] == since:
+            break
+        since = page["version"]
+
+    reset = any(page["reset"] for page in pages)
+    upserts = {}
+    deletes = set()
+    for page in pages:
+        for code in page["deletes"]:
+            upserts.pop(code, None)
+            deletes.add(code)
+        for row in page["upserts"]:
+            deletes.discard(row[0])
+            upserts[row[0]] = row
+
+    with transaction(db_path) as conn:
+        if reset:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS sync_keep (barcode TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM sync_keep")
+            conn.executemany("INSERT INTO sync_keep VALUES (?)", ((code,) for code in upserts))
+            deletes_done = conn.execute("DELETE FROM products WHERE barcode NOT IN (SELECT barcode FROM sync_keep)"
+                                        ).rowcount
+        else:
+            deletes_done = 0
+            for code in deletes:
+                deletes_done += conn.execute("DELETE FROM products WHERE barcode = ?", (code,)).rowcount
+        conn.executemany(upsert_sql(SYNC_COLUMNS),
+                         (row_values(dict(DEFAULTS, **dict(zip(SYNC_COLUMNS, row)))) for row in upserts.values()))
+        conn.execute("INSERT INTO sync_state (source, version, synced_at) VALUES (?, ?, CURRENT_TIMESTAMP) "
+                     "ON CONFLICT(source) DO UPDATE SET version = excluded.version, synced_at = excluded.synced_at",
+                     (transport.source, pages[-1]["version"]))
+
+    snapshot_version = None
+    if snapshot_path and os.path.exists(snapshot_path) and (reset or upserts or deletes_done):
+        snapshot_version = export_snapshot(db_path, snapshot_path)
+
+    return {
+        "source": transport.source,
+        "from_version": start,
+        "version": pages[-1]["version"],
+        "reset": reset,
+        "upserts": len(upserts),
+        "deletes": deletes_done,
+        "pages": len(pages),
+        "snapshot_version": snapshot_version,
+        "elapsed_s": round(time.perf_counter() - started, 3),
+    }
+
+
+# --- HTTP stand-in for the store server ---
+def make_handler(master_db):
+    class ChangesHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urllib.parse.urlparse(self.path)
+            if url.path != "/changes":
+                self.send_error(404)
+                return
+            params = urllib.parse.parse_qs(url.query)
+            try:
+                since = int(params.get("since", ["0"])[0])
+                limit = min(int(params.get("limit", [PAGE_SIZE])[0]), PAGE_SIZE)
+            except ValueError:
+                self.send_error(400, "since and limit must be integers")
+                return
+            body = json.dumps(changes_since(get_connection(master_db), since, limit)).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return ChangesHandler
+
+
+def serve(master_db=DB_PATH, host="0.0.0.0", port=8765):
+    migrate(get_connection(master_db))
+    server = ThreadingHTTPServer((host, port), make_handler(master_db))
+    print(f"Serving catalog changes from {master_db} on http://{host}:{port}/changes")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sync cart catalogs from the store master database.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve", help="Serve the master's change log over HTTP")
+    serve_parser.add_argument("--db", default=DB_PATH, help="Master database")
+    serve_parser.add_argument("--host", default="0.0.0.0")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    pull_parser = sub.add_parser("pull", help="Apply the master's changes to a cart database")
+    pull_parser.add_argument("--from", dest="source", required=True, help="Master URL or master database path")
+    pull_parser.add_argument("--db", default=DB_PATH, help="Cart database")
+    pull_parser.add_argument("--every", type=float, help="Keep pulling every N seconds")
+    pull_parser.add_argument("--snapshot", default=SNAPSHOT_PATH,
+                             help="Catalog snapshot to re-export after changes, if it exists")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.db, args.host, args.port)
+    else:
+        transport = open_transport(args.source)
+        migrate(get_connection(args.db))
+        while True:
+            try:
+                print(json.dumps(sync(transport, args.db, snapshot_path=args.snapshot)))
+            except (OSError, sqlite3.Error) as e:
+                # Keep going with --every; the next round retries from the same version
+                print(f"Sync from {transport.source} failed: {e}")
+            if not args.every:
+                break
+            time.sleep(args.every)
@@ -0,0 +1,238 @@
+"""Compact, array-backed product catalog for very large stores.
+
+A dict of row tuples costs a few hundred bytes per product in Python
+objects. CompactCatalog keeps the same data in flat typed buffers:
+
+* barcodes as int64 keys in one sorted array, found by binary search.
+  A key is the numeric value shifted left 5 bits with the digit count in
+  the low bits, so leading zeros survive ("0736..." and "736..." differ).
+* mrp, discount, tax_rate and quantity_value in parallel float64 arrays.
+* product names in one UTF-8 blob with an offsets array, identical names
+  stored once; units as small indexes into a units table.
+* barcodes that are not all digits (or longer than 17 digits) in a small
+  dict of extra rows after the numeric ones.
+
+The buffers can be array.array objects or memoryviews over an mmap (see
+catalog_snapshot.py), and the lookup API matches CatalogCache: get(),
+lookup(), barcodes(), len() and `in`.
+
+    python compact_catalog.py --bench 1000000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_left
+
+from database import DB_PATH, get_connection
+
+LENGTH_BITS = 5
+MAX_NUMERIC_DIGITS = 17       # 10**17 << 5 still fits in an int64
+
+# Source columns, in the order from_rows() expects them
+ROW_COLUMNS = ("barcode", "product_name", "mrp", "discount", "tax_rate", "quantity_value", "quantity_unit")
+
+
+def barcode_key(code):
+    """The int64 key for an all-digit barcode, or None if it needs the fallback table."""
+    if len(code) <= MAX_NUMERIC_DIGITS and code.isascii() and code.isdigit():
+        return int(code) << LENGTH_BITS | len(code)
+    return None
+
+
+def key_barcode(key):
+    return str(key >> LENGTH_BITS).zfill(key & ((1 << LENGTH_BITS) - 1))
+
+
+class CompactCatalog:
+    """Read-only catalog over flat typed buffers.
+
+    Rows 0..len(keys)-1 belong to the sorted numeric keys; fallback maps the
+    remaining barcodes to rows after those. get() returns the same tuple
+    shape as CatalogCache (see catalog.PRODUCT_COLUMNS).
+    """
+
+    generation = 0
+
+    def __init__(self, keys, mrp, discount, tax_rate, quantity_value, unit_index, units,
+                 name_index, name_offsets, names, fallback):
+        self.keys = keys
+        self.mrp = mrp
+        self.discount = discount
+        self.tax_rates = tax_rate
+        self.quantity_value = quantity_value
+        self.unit_index = unit_index
+        self.units = units
+        self.name_index = name_index
+        self.name_offsets = name_offsets
+        self.names = names
+        self.fallback = fallback
+        self._fallback_codes = {row: code for code, row in fallback.items()}
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Builds a catalog from (barcode, name, mrp, discount, tax_rate, quantity_value, unit) rows."""
+        numeric = []
+        other = []
+        for row in rows:
+            key = barcode_key(row[0])
+            if key is None:
+                other.append(row)
+            else:
+                numeric.append((key, row))
+        numeric.sort(key=lambda item: item[0])
+
+        keys = array("q", (key for key, _ in numeric))
+        ordered = [row for _, row in numeric] + other
+        fallback = {row[0]: len(numeric) + i for i, row in enumerate(other)}
+
+        # Identical names (and units) are stored once
+        name_ids, units, unit_ids = {}, [], {}
+        blob = bytearray()
+        name_offsets = array("Q", [0])
+        name_index = array("I")
+        unit_index = array("H")
+        for row in ordered:
+            name = row[1]
+            if name not in name_ids:
+                name_ids[name] = len(name_ids)
+                blob += name.encode("utf-8")
+                name_offsets.append(len(blob))
+            name_index.append(name_ids[name])
+            unit = row[6]
+            if unit not in unit_ids:
+                unit_ids[unit] = len(units)
+                units.append(unit)
+            unit_index.append(unit_ids[unit])
+
+        return cls(keys,
+                   array("d", (float(row[2]) for row in ordered)),
+                   array("d", (float(row[3]) for row in ordered)),
+                   array("d", (float(row[4]) for row in ordered)),
+                   array("d", (float(row[5]) for row in ordered)),
+                   unit_index, units, name_index, name_offsets, bytes(blob), fallback)
+
+    @classmethod
+    def from_database(cls, db_path=DB_PATH):
+        cursor = get_connection(db_path).execute(f"SELECT {', '.join(ROW_COLUMNS)} FROM products")
+        return cls.from_rows(cursor)
+
+    # --- Lookups ---
+    def row_of(self, barcode):
+        """Row number for barcode, or -1."""
+        key = barcode_key(barcode)
+        if key is None:
+            return self.fallback.get(barcode, -1)
+        i = bisect_left(self.keys, key)
+        return i if i < len(self.keys) and self.keys[i] == key else -1
+
+    def barcode_at(self, row):
+        if row < len(self.keys):
+            return key_barcode(self.keys[row])
+        return self._fallback_codes[row]
+
+    def name_at(self, row):
+        name_id = self.name_index[row]
+        return str(self.names[self.name_offsets[name_id]:self.name_offsets[name_id + 1]], "utf-8")
+
+    def product_at(self, row, barcode=None):
+        return (barcode or self.barcode_at(row), self.name_at(row), self.mrp[row], self.discount[row],
+                self.quantity_value[row], self.units[self.unit_index[row]])
+
+    def get(self, barcode):
+        row = self.row_of(barcode)
+        return None if row < 0 else self.product_at(row, barcode)
+
+    def lookup(self, barcodes):
+        found = {}
+        for code in barcodes:
+            row = self.row_of(code)
+            if row >= 0:
+                found[code] = self.product_at(row, code)
+        return found
+
+    def tax_rate(self, barcode):
+        row = self.row_of(barcode)
+        return None if row < 0 else self.tax_rates[row]
+
+    def barcodes(self):
+        return [key_barcode(key) for key in self.keys] + list(self.fallback)
+
+    def __len__(self):
+        return len(self.keys) + len(self.fallback)
+
+    def __contains__(self, barcode):
+        return self.row_of(barcode) >= 0
+
+    def nbytes(self):
+        """Approximate size of the catalog buffers in bytes."""
+        buffers = (self.keys, self.mrp, self.discount, self.tax_rates, self.quantity_value,
+                   self.unit_index, self.name_index, self.name_offsets)
+        size = sum(len(b) * b.itemsize for b in buffers) + len(self.names)
+        return size + sum(len(code) + 80 for code in self.fallback)
+
+
+# --- Benchmark ---
+def synthetic_rows(count, seed=7):
+    """count fake products with EAN-13 style barcodes, shared names and a handful of units."""
+    rng = random.Random(seed)
+    words = ["Rice", "Atta", "Oil", "Soap", "Tea", "Coffee", "Biscuit", "Noodles", "Jam", "Milk", "Salt", "Sugar"]
+    brands = ["Aashirvaad", "Tata", "Fortune", "Dove", "Nestle", "Britannia", "Amul", "Kissan", "Sunfeast", "Parle"]
+    units = ["g", "kg", "ml", "L", "pcs"]
+    codes = rng.sample(range(10 ** 12, 10 ** 13), count)
+    for code in codes:
+        yield (str(code).zfill(13), f"{rng.choice(brands)} {rng.choice(words)} {rng.randint(1, 999)}",
+               round(rng.uniform(5, 2000), 2), rng.randint(0, 30), rng.choice((0, 5, 12, 18)),
+               rng.choice((50, 100, 250, 500, 1000)), rng.choice(units))
+
+
+def _measure(build):
+    """(result, bytes still allocated by build, seconds). Timed without tracemalloc running."""
+    started = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def _lookup_ns(catalog, probes):
+    started = time.perf_counter()
+    for code in probes:
+        catalog.get(code)
+    return (time.perf_counter() - started) / len(probes) * 1e9
+
+
+def run_benchmark(count=1_000_000, probes=200_000):
+    rows = list(synthetic_rows(count))
+    # Fresh string copies, as if each row had been read from SQLite
+    as_dict, dict_bytes, dict_s = _measure(lambda: {
+        r[0].encode().decode(): (r[0].encode().decode(), r[1].encode().decode(), r[2], float(r[3]), float(r[5]), r[6])
+        for r in rows})
+    compact, compact_bytes, compact_s = _measure(lambda: CompactCatalog.from_rows(rows))
+
+    rng = random.Random(1)
+    hits = [rng.choice(rows)[0] for _ in range(probes)]
+    misses = [str(rng.randrange(10 ** 12, 10 ** 13)) for _ in range(probes // 10)]
+    return {
+        "skus": count,
+        "dict_mb": round(dict_bytes / 2 ** 20, 1),
+        "compact_mb": round(compact_bytes / 2 ** 20, 1),
+        "compact_buffers_mb": round(compact.nbytes() / 2 ** 20, 1),
+        "dict_build_s": round(dict_s, 2),
+        "compact_build_s": round(compact_s, 2),
+        "dict_get_ns": round(_lookup_ns(as_dict, hits)),
+        "compact_get_ns": round(_lookup_ns(compact, hits)),
+        "compact_miss_ns": round(_lookup_ns(compact, misses)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compact catalog memory and lookup benchmark.")
+    parser.add_argument("--bench", type=int, default=1_000_000, metavar="SKUS", help="Synthetic catalog size")
+    args = parser.parse_args()
+    for name, value in run_benchmark(args.bench).items():
+        print(f"{name:<20}{value}")
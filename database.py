@@ -0,0 +1,90 @@
+"""Shared SQLite connections.
+
+Every module gets its connection from get_connection() instead of calling
+sqlite3.connect() itself. Connections are opened once per thread and per
+database file, kept open for the life of the thread and tuned centrally
+with PRAGMAS, so a lookup or an insert no longer pays for opening the file
+and re-reading the schema.
+
+    conn = get_connection()
+    conn.execute("SELECT ...")
+
+    with transaction() as conn:       # commits, or rolls back on error
+        conn.execute("INSERT ...")
+
+    with read_transaction(conn):      # several reads that see one snapshot
+        ...
+
+Don't close connections from get_connection(); call close_connection()
+when a thread that used the database is done with it.
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+DB_PATH = "cart_database.db"
+
+# Applied to every connection, in order
+PRAGMAS = {
+    "journal_mode": "WAL",        # Readers don't block the writer (persists in the file)
+    "synchronous": "NORMAL",      # fsync at checkpoints only; safe with WAL
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -16000,         # Negative = KiB, so 16 MB of page cache
+    "busy_timeout": 5000,         # ms to wait for another writer before SQLITE_BUSY
+    "temp_store": "MEMORY",
+}
+
+_local = threading.local()
+
+
+def connect(db_path=DB_PATH, **kwargs):
+    """Opens a new connection with PRAGMAS applied. The caller owns (and closes) it."""
+    conn = sqlite3.connect(db_path, **kwargs)
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
+
+
+def get_connection(db_path=DB_PATH):
+    """The calling thread's long-lived connection to db_path."""
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = connections[db_path] = connect(db_path)
+    return conn
+
+
+def close_connection(db_path=None):
+    """Closes the calling thread's connection to db_path (or all of them)."""
+    connections = getattr(_local, "connections", {})
+    for path in [db_path] if db_path else list(connections):
+        conn = connections.pop(path, None)
+        if conn is not None:
+            conn.close()
+
+
+@contextmanager
+def transaction(db_path=DB_PATH):
+    """Yields the thread's connection inside one transaction; commits, or rolls back if the block raises."""
+    conn = get_connection(db_path)
+    with conn:
+        yield conn
+
+
+@contextmanager
+def read_transaction(conn):
+    """Runs the block's reads in one transaction, so they all see the same snapshot of the database.
+
+    If conn already has a transaction open (an implicit one from an earlier
+    write, say) the block joins it and it is left open for its owner.
+    """
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    finally:
+        conn.rollback()
@@ -0,0 +1,133 @@
+"""Offline decoder benchmark.
+
+Runs every decoder backend over a folder of recorded frames and reports
+throughput, p50/p99 latency and read rate per symbology.
+
+    python decoder_benchmark.py recorded_frames/ [--backends pyzbar opencv] [--json out.json]
+
+If the folder contains a manifest.csv (columns: file, data, symbology) the
+read rate is measured against it; otherwise reads are only counted.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import time
+from collections import defaultdict
+
+import cv2
+
+from decoders import DECODERS, DEFAULT_SYMBOLS, get_decoder
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct * len(ordered) / 100.0) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def load_frames(folder):
+    """Returns [(file_name, gray_image)] for every image in folder, sorted by name."""
+    frames = []
+    for name in sorted(os.listdir(folder)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            image = cv2.imread(os.path.join(folder, name), cv2.IMREAD_GRAYSCALE)
+            if image is not None:
+                frames.append((name, image))
+    return frames
+
+
+def load_manifest(folder):
+    """Reads manifest.csv into {file_name: [(data, symbology)]}, or None if there is none."""
+    path = os.path.join(folder, "manifest.csv")
+    if not os.path.exists(path):
+        return None
+    expected = defaultdict(list)
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            expected[row["file"]].append((row["data"], row["symbology"]))
+    return expected
+
+
+def benchmark_backend(decoder, frames, expected=None, repeat=1):
+    """Decodes every frame repeat times and returns a stats dict."""
+    latencies = []
+    hits = defaultdict(int)
+    totals = defaultdict(int)
+    reads = defaultdict(int)
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for name, image in frames:
+            t0 = time.perf_counter()
+            barcodes = decoder(image)
+            latencies.append(time.perf_counter() - t0)
+
+            decoded = {(b.data.decode("utf-8", "replace"), b.type) for b in barcodes}
+            for _, symbology in decoded:
+                reads[symbology] += 1
+            if expected is not None:
+                for data, symbology in expected.get(name, []):
+                    totals[symbology] += 1
+                    if (data, symbology) in decoded:
+                        hits[symbology] += 1
+    elapsed = time.perf_counter() - started
+
+    stats = {
+        "frames": len(latencies),
+        "throughput_fps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "reads": dict(reads),
+    }
+    if expected is not None:
+        stats["read_rate"] = {sym: round(hits[sym] / totals[sym], 3) for sym in sorted(totals)}
+        expected_total = sum(totals.values())
+        stats["success_rate"] = round(sum(hits.values()) / expected_total, 3) if expected_total else 0.0
+    return stats
+
+
+def run_benchmark(folder, backends=None, symbols=None, repeat=1):
+    """Benchmarks each named backend over folder; backends that cannot load are skipped."""
+    frames = load_frames(folder)
+    expected = load_manifest(folder)
+    results = {}
+    for name in backends or list(DECODERS):
+        try:
+            decoder = get_decoder(name, symbols or DEFAULT_SYMBOLS)
+        except (ImportError, AttributeError) as e:
+            print(f"Skipping '{name}': {e}")
+            continue
+        results[name] = benchmark_backend(decoder, frames, expected, repeat)
+    return results
+
+
+def print_report(results):
+    print(f"\n{'BACKEND':<10}{'FRAMES':>8}{'FPS':>10}{'P50 ms':>10}{'P99 ms':>10}  READ RATE")
+    for name, stats in results.items():
+        rates = stats.get("read_rate", stats["reads"])
+        rate_text = ", ".join(f"{sym}={val}" for sym, val in rates.items()) or "-"
+        print(f"{name:<10}{stats['frames']:>8}{stats['throughput_fps']:>10}"
+              f"{stats['p50_ms']:>10}{stats['p99_ms']:>10}  {rate_text}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark barcode decoder backends over recorded frames.")
+    parser.add_argument("folder", help="Folder of recorded frames (optionally with manifest.csv)")
+    parser.add_argument("--backends", nargs="+", choices=list(DECODERS), help="Backends to run (default: all)")
+    parser.add_argument("--symbols", nargs="+", default=DEFAULT_SYMBOLS, help="Symbologies to request")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the folder per backend")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.folder, args.backends, args.symbols, args.repeat)
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,104 @@
+from collections import namedtuple
+
+import cv2
+
+# --- Decoder Configuration ---
+DEFAULT_SYMBOLS = ["QRCODE", "EAN13", "CODE128"]
+
+# Normalised decode result. Field names match pyzbar's Decoded so the rest of
+# the scanner does not care which backend produced it.
+Rect = namedtuple("Rect", ["left", "top", "width", "height"])
+Point = namedtuple("Point", ["x", "y"])
+DecodedBarcode = namedtuple("DecodedBarcode", ["data", "type", "rect", "polygon"])
+
+# OpenCV reports symbologies as e.g. "EAN_13"; map them onto zbar names
+_OPENCV_TYPES = {
+    "EAN_13": "EAN13", "EAN_8": "EAN8", "UPC_A": "UPCA", "UPC_E": "UPCE",
+    "CODE_128": "CODE128", "CODE_39": "CODE39",
+}
+_OPENCV_1D = set(_OPENCV_TYPES.values())
+
+
+def _from_points(data, symbology, points):
+    polygon = [Point(int(x), int(y)) for x, y in points]
+    xs = [p.x for p in polygon]
+    ys = [p.y for p in polygon]
+    rect = Rect(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+    return DecodedBarcode(data.encode("utf-8"), symbology, rect, polygon)
+
+
+class DecoderBackend:
+    """Base class for barcode decoders.
+
+    Subclasses implement decode(gray) and return a list of DecodedBarcode.
+    Instances are callable so they can be passed wherever a decode function
+    is expected.
+    """
+
+    name = None
+
+    def __init__(self, symbols=None):
+        self.symbols = list(symbols or DEFAULT_SYMBOLS)
+
+    def decode(self, gray):
+        raise NotImplementedError
+
+    def __call__(self, gray):
+        return self.decode(gray)
+
+
+class PyzbarBackend(DecoderBackend):
+    name = "pyzbar"
+
+    def __init__(self, symbols=None):
+        super().__init__(symbols)
+        # Imported here so OpenCV-only installs (no libzbar) can still use other backends
+        from pyzbar.pyzbar import decode, ZBarSymbol
+        self._decode = decode
+        self._zbar_symbols = [ZBarSymbol[name] for name in self.symbols]
+
+    def decode(self, gray):
+        return [
+            DecodedBarcode(b.data, b.type, Rect(*b.rect), [Point(*p) for p in b.polygon])
+            for b in self._decode(gray, symbols=self._zbar_symbols)
+        ]
+
+
+class OpenCVBackend(DecoderBackend):
+    """OpenCV's built-in 1D barcode detector plus its QR code detector."""
+
+    name = "opencv"
+
+    def __init__(self, symbols=None):
+        super().__init__(symbols)
+        self._barcode = cv2.barcode.BarcodeDetector() if _OPENCV_1D & set(self.symbols) else None
+        self._qr = cv2.QRCodeDetector() if "QRCODE" in self.symbols else None
+
+    def decode(self, gray):
+        results = []
+        if self._barcode is not None:
+            ok, infos, types, points = self._barcode.detectAndDecodeWithType(gray)
+            if ok:
+                for data, kind, quad in zip(infos, types, points):
+                    symbology = _OPENCV_TYPES.get(kind, kind)
+                    if data and symbology in self.symbols:
+                        results.append(_from_points(data, symbology, quad))
+        if self._qr is not None:
+            ok, infos, points, _ = self._qr.detectAndDecodeMulti(gray)
+            if ok:
+                for data, quad in zip(infos, points):
+                    if data:
+                        results.append(_from_points(data, "QRCODE", quad))
+        return results
+
+
+DECODERS = {backend.name: backend for backend in (PyzbarBackend, OpenCVBackend)}
+
+
+def get_decoder(name="pyzbar", symbols=None):
+    """Creates the decoder backend registered under name."""
+    try:
+        backend = DECODERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown decoder '{name}'. Choose from: {', '.join(DECODERS)}")
+    return backend(symbols)
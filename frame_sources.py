@@ -0,0 +1,224 @@
+import os
+import time
+
+import cv2
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+DEFAULT_CAMERA_INDICES = (1, 2, 0)
+
+
+class FrameSource:
+    """Base class for anything the scanner can read frames from.
+
+    Sources follow the cv2.VideoCapture protocol (isOpened/read/release) so
+    they can be used wherever a capture object is expected. Finite sources
+    set `finished` once they run out of frames.
+    """
+
+    finished = False
+
+    def isOpened(self):
+        raise NotImplementedError
+
+    def read(self):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+    def set_idle(self, idle, fps=None):
+        """Hint that the scanner is idling at fps (or back to full speed). Live sources slow down."""
+
+    def flush(self):
+        """Drops frames the driver buffered, so the next read() is current."""
+
+
+class _Pacer:
+    """Sleeps between frames so replays run at their recorded frame rate."""
+
+    def __init__(self, fps):
+        self.interval = 1.0 / fps if fps and fps > 0 else 0.0
+        self._next = None
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self._next is None:
+            self._next = now
+        elif self._next > now:
+            time.sleep(self._next - now)
+        self._next = max(self._next + self.interval, now)
+
+
+class CameraSource(FrameSource):
+    """Live camera, probing the given indices in order until one delivers a frame."""
+
+    def __init__(self, indices=DEFAULT_CAMERA_INDICES):
+        self.index = None
+        self._cap = None
+        for index in indices:
+            cap = cv2.VideoCapture(index)
+            if cap.isOpened() and cap.read()[0]:
+                # Keep the driver buffer short so reads return the newest frame
+                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                self.index, self._cap = index, cap
+                break
+            cap.release()
+        self._active_fps = None
+
+    def isOpened(self):
+        return self._cap is not None and self._cap.isOpened()
+
+    def read(self):
+        return self._cap.read()
+
+    def set_idle(self, idle, fps=None):
+        # Lowering the capture rate saves the sensor, USB and driver work, not just our reads.
+        # Drivers that ignore CAP_PROP_FPS still get slow reads and a flush on wake.
+        if idle:
+            self._active_fps = self._active_fps or self._cap.get(cv2.CAP_PROP_FPS)
+            if fps:
+                self._cap.set(cv2.CAP_PROP_FPS, fps)
+        elif self._active_fps:
+            self._cap.set(cv2.CAP_PROP_FPS, self._active_fps)
+            self._active_fps = None
+
+    def flush(self, max_frames=5):
+        """Grabs (without decoding) until a grab has to wait for a new frame, i.e. the buffer is empty."""
+        for _ in range(max_frames):
+            started = time.monotonic()
+            if not self._cap.grab() or time.monotonic() - started > 0.01:
+                break
+
+    def release(self):
+        if self._cap is not None:
+            self._cap.release()
+
+
+class VideoFileSource(FrameSource):
+    """Replays a recorded video file at its own frame rate, or as fast as possible."""
+
+    def __init__(self, path, realtime=True, loop=False):
+        self.path = path
+        self.loop = loop
+        self._cap = cv2.VideoCapture(path)
+        self._pacer = _Pacer(self._cap.get(cv2.CAP_PROP_FPS) if realtime else 0)
+
+    def isOpened(self):
+        return self._cap.isOpened()
+
+    def read(self):
+        self._pacer.wait()
+        success, image = self._cap.read()
+        if not success and self.loop:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, image = self._cap.read()
+        if not success:
+            self.finished = True
+        return success, image
+
+    def release(self):
+        self._cap.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """Replays a folder of still images in file-name order."""
+
+    def __init__(self, path, fps=30, realtime=True, loop=False):
+        self.path = path
+        self.loop = loop
+        self.files = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        ) if os.path.isdir(path) else []
+        self._pos = 0
+        self._pacer = _Pacer(fps if realtime else 0)
+
+    def isOpened(self):
+        return bool(self.files)
+
+    def read(self):
+        if self._pos >= len(self.files):
+            if not self.loop or not self.files:
+                self.finished = True
+                return False, None
+            self._pos = 0
+        self._pacer.wait()
+        image = cv2.imread(self.files[self._pos])
+        self._pos += 1
+        return image is not None, image
+
+
+class RecordingSource(FrameSource):
+    """Wraps another source and saves every frame it delivers.
+
+    Recording to a folder writes numbered PNGs that ImageDirectorySource can
+    replay; any other path is written as a video file.
+    """
+
+    def __init__(self, source, path, fps=30):
+        self.source = source
+        self.path = path
+        self.fps = fps
+        self.count = 0
+        self._writer = None
+        self._to_folder = not os.path.splitext(path)[1]
+        if self._to_folder:
+            os.makedirs(path, exist_ok=True)
+
+    @property
+    def finished(self):
+        return self.source.finished
+
+    def isOpened(self):
+        return self.source.isOpened()
+
+    def read(self):
+        success, image = self.source.read()
+        if success:
+            self._write(image)
+        return success, image
+
+    def set_idle(self, idle, fps=None):
+        self.source.set_idle(idle, fps)
+
+    def flush(self):
+        self.source.flush()
+
+    def _write(self, image):
+        if self._to_folder:
+            cv2.imwrite(os.path.join(self.path, f"frame_{self.count:06d}.png"), image)
+        else:
+            if self._writer is None:
+                height, width = image.shape[:2]
+                self._writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*"mp4v"), self.fps, (width, height))
+            self._writer.write(image)
+        self.count += 1
+
+    def release(self):
+        self.source.release()
+        if self._writer is not None:
+            self._writer.release()
+
+
+def open_source(spec, realtime=True, loop=False):
+    """Builds a frame source from a spec string.
+
+    "camera" probes the default indices, "camera:1" opens one index,
+    "video:path.mp4" and "images:folder" replay recordings. A bare path is
+    treated as a folder of images or a video file.
+    """
+    if isinstance(spec, int):
+        return CameraSource((spec,))
+
+    kind, _, target = str(spec).partition(":")
+    if kind == "camera":
+        return CameraSource((int(target),) if target else DEFAULT_CAMERA_INDICES)
+    if kind == "video":
+        return VideoFileSource(target, realtime, loop)
+    if kind == "images":
+        return ImageDirectorySource(target, realtime=realtime, loop=loop)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, realtime=realtime, loop=loop)
+    return VideoFileSource(spec, realtime, loop)
@@ -0,0 +1,93 @@
+"""Runs the scan -> lookup -> add pipeline without a camera or a display.
+
+    python headless_scan.py video:session.mp4 --max-speed
+    python headless_scan.py images:recorded_frames/ --decoder opencv
+    python headless_scan.py camera:1 --record session_frames/
+
+Useful for reproducing field slowdowns from a recording and for
+benchmarking scanner changes on machines with no camera attached.
+"""
+import argparse
+import json
+import queue
+import time
+
+from cart_engine import Cart
+from catalog import CatalogCache
+from frame_sources import open_source
+from scanner import SCANNER_CONFIG, ScannerEngine
+from symbology import SymbologyProfile
+
+
+class HeadlessCart:
+    """Consumes scanner results and builds a cart the same way SmartCartApp does."""
+
+    def __init__(self, db_path="cart_database.db"):
+        self.catalog = CatalogCache(db_path).load()
+        self.cart = Cart()
+        self.not_found = []
+        self.scans = queue.Queue()
+
+    def on_scan(self, barcode, frame):
+        """Called from a decode worker; the lookup itself happens on the main thread."""
+        self.scans.put((barcode.data.decode('utf-8'), frame.captured_at))
+
+    def process_pending(self):
+        while True:
+            try:
+                barcode_data, _ = self.scans.get_nowait()
+            except queue.Empty:
+                return
+            product = self.catalog.get(barcode_data)
+            if product:
+                self.add_item(*product)
+            else:
+                self.not_found.append(barcode_data)
+
+    def add_item(self, barcode, name, price, discount, quantity_value, quantity_unit, quantity=1):
+        self.cart.add(barcode, name, price, discount, quantity_value, quantity_unit, quantity,
+                      self.catalog.tax_rate(barcode))
+
+
+def run(source_spec, realtime=True, decoder="pyzbar", record_to=None, db_path="cart_database.db", duration=None,
+        use_profile=True):
+    """Scans source_spec to completion (or for duration seconds) and returns a summary dict."""
+    cart = HeadlessCart(db_path)
+    config = {"decoder": decoder, "record_to": record_to, "stats_interval": 0}
+    profile = SymbologyProfile(cart.catalog.barcodes(), SCANNER_CONFIG["extra_symbols"]) if use_profile else None
+    engine = ScannerEngine(cart.on_scan, config, source=open_source(source_spec, realtime),
+                           on_error=lambda msg: print(msg), profile=profile)
+
+    started = time.monotonic()
+    if not engine.start():
+        raise RuntimeError(f"Could not open frame source '{source_spec}'")
+    while engine.running:
+        cart.process_pending()
+        if duration and time.monotonic() - started >= duration:
+            engine.stop()
+            break
+        time.sleep(0.01)
+    engine.wait()
+    cart.process_pending()
+
+    stats = engine.stats()
+    stats["elapsed_s"] = round(time.monotonic() - started, 2)
+    stats["cart_items"] = cart.cart.items
+    stats["cart_totals"] = cart.cart.totals()
+    stats["not_found"] = cart.not_found
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the scanner pipeline headless over a frame source.")
+    parser.add_argument("source", help='Frame source, e.g. "camera:1", "video:session.mp4", "images:frames/"')
+    parser.add_argument("--max-speed", action="store_true", help="Replay recordings as fast as possible")
+    parser.add_argument("--decoder", default="pyzbar", help="Decoder backend to use")
+    parser.add_argument("--record", help="Folder or video file to record the session to")
+    parser.add_argument("--db", default="cart_database.db", help="Product database")
+    parser.add_argument("--duration", type=float, help="Stop after this many seconds (for live cameras)")
+    parser.add_argument("--no-profile", action="store_true", help="Decode every default symbology and skip read validation")
+    args = parser.parse_args()
+
+    summary = run(args.source, not args.max_speed, args.decoder, args.record, args.db, args.duration, not args.no_profile)
+    print(json.dumps(summary, indent=2))
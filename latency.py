@@ -0,0 +1,132 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+# Stages a scan passes through, from the camera to a row in the cart table
+STAGES = ("capture", "decode", "dedupe", "lookup", "popup", "confirm", "display")
+
+
+class LatencyHistogram:
+    """HDR-style latency histogram with constant memory and O(1) recording.
+
+    Values are stored in whole microseconds. Buckets are powers of two, each
+    split into linear sub-buckets, so every recorded value keeps about two
+    significant digits of precision from 1 us up to `highest` seconds.
+    """
+
+    def __init__(self, highest=60.0, sub_bucket_bits=7):
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half = self.sub_bucket_count // 2
+        self.bits = sub_bucket_bits
+        self.highest_us = int(highest * 1_000_000)
+        self.counts = [0] * (self._index(self.highest_us) + 1)
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def _index(self, value):
+        bucket = max(value.bit_length() - self.bits, 0)
+        sub = value >> bucket
+        if bucket == 0:
+            return sub
+        return self.sub_bucket_count + (bucket - 1) * self.half + (sub - self.half)
+
+    def _value_at(self, index):
+        if index < self.sub_bucket_count:
+            return index
+        bucket, offset = divmod(index - self.sub_bucket_count, self.half)
+        return (self.half + offset) << (bucket + 1)
+
+    def record(self, seconds):
+        value = min(max(int(seconds * 1_000_000), 0), self.highest_us)
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total_us += value
+        self.max_us = max(self.max_us, value)
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+
+    def percentile(self, pct):
+        """Value in seconds at or below which pct percent of recordings fall."""
+        if not self.count:
+            return 0.0
+        target = max(int(round(pct / 100.0 * self.count)), 1)
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(self._value_at(index), self.max_us) / 1_000_000
+        return self.max_us / 1_000_000
+
+    def summary(self):
+        mean = self.total_us / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "mean_ms": round(mean / 1000, 2),
+            "p50_ms": round(self.percentile(50) * 1000, 2),
+            "p90_ms": round(self.percentile(90) * 1000, 2),
+            "p99_ms": round(self.percentile(99) * 1000, 2),
+            "max_ms": round(self.max_us / 1000, 2),
+        }
+
+
+class LatencyTracker:
+    """Follows each scanned barcode through STAGES and histograms the gaps.
+
+    mark(code, stage) timestamps a stage for the scan currently in flight
+    for that code. The time since the previous marked stage goes into the
+    "prev->stage" histogram, and reaching the last stage also records the
+    end-to-end "capture->display" time. Scans that never finish (cancelled
+    popups, unknown barcodes) are dropped via discard() or once more than
+    max_traces are in flight.
+    """
+
+    def __init__(self, max_traces=256):
+        self.max_traces = max_traces
+        self.histograms = {}
+        self._traces = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, code, stage, at=None):
+        at = time.monotonic() if at is None else at
+        with self._lock:
+            trace = self._traces.get(code)
+            if trace is None or stage == STAGES[0]:
+                trace = self._traces[code] = OrderedDict()
+                while len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+
+            if trace:
+                prev_stage, prev_at = next(reversed(trace.items()))
+                self._record(f"{prev_stage}->{stage}", at - prev_at)
+            trace[stage] = at
+
+            if stage == STAGES[-1]:
+                if STAGES[0] in trace:
+                    self._record(f"{STAGES[0]}->{stage}", at - trace[STAGES[0]])
+                del self._traces[code]
+
+    def discard(self, code):
+        with self._lock:
+            self._traces.pop(code, None)
+
+    def _record(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def summary(self):
+        with self._lock:
+            return {name: hist.summary() for name, hist in self.histograms.items()}
+
+    def dump_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def overlay_text(self):
+        """Compact one-line-per-stage text for an on-screen status overlay."""
+        lines = [f"{name:<22} p50 {s['p50_ms']:>7} ms  p99 {s['p99_ms']:>7} ms  n={s['count']}"
+                 for name, s in self.summary().items()]
+        return "\n".join(lines) or "No scans measured yet."
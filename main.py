@@ -2,6 +2,8 @@ import tkinter as tk
 from start_page import WelcomeScreen
 from user_auth import AuthApp
 from cart import SmartCartApp
+from database import get_connection
+from migrations import migrate
 
 class MainApp(tk.Tk):
     def __init__(self):
@@ -26,6 +28,7 @@ class MainApp(tk.Tk):
         self.container.grid_columnconfigure(0, weight=1)
 
         self.frames = {}
+        self.current_frame = None
 
         # --- Initialize All Pages ---
         # We pass 'self' as the controller so pages can access shared_data
@@ -37,10 +40,16 @@ class MainApp(tk.Tk):
 
         # Start at Welcome Screen
         self.show_frame("WelcomeScreen")
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def show_frame(self, page_name):
         """Bring the requested frame to the front"""
         frame = self.frames[page_name]
+
+        # Let the page being covered release what it holds (e.g. the camera)
+        if self.current_frame is not None and self.current_frame is not frame and hasattr(self.current_frame, "on_hide"):
+            self.current_frame.on_hide()
+        self.current_frame = frame
         
         # Helper: If the page has an 'on_show' method, call it to refresh data
         if hasattr(frame, "on_show"):
@@ -48,6 +57,14 @@ class MainApp(tk.Tk):
             
         frame.tkraise()
 
+    def on_close(self):
+        """Shut down background services before the window goes away"""
+        for frame in self.frames.values():
+            if hasattr(frame, "on_close"):
+                frame.on_close()
+        self.destroy()
+
 if __name__ == "__main__":
+    migrate(get_connection())
     app = MainApp()
     app.mainloop()
\ No newline at end of file
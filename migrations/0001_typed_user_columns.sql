@@ -0,0 +1,37 @@
+-- users was created with VARCHAR(512) for everything, and empty or 'NULL'
+-- strings stand in for missing values. Rebuild it with real column types.
+-- phone_no stays TEXT: it is compared and displayed as a string and may
+-- carry a leading zero or '+'.
+CREATE TABLE users_typed (
+    id INTEGER PRIMARY KEY,
+    username TEXT,
+    email TEXT,
+    phone_no TEXT,
+    last_time_spend REAL,
+    avg_time REAL,
+    last_spend REAL,
+    avg_spend REAL,
+    last_purchase TIMESTAMP,
+    total_purchase REAL NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO users_typed
+    (id, username, email, phone_no, last_time_spend, avg_time, last_spend, avg_spend,
+     last_purchase, total_purchase, created_at)
+SELECT
+    id,
+    username,
+    email,
+    phone_no,
+    CAST(NULLIF(NULLIF(TRIM(last_time_spend), ''), 'NULL') AS REAL),
+    CAST(NULLIF(NULLIF(TRIM(avg_time), ''), 'NULL') AS REAL),
+    CAST(NULLIF(NULLIF(TRIM(last_spend), ''), 'NULL') AS REAL),
+    CAST(NULLIF(NULLIF(TRIM(avg_spend), ''), 'NULL') AS REAL),
+    NULLIF(NULLIF(TRIM(last_purchase), ''), 'NULL'),
+    COALESCE(CAST(NULLIF(NULLIF(TRIM(total_purchase), ''), 'NULL') AS REAL), 0),
+    NULLIF(NULLIF(TRIM(created_at), ''), 'NULL')
+FROM users;
+
+DROP TABLE users;
+ALTER TABLE users_typed RENAME TO users;
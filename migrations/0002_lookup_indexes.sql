@@ -0,0 +1,6 @@
+-- Indexes for the lookups the app runs on every checkout.
+CREATE INDEX IF NOT EXISTS idx_users_email ON users (email);
+CREATE INDEX IF NOT EXISTS idx_users_phone_no ON users (phone_no);
+CREATE INDEX IF NOT EXISTS idx_bills_user_id ON bills (user_id);
+CREATE INDEX IF NOT EXISTS idx_bills_created_at ON bills (created_at);
+CREATE INDEX IF NOT EXISTS idx_orders_user_id ON orders (user_id);
@@ -0,0 +1,22 @@
+-- Full-text index over product names for manual lookup of unscannable items.
+-- External-content table: the text lives in products, triggers keep the index in step.
+CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+    product_name,
+    content = 'products',
+    content_rowid = 'product_id',
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '1 2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS products_fts_insert AFTER INSERT ON products BEGIN
+    INSERT INTO products_fts (rowid, product_name) VALUES (NEW.product_id, NEW.product_name);
+END;
+CREATE TRIGGER IF NOT EXISTS products_fts_delete AFTER DELETE ON products BEGIN
+    INSERT INTO products_fts (products_fts, rowid, product_name) VALUES ('delete', OLD.product_id, OLD.product_name);
+END;
+CREATE TRIGGER IF NOT EXISTS products_fts_update AFTER UPDATE OF product_name ON products BEGIN
+    INSERT INTO products_fts (products_fts, rowid, product_name) VALUES ('delete', OLD.product_id, OLD.product_name);
+    INSERT INTO products_fts (rowid, product_name) VALUES (NEW.product_id, NEW.product_name);
+END;
+
+INSERT INTO products_fts (products_fts) VALUES ('rebuild');
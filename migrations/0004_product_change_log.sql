@@ -0,0 +1,22 @@
+-- Change log the in-memory catalog cache and catalog sync read from: every
+-- insert, catalog update and delete on products gets a version. Stock
+-- updates are not logged, they don't change what carts show.
+CREATE TABLE IF NOT EXISTS product_changes (
+    version INTEGER PRIMARY KEY AUTOINCREMENT,
+    barcode TEXT NOT NULL,
+    op TEXT NOT NULL              -- 'upsert' or 'delete'
+);
+
+CREATE TRIGGER IF NOT EXISTS products_log_insert AFTER INSERT ON products BEGIN
+    INSERT INTO product_changes (barcode, op) VALUES (NEW.barcode, 'upsert');
+END;
+
+CREATE TRIGGER IF NOT EXISTS products_log_update
+AFTER UPDATE OF barcode, product_name, mrp, discount, quantity_value, quantity_unit, tax_rate ON products BEGIN
+    INSERT INTO product_changes (barcode, op) SELECT OLD.barcode, 'delete' WHERE OLD.barcode != NEW.barcode;
+    INSERT INTO product_changes (barcode, op) VALUES (NEW.barcode, 'upsert');
+END;
+
+CREATE TRIGGER IF NOT EXISTS products_log_delete AFTER DELETE ON products BEGIN
+    INSERT INTO product_changes (barcode, op) VALUES (OLD.barcode, 'delete');
+END;
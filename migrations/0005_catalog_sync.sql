@@ -0,0 +1,7 @@
+-- Catalog delta sync (catalog_sync.py).
+-- On a cart: which master it syncs from and the last master change version applied
+CREATE TABLE IF NOT EXISTS sync_state (
+    source TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
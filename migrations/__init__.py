@@ -0,0 +1,68 @@
+"""Versioned schema migrations.
+
+Each migration is an SQL file in this folder named NNNN_description.sql.
+migrate() applies the ones newer than the database's schema_version, in
+order, each inside its own transaction together with its schema_version
+row, so a failed migration leaves the database at the previous version.
+
+    python -m migrations [cart_database.db]     # apply pending migrations
+    python -m migrations --status
+"""
+import os
+import re
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+_FILE_PATTERN = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+SCHEMA_VERSION_SQL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def discover(folder=MIGRATIONS_DIR):
+    """[(version, name, path)] for every migration file, sorted by version."""
+    migrations = []
+    for file_name in os.listdir(folder):
+        match = _FILE_PATTERN.match(file_name)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(folder, file_name)))
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration versions in {folder}")
+    return migrations
+
+
+def current_version(conn):
+    conn.execute(SCHEMA_VERSION_SQL)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def pending(conn, folder=MIGRATIONS_DIR):
+    version = current_version(conn)
+    return [m for m in discover(folder) if m[0] > version]
+
+
+def migrate(conn, folder=MIGRATIONS_DIR, target=None):
+    """Applies pending migrations up to target (default: all). Returns the versions applied."""
+    conn.commit()
+    applied = []
+    for version, name, path in pending(conn, folder):
+        if target is not None and version > target:
+            break
+        with open(path, encoding="utf-8") as f:
+            sql = f.read()
+        try:
+            # executescript runs outside Python's implicit transactions, so open one explicitly
+            conn.executescript(
+                f"BEGIN;\n{sql}\n;INSERT INTO schema_version (version, name) VALUES ({version}, '{name}');\nCOMMIT;")
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        applied.append(version)
+    return applied
@@ -0,0 +1,18 @@
+import argparse
+
+from database import DB_PATH, get_connection
+from migrations import current_version, migrate, pending
+
+parser = argparse.ArgumentParser(description="Apply pending schema migrations.")
+parser.add_argument("db", nargs="?", default=DB_PATH, help="Database file")
+parser.add_argument("--status", action="store_true", help="Only show the current version and pending migrations")
+args = parser.parse_args()
+
+conn = get_connection(args.db)
+if args.status:
+    print(f"Schema version: {current_version(conn)}")
+    for version, name, _ in pending(conn):
+        print(f"  pending {version:04d} {name}")
+else:
+    applied = migrate(conn)
+    print(f"Applied {len(applied)} migration(s); schema version is now {current_version(conn)}.")
@@ -0,0 +1,139 @@
+"""Product name search for items whose barcode will not scan.
+
+Backed by the products_fts FTS5 index (see migrations/0006_product_search_by_length.sql),
+which triggers keep in sync with products. Every word typed is matched as a
+prefix, so "sun oi" finds "Sunflower Oil"; the shortest matching names come
+first. The index is keyed by name length, so that order is the index's own
+and a search reads only as many matches as it returns, however broad the
+query. A query made only of digits also matches barcodes that start with it,
+for typing in the numbers printed under a damaged label.
+
+    python product_search.py "sun oil"
+    python product_search.py --bench 200000     # fails if any keystroke takes over TARGET_MS
+"""
+import argparse
+import csv
+import os
+import re
+import shutil
+import statistics
+import tempfile
+import time
+
+from catalog import PRODUCT_COLUMNS
+from database import DB_PATH, close_connection, get_connection
+
+# Search-as-you-type budget per keystroke
+TARGET_MS = 10.0
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_COLUMNS = ", ".join(f"p.{c}" for c in PRODUCT_COLUMNS)
+_PRODUCT_ID_MASK = (1 << 32) - 1   # products_fts rowids are (name length << 32) + product_id
+
+
+def fts_query(text):
+    """Turns free text into an FTS5 query that requires every word as a prefix, or None."""
+    words = _WORD.findall(text.lower())
+    return " ".join(f'"{word}"*' for word in words) or None
+
+
+def search_products(text, limit=10, db_path=DB_PATH):
+    """Best matches for text as product tuples (see catalog.PRODUCT_COLUMNS)."""
+    conn = get_connection(db_path)
+    results = []
+    text = text.strip()
+    if text.isdigit():
+        # Barcodes are TEXT, so a prefix is a range on the UNIQUE barcode index
+        results = conn.execute(f"SELECT {_COLUMNS} FROM products p WHERE p.barcode >= ? AND p.barcode < ? "
+                               f"ORDER BY p.barcode LIMIT ?", (text, text + "￿", limit)).fetchall()
+
+    query = fts_query(text)
+    if query and len(results) < limit:
+        seen = {row[0] for row in results}
+        rows = conn.execute(f"""
+            SELECT {_COLUMNS} FROM (
+                SELECT rowid FROM products_fts WHERE products_fts MATCH ? ORDER BY rowid LIMIT ?
+            ) f JOIN products p ON p.product_id = f.rowid & {_PRODUCT_ID_MASK}
+            ORDER BY f.rowid
+        """, (query, limit + len(seen))).fetchall()
+        results.extend(row for row in rows if row[0] not in seen)
+    return results[:limit]
+
+
+# --- Benchmark ---
+def typing_session(names):
+    """Every query a shopper types on the way to each of names, one keystroke at a time."""
+    queries = []
+    for name in names:
+        queries.extend(name[:end] for end in range(1, len(name) + 1) if not name[end - 1].isspace())
+    return queries
+
+
+def run_benchmark(count=200_000, repeats=3):
+    """Times search_products over a synthetic catalog of count products.
+
+    Returns {"skus", "queries", "p50_ms", "p95_ms", "max_ms", "slowest"};
+    each query's time is the best of repeats runs.
+    """
+    # Imported here so plain searches don't pull in the catalog tooling
+    from cart_database import setup_database
+    from catalog_import import import_catalog
+    from compact_catalog import ROW_COLUMNS, synthetic_rows
+
+    folder = tempfile.mkdtemp(prefix="product-search-bench-")
+    db_path = os.path.join(folder, "bench.db")
+    setup_database(db_path)
+    # Loaded the way a store loads its price list, which rebuilds the search index once
+    prices = os.path.join(folder, "prices.csv")
+    with open(prices, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(ROW_COLUMNS)
+        writer.writerows(synthetic_rows(count))
+    import_catalog(prices, db_path, rebuild_indexes=True)
+
+    conn = get_connection(db_path)
+    sample = [row[0] for row in conn.execute("SELECT product_name FROM products ORDER BY product_id DESC LIMIT 5")]
+    queries = typing_session(sample) + ["8901", "890105", "zzzz", "tata soap", "soap tata", "rice 99"]
+    timings = []
+    for query in queries:
+        best = float("inf")
+        for _ in range(repeats):
+            started = time.perf_counter()
+            search_products(query, 8, db_path)
+            best = min(best, time.perf_counter() - started)
+        timings.append((best * 1000, query))
+
+    close_connection(db_path)
+    shutil.rmtree(folder, ignore_errors=True)
+
+    times = sorted(ms for ms, _ in timings)
+    return {
+        "skus": count,
+        "queries": len(queries),
+        "p50_ms": round(statistics.median(times), 3),
+        "p95_ms": round(times[int(len(times) * 0.95) - 1], 3),
+        "max_ms": round(times[-1], 3),
+        "slowest": max(timings)[1],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search products by name or barcode prefix.")
+    parser.add_argument("query", nargs="*", help="Words to search for")
+    parser.add_argument("--bench", type=int, metavar="SKUS", help="Benchmark on a synthetic catalog of this size")
+    args = parser.parse_args()
+
+    if args.bench:
+        report = run_benchmark(args.bench)
+        for name, value in report.items():
+            print(f"{name:<10}{value}")
+        if report["max_ms"] > TARGET_MS:
+            raise SystemExit(f"Slowest query took {report['max_ms']} ms, over the {TARGET_MS} ms target.")
+        raise SystemExit(0)
+
+    started = time.perf_counter()
+    matches = search_products(" ".join(args.query))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    for barcode, name, mrp, *_ in matches:
+        print(f"{barcode:<16}{name:<40}₹{mrp:.2f}")
+    print(f"{len(matches)} match(es) in {elapsed_ms:.2f} ms")
@@ -0,0 +1,150 @@
+"""Constant-time random product sampling for simulations and load generators.
+
+ORDER BY RANDOM() sorts the whole products table to return one row, and
+loading every barcode into a list just to pick a few is no better. These
+samplers cost O(1) per draw however large the catalog gets:
+
+* ProductSampler picks a random product_id between MIN and MAX (both read
+  from the rowid index) and retries on gaps left by deleted products.
+* CatalogSampler picks from a CatalogCache without touching the database.
+* weighted=True draws in proportion to units sold (from bills.items_json)
+  through Vose's alias method, so simulated traffic looks like real traffic.
+"""
+import random
+
+from catalog import PRODUCT_COLUMNS
+from database import DB_PATH, get_connection
+
+_SELECT = f"SELECT {', '.join(PRODUCT_COLUMNS)} FROM products"
+
+
+class AliasTable:
+    """Vose's alias method: O(n) to build, O(1) per weighted draw."""
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        if not n or total <= 0:
+            raise ValueError("AliasTable needs at least one positive weight")
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def __len__(self):
+        return len(self.prob)
+
+    def sample(self, rng=random):
+        i = rng.randrange(len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+def sales_by_product_id(conn):
+    """{product_id: units sold} summed over every bill's items_json."""
+    rows = conn.execute("""
+        SELECT json_extract(item.value, '$.id'), SUM(json_extract(item.value, '$.qty'))
+        FROM bills, json_each(bills.items_json) AS item
+        WHERE json_valid(bills.items_json)
+        GROUP BY 1
+    """)
+    return {product_id: qty for product_id, qty in rows if product_id is not None and qty}
+
+
+class ProductSampler:
+    """Draws random products straight from the database by product_id.
+
+    With weighted=True products are drawn in proportion to units sold; every
+    product also gets `smoothing` extra units so unsold items still appear.
+    The weighted table is built once (one pass over products and bills);
+    call reload_weights() to pick up new sales.
+    """
+
+    def __init__(self, db_path=DB_PATH, weighted=False, smoothing=1.0, rng=None, max_retries=8):
+        self.db_path = db_path
+        self.rng = rng or random.Random()
+        self.max_retries = max_retries
+        self.smoothing = smoothing
+        self._ids = None
+        self._table = None
+        if weighted:
+            self.reload_weights()
+
+    @property
+    def conn(self):
+        return get_connection(self.db_path)
+
+    def reload_weights(self):
+        conn = self.conn
+        sales = sales_by_product_id(conn)
+        self._ids = [row[0] for row in conn.execute("SELECT product_id FROM products")]
+        weights = [sales.get(product_id, 0) + self.smoothing for product_id in self._ids]
+        self._table = AliasTable(weights) if self._ids else None
+
+    def id_range(self):
+        """(lowest, highest) product_id, or None for an empty catalog."""
+        low, high = self.conn.execute("SELECT MIN(product_id), MAX(product_id) FROM products").fetchone()
+        return None if low is None else (low, high)
+
+    def random_product(self):
+        """A product tuple (see catalog.PRODUCT_COLUMNS), or None if there are no products."""
+        if self._table is not None:
+            return self._by_id(self._ids[self._table.sample(self.rng)]) or self._uniform()
+        return self._uniform()
+
+    def sample_barcodes(self, k):
+        """Up to k distinct barcodes; stops early if the catalog runs out of new ones."""
+        picked = {}
+        for _ in range(k * 4 + self.max_retries):
+            if len(picked) >= k:
+                break
+            product = self.random_product()
+            if product is None:
+                break
+            picked.setdefault(product[0], None)
+        return list(picked)
+
+    def _uniform(self):
+        bounds = self.id_range()
+        if bounds is None:
+            return None
+        for _ in range(self.max_retries):
+            product = self._by_id(self.rng.randint(*bounds))
+            if product:
+                return product
+        # Sparse ids: take the next product after a random point instead
+        return self.conn.execute(f"{_SELECT} WHERE product_id >= ? ORDER BY product_id LIMIT 1",
+                                 (self.rng.randint(*bounds),)).fetchone()
+
+    def _by_id(self, product_id):
+        return self.conn.execute(f"{_SELECT} WHERE product_id = ?", (product_id,)).fetchone()
+
+
+class CatalogSampler:
+    """Draws random products from a CatalogCache or catalog snapshot with no database access."""
+
+    def __init__(self, catalog, rng=None):
+        self.catalog = catalog
+        self.rng = rng or random.Random()
+        self._generation = None
+        self._products = ()
+
+    def random_product(self):
+        if hasattr(self.catalog, "product_at"):
+            # Array-backed catalogs can address rows directly
+            count = len(self.catalog)
+            return self.catalog.product_at(self.rng.randrange(count)) if count else None
+        if self._generation != self.catalog.generation:
+            # Rebuilt only after the cache has reloaded
+            self._products = tuple(self.catalog.products.values())
+            self._generation = self.catalog.generation
+        return self.rng.choice(self._products) if self._products else None
@@ -0,0 +1,647 @@
+import threading
+import time
+from collections import deque, namedtuple
+
+import cv2
+
+from decoders import DEFAULT_SYMBOLS, get_decoder
+from frame_sources import RecordingSource, open_source
+
+# --- Scanner Configuration ---
+SCANNER_CONFIG = {
+    "source": "camera:1",         # See frame_sources.open_source, e.g. "video:session.mp4"
+    "realtime": True,             # Replay recordings at their own frame rate
+    "record_to": None,            # Folder or video file to record live frames to
+    "queue_size": 2,              # Frames waiting for a decoder, oldest dropped first
+    "decode_workers": 2,
+    "decoder": "pyzbar",          # Decoder backend, see decoders.DECODERS
+    "symbols": DEFAULT_SYMBOLS,   # Used when no catalog symbology profile is given
+    "extra_symbols": ["QRCODE"],  # Decoded on top of the catalog profile; QR labels aren't catalog barcodes
+    "pyramid_widths": (320, 640, 0),  # Decode widths tried in order on a miss (0 = native)
+    "pyramid_hold": 30,           # Frames a learned (larger) pyramid level is kept before retrying smaller ones
+    "roi_padding": 0.5,           # ROI crop margin, as a fraction of the last barcode size
+    "roi_full_frame_every": 10,   # Decode the whole frame at least every Nth frame
+    "motion_gate": True,          # Only decode when the scene changes or an item is in view
+    "motion_threshold": 4.0,      # Mean abs pixel difference that counts as motion
+    "motion_hold": 1.0,           # Seconds to keep decoding after the last motion
+    "idle_after": 10.0,           # Quiet seconds before capture drops to idle_fps
+    "idle_fps": 2,
+    "dedupe_hold": 0.6,           # Seconds a code may go unseen and still be the same presentation
+    "dedupe_rearm": 0.4,          # Extra seconds after it leaves before the same code can fire again
+    "stats_interval": 5.0,        # Seconds between stats reports (0 disables)
+    "preview": True,              # Show a rate-limited preview inside the Tk window
+    "preview_fps": 10,
+    "preview_size": (160, 120),
+}
+
+# A captured camera frame tagged with its sequence number and capture time
+Frame = namedtuple("Frame", ["seq", "captured_at", "image"])
+
+
+class FrameQueue:
+    """Bounded frame queue that drops the oldest frame when full.
+
+    The capture thread never blocks on a slow decoder; decoders always
+    pick up one of the most recent frames instead of a stale backlog.
+    """
+
+    def __init__(self, maxsize=2):
+        self._frames = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, frame):
+        with self._cond:
+            if len(self._frames) == self._frames.maxlen:
+                self.dropped += 1
+            self._frames.append(frame)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Returns the next frame, or None on timeout or once the queue is closed."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._frames or self._closed, timeout)
+            if not self._frames:
+                return None
+            return self._frames.popleft()
+
+    def clear(self):
+        with self._cond:
+            self._frames.clear()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def __len__(self):
+        with self._cond:
+            return len(self._frames)
+
+
+class RateMeter:
+    """Counts events over a sliding window to report a per-second rate."""
+
+    def __init__(self, window=2.0):
+        self.window = window
+        self._stamps = deque()
+        self._lock = threading.Lock()
+
+    def tick(self, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._stamps.append(now)
+            self._trim(now)
+
+    def rate(self, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._trim(now)
+            return len(self._stamps) / self.window
+
+    def _trim(self, now):
+        while self._stamps and now - self._stamps[0] > self.window:
+            self._stamps.popleft()
+
+
+def _transform_barcode(barcode, scale=1.0, dx=0, dy=0):
+    """Maps a decoded barcode's rect and polygon from a scaled crop back to frame coordinates."""
+    rect = barcode.rect
+    rect = type(rect)(int(rect.left / scale) + dx, int(rect.top / scale) + dy,
+                      int(rect.width / scale), int(rect.height / scale))
+    polygon = [type(p)(int(p.x / scale) + dx, int(p.y / scale) + dy) for p in barcode.polygon]
+    return barcode._replace(rect=rect, polygon=polygon)
+
+
+class ROITracker:
+    """Tracks where the last barcode was seen so the next frames decode a crop.
+
+    Decoding a padded crop around the previous hit is several times cheaper
+    than the full frame. The full frame is still decoded on a crop miss and
+    every Nth frame so new items elsewhere in view are picked up.
+    """
+
+    def __init__(self, padding=0.5, full_frame_every=10, min_padding=24):
+        self.padding = padding
+        self.full_frame_every = full_frame_every
+        self.min_padding = min_padding
+        self._rect = None
+        self._since_full = 0
+        self._lock = threading.Lock()
+
+    def region(self, shape):
+        """Returns the (x, y, w, h) crop to try first, or None for a full-frame decode."""
+        with self._lock:
+            self._since_full += 1
+            if self._rect is None or self._since_full >= self.full_frame_every:
+                self._since_full = 0
+                return None
+            left, top, right, bottom = self._rect
+
+        frame_h, frame_w = shape[:2]
+        pad_x = max(int((right - left) * self.padding), self.min_padding)
+        pad_y = max(int((bottom - top) * self.padding), self.min_padding)
+        x0, y0 = max(left - pad_x, 0), max(top - pad_y, 0)
+        x1, y1 = min(right + pad_x, frame_w), min(bottom + pad_y, frame_h)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return x0, y0, x1 - x0, y1 - y0
+
+    def update(self, barcodes):
+        """Records the bounding box of all barcodes hit in a frame (or clears it on a miss)."""
+        with self._lock:
+            if not barcodes:
+                self._rect = None
+                return
+            self._rect = (
+                min(b.rect.left for b in barcodes),
+                min(b.rect.top for b in barcodes),
+                max(b.rect.left + b.rect.width for b in barcodes),
+                max(b.rect.top + b.rect.height for b in barcodes),
+            )
+
+    def decode(self, gray, decoder, fallback=None):
+        """Runs decoder(image) on the tracked crop first, falling back to fallback(gray)
+        (or the same decoder) on the full frame."""
+        region = self.region(gray.shape)
+        if region is not None:
+            x, y, w, h = region
+            barcodes = decoder(gray[y:y + h, x:x + w])
+            if barcodes:
+                barcodes = [_transform_barcode(b, dx=x, dy=y) for b in barcodes]
+                self.update(barcodes)
+                return barcodes
+
+        barcodes = (fallback or decoder)(gray)
+        self.update(barcodes)
+        return barcodes
+
+
+def has_barcode_region(gray, min_area=0.004):
+    """Cheap check for a dense patch of strong edges that looks like a barcode.
+
+    Used to decide whether a decode miss is worth retrying at a larger scale.
+    """
+    gx = cv2.convertScaleAbs(cv2.Sobel(gray, cv2.CV_16S, 1, 0, ksize=3))
+    gy = cv2.convertScaleAbs(cv2.Sobel(gray, cv2.CV_16S, 0, 1, ksize=3))
+    edges = cv2.blur(cv2.add(gx, gy), (7, 7))
+    _, mask = cv2.threshold(edges, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (15, 5))
+    mask = cv2.erode(cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel), None, iterations=2)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    limit = min_area * gray.shape[0] * gray.shape[1]
+    return any(cv2.contourArea(c) >= limit for c in contours)
+
+
+class DecodePyramid:
+    """Multi-resolution decode that starts small and escalates only when needed.
+
+    A miss at one level only moves up to the next (larger) width if the frame
+    contains a barcode-like region. The level that succeeded is remembered per
+    symbology and later frames start at the lowest remembered level. A
+    remembered level expires hold_frames frames after it was learned, so one
+    hard frame doesn't keep every later frame at native resolution.
+    """
+
+    def __init__(self, widths=(320, 640, 0), hold_frames=30):
+        self.widths = widths
+        self.hold_frames = hold_frames
+        self.level_by_symbology = {}   # symbology -> (level, frame number it was learned at)
+        self._frames = 0
+        self._lock = threading.Lock()
+
+    def start_level(self):
+        with self._lock:
+            for symbology, (_, learned_at) in list(self.level_by_symbology.items()):
+                if self._frames - learned_at >= self.hold_frames:
+                    del self.level_by_symbology[symbology]
+            return min((level for level, _ in self.level_by_symbology.values()), default=0)
+
+    def decode(self, gray, decoder):
+        with self._lock:
+            self._frames += 1
+        frame_w = gray.shape[1]
+        for level in range(self.start_level(), len(self.widths)):
+            width = self.widths[level] or frame_w
+            scale = min(width / frame_w, 1.0)
+            if scale < 1.0:
+                image = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            else:
+                image = gray
+
+            barcodes = decoder(image)
+            if barcodes:
+                with self._lock:
+                    for barcode in barcodes:
+                        # Succeeding again at the same level doesn't extend its hold
+                        learned = self.level_by_symbology.get(barcode.type)
+                        if learned is None or learned[0] != level:
+                            self.level_by_symbology[barcode.type] = (level, self._frames)
+                return [_transform_barcode(b, scale) for b in barcodes]
+
+            if scale >= 1.0 or not has_barcode_region(image):
+                break
+        return []
+
+
+class MotionGate:
+    """Cheap scene-change detector that decides whether a frame is worth decoding.
+
+    Frames are shrunk to a small gray thumbnail and compared with the previous
+    one. Decoding runs while the scene is changing, for motion_hold seconds
+    after it settles, and while a barcode is still in view.
+    """
+
+    def __init__(self, threshold=4.0, hold=1.0, idle_after=10.0, thumb_size=(80, 60)):
+        self.threshold = threshold
+        self.hold = hold
+        self.idle_after = idle_after
+        self.thumb_size = thumb_size
+        self.item_in_view = False
+        self._prev = None
+        self._last_motion = time.monotonic()
+
+    def check(self, image, now=None):
+        """Returns True if this frame should be decoded."""
+        now = time.monotonic() if now is None else now
+        thumb = cv2.resize(image, self.thumb_size, interpolation=cv2.INTER_AREA)
+        if thumb.ndim == 3:
+            thumb = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+
+        if self._prev is None or cv2.absdiff(thumb, self._prev).mean() > self.threshold:
+            self._last_motion = now
+        self._prev = thumb
+
+        return self.item_in_view or now - self._last_motion <= self.hold
+
+    def idle(self, now=None):
+        """True once nothing has moved or been in view for idle_after seconds."""
+        now = time.monotonic() if now is None else now
+        return not self.item_in_view and now - self._last_motion >= self.idle_after
+
+
+class ScanDebouncer:
+    """Per-code debounce that emits exactly one event per physical presentation.
+
+    A code fires the first time it is seen. It stays present while it keeps
+    being seen within hold_time, so missed frames do not re-fire it. Once it
+    has been gone for hold_time it is released, and it is re-armed
+    rearm_delay seconds later; a reappearance before that continues the old
+    presentation. Several codes in one frame are tracked independently.
+    """
+
+    def __init__(self, hold_time=0.6, rearm_delay=0.4):
+        self.hold_time = hold_time
+        self.rearm_delay = rearm_delay
+        self._last_seen = {}   # code -> last time it was seen (present codes)
+        self._left_at = {}     # code -> time it was released (waiting to re-arm)
+        self._lock = threading.Lock()
+
+    def update(self, codes, now=None):
+        """Feeds the codes seen in one frame; returns the ones that start a new presentation."""
+        now = time.monotonic() if now is None else now
+        fired = []
+        with self._lock:
+            self._expire(now)
+            for code in codes:
+                if code not in self._last_seen and code not in self._left_at:
+                    fired.append(code)
+                self._left_at.pop(code, None)
+                self._last_seen[code] = now
+        return fired
+
+    def present(self):
+        with self._lock:
+            return list(self._last_seen)
+
+    def reset(self):
+        with self._lock:
+            self._last_seen.clear()
+            self._left_at.clear()
+
+    def _expire(self, now):
+        for code, seen in list(self._last_seen.items()):
+            if now - seen > self.hold_time:
+                del self._last_seen[code]
+                self._left_at[code] = seen + self.hold_time
+        for code, left in list(self._left_at.items()):
+            if now - left >= self.rearm_delay:
+                del self._left_at[code]
+
+
+class ScannerEngine:
+    """Pipelined barcode scanner.
+
+    One capture thread reads frames from a frame source into a FrameQueue and a
+    pool of decode workers decode them. Results are handled in capture order;
+    results for frames older than one already handled are discarded. Every
+    decoded frame goes to on_result(frame, barcodes) and each new physical
+    presentation of a code goes once to on_scan(barcode, frame).
+
+    With a symbology profile (see symbology.SymbologyProfile) the decoder only
+    looks for the catalog's symbologies and reads the profile rejects are
+    dropped before they reach the debouncer.
+
+    The engine never touches OpenCV's HighGUI; previews poll latest_frame().
+
+    A source passed in is owned by the engine and released when the run
+    ends, so it serves a single start(); without one, config["source"] is
+    opened afresh on every start().
+    """
+
+    def __init__(self, on_scan, config=None, on_stats=None, on_error=None, source=None, on_result=None, tracker=None,
+                 profile=None):
+        self.config = dict(SCANNER_CONFIG, **(config or {}))
+        self.source = source
+        self.tracker = tracker
+        self.profile = profile
+        self.on_scan = on_scan
+        self.on_result = on_result
+        self.on_stats = on_stats
+        self.on_error = on_error
+
+        self.queue = FrameQueue(self.config["queue_size"])
+        symbols = profile.symbols if profile else self.config["symbols"]
+        self.decoder = get_decoder(self.config["decoder"], symbols)
+        self.pyramid = DecodePyramid(self.config["pyramid_widths"], self.config["pyramid_hold"])
+        self.roi = ROITracker(self.config["roi_padding"], self.config["roi_full_frame_every"])
+        self.gate = MotionGate(self.config["motion_threshold"], self.config["motion_hold"], self.config["idle_after"])
+        self.debouncer = ScanDebouncer(self.config["dedupe_hold"], self.config["dedupe_rearm"])
+        self.capture_rate = RateMeter()
+        self.decode_rate = RateMeter()
+
+        self._cap = None
+        self._source_used = False
+        self._threads = []
+        self._stop_event = threading.Event()
+        self._unpaused = threading.Event()
+        self._unpaused.set()
+        self._result_lock = threading.Lock()
+        self._last_delivered = -1
+        self._latest = None
+        self.skipped_frames = 0
+        self.rejected_reads = 0
+
+    # --- Lifecycle ---
+    def start(self):
+        """Opens the frame source and starts the capture and decode threads.
+
+        Returns False if the source can't be opened, if a caller-supplied
+        source was already used up by an earlier run, or while the previous
+        run is still stopping (a capture thread stuck in read() after stop()
+        timed out still owns the camera).
+        """
+        if self.stopping:
+            return False
+        if self.source is not None:
+            if self._source_used:
+                return False
+            self._source_used = True
+            self._cap = self.source
+        else:
+            self._cap = open_source(self.config["source"], self.config["realtime"])
+        if self.config["record_to"]:
+            self._cap = RecordingSource(self._cap, self.config["record_to"])
+        if not self._cap.isOpened():
+            self._cap.release()
+            self._cap = None
+            return False
+
+        self._stop_event.clear()
+        self.queue = FrameQueue(self.config["queue_size"])
+        self._last_delivered = -1
+        self._latest = None
+        self.debouncer.reset()
+
+        self._threads = [threading.Thread(target=self._capture_loop, name="scanner-capture", daemon=True)]
+        for i in range(self.config["decode_workers"]):
+            self._threads.append(threading.Thread(target=self._decode_loop, name=f"scanner-decode-{i}", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return True
+
+    def pause(self):
+        """Stops reading and decoding frames but keeps the camera open."""
+        self._unpaused.clear()
+        self.queue.clear()
+
+    def resume(self):
+        self.debouncer.reset()
+        self._unpaused.set()
+
+    @property
+    def paused(self):
+        return not self._unpaused.is_set()
+
+    def stop(self, timeout=2.0):
+        self._stop_event.set()
+        self._unpaused.set()
+        self.queue.close()
+        self.queue.clear()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+        # Threads that didn't exit in time are kept, so start() refuses to run beside them
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+
+    def wait(self, timeout=None):
+        """Blocks until a finite source has been fully captured and decoded."""
+        for thread in self._threads:
+            thread.join(timeout)
+        return not self.running
+
+    @property
+    def running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    @property
+    def stopping(self):
+        """stop() was called but threads of that run are still alive."""
+        return self._stop_event.is_set() and self.running
+
+    def latest_frame(self):
+        """Most recent decoded (frame, barcodes) for previews, or None before the first decode."""
+        with self._result_lock:
+            return self._latest
+
+    def stats(self):
+        """Snapshot of achieved capture/decode FPS and queue state."""
+        return {
+            "capture_fps": round(self.capture_rate.rate(), 1),
+            "decode_fps": round(self.decode_rate.rate(), 1),
+            "queue_depth": len(self.queue),
+            "dropped_frames": self.queue.dropped,
+            "skipped_frames": self.skipped_frames,
+            "rejected_reads": self.rejected_reads,
+            "idle": self.gate.idle(),
+        }
+
+    # --- Threads ---
+    def _source_hint(self, name, *args):
+        """Calls an optional FrameSource method; plain cv2.VideoCapture-like sources don't have them."""
+        method = getattr(self._cap, name, None)
+        if method is not None:
+            method(*args)
+
+    def _capture_loop(self):
+        seq = 0
+        last_report = time.monotonic()
+        interval = self.config["stats_interval"]
+        gated = self.config["motion_gate"]
+        idle_interval = 1.0 / self.config["idle_fps"]
+        last_read = 0.0
+        idle = False
+        try:
+            while not self._stop_event.is_set():
+                if not self._unpaused.is_set():
+                    self._unpaused.wait()
+                    # Throw away the frames the driver buffered while we were paused
+                    self._source_hint("flush")
+                    continue
+
+                # Idle mode: nothing has happened for a while, so the camera runs (and is polled) slowly
+                if gated and self.gate.idle():
+                    if not idle:
+                        idle = True
+                        self._source_hint("set_idle", True, self.config["idle_fps"])
+                    wait = idle_interval - (time.monotonic() - last_read)
+                    if wait > 0 and self._stop_event.wait(wait):
+                        break
+                elif idle:
+                    # Woken by motion: back to full rate, and skip frames buffered while idling
+                    idle = False
+                    self._source_hint("set_idle", False)
+                    self._source_hint("flush")
+
+                last_read = time.monotonic()
+                success, image = self._cap.read()
+                if not success:
+                    if self.on_error and not getattr(self._cap, "finished", False):
+                        self.on_error("Scanner Error: Camera stopped delivering frames.")
+                    break
+
+                now = time.monotonic()
+                self.capture_rate.tick(now)
+                if not gated or self.gate.check(image, now):
+                    self.queue.put(Frame(seq, now, image))
+                else:
+                    self.skipped_frames += 1
+                seq += 1
+
+                if interval and self.on_stats and now - last_report >= interval:
+                    last_report = now
+                    self.on_stats(self.stats())
+        finally:
+            # Decoders drain what is already queued, then exit
+            self.queue.close()
+            self._cap.release()
+
+    def _decode_loop(self):
+        while not self._stop_event.is_set():
+            frame = self.queue.get(timeout=0.5)
+            if frame is None:
+                if self.queue.closed:
+                    break
+                continue
+
+            barcodes = self.decode_frame(frame.image)
+            if self.profile and barcodes:
+                accepted = self.profile.filter(barcodes)
+                self.rejected_reads += len(barcodes) - len(accepted)
+                barcodes = accepted
+            decoded_at = time.monotonic()
+            self.decode_rate.tick()
+
+            with self._result_lock:
+                if frame.seq < self._last_delivered:
+                    continue
+                self._last_delivered = frame.seq
+                self.gate.item_in_view = bool(barcodes)
+                self._latest = (frame, barcodes)
+                if self.on_result:
+                    self.on_result(frame, barcodes)
+
+                by_code = {b.data.decode('utf-8', 'replace'): b for b in barcodes}
+                for code in self.debouncer.update(by_code, frame.captured_at):
+                    if self.tracker:
+                        self.tracker.mark(code, "capture", frame.captured_at)
+                        self.tracker.mark(code, "decode", decoded_at)
+                        self.tracker.mark(code, "dedupe")
+                    self.on_scan(by_code[code], frame)
+
+    def set_profile(self, profile):
+        """Swaps the symbology profile, e.g. after the catalog changed. Applies from the next frame."""
+        symbols = profile.symbols if profile else self.config["symbols"]
+        if list(symbols) != self.decoder.symbols:
+            self.decoder = get_decoder(self.config["decoder"], symbols)
+        self.profile = profile
+
+    def decode_frame(self, image):
+        """Decodes the tracked ROI at native resolution, then the pyramid on a miss."""
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return self.roi.decode(gray, self.decoder, lambda full: self.pyramid.decode(full, self.decoder))
+
+
+class ScannerService:
+    """Single long-lived owner of the scanner engine and its camera.
+
+    start() opens the camera once. pause() stops capture and decoding while
+    keeping the camera handle open, and resume() continues with the same
+    decoder, pyramid levels and ROI state. If the camera drops out, the next
+    start()/resume() warm-restarts the same engine. stop() releases
+    everything. All calls are idempotent.
+    """
+
+    def __init__(self, on_scan, config=None, on_stats=None, on_error=None, tracker=None, profile=None):
+        self.engine = ScannerEngine(on_scan, config, on_stats=on_stats, on_error=on_error, tracker=tracker,
+                                    profile=profile)
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.engine.stopping:
+            return "stopping"
+        if not self.engine.running:
+            return "stopped"
+        return "paused" if self.engine.paused else "running"
+
+    def start(self):
+        """Starts the scanner, or resumes it if paused.
+
+        Returns False if no camera could be opened, or while a previous
+        stop() is still waiting for the capture thread to let go of it.
+        """
+        with self._lock:
+            if self.engine.stopping:
+                return False
+            if self.engine.running:
+                self.engine.resume()
+                return True
+            self.engine.resume()
+            return self.engine.start()
+
+    def pause(self):
+        with self._lock:
+            if self.engine.running:
+                self.engine.pause()
+
+    def resume(self):
+        return self.start()
+
+    def stop(self):
+        with self._lock:
+            self.engine.stop()
+
+    def latest_frame(self):
+        return self.engine.latest_frame()
+
+    def set_profile(self, profile):
+        self.engine.set_profile(profile)
+
+    def stats(self):
+        return dict(self.engine.stats(), state=self.state)
@@ -1,8 +1,10 @@
-import sqlite3
 import random
 
+from database import get_connection
+from sampling import ProductSampler
+
 def purchase_item(barcode, quantity):
-    conn = sqlite3.connect("cart_database.db")
+    conn = get_connection()
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -41,22 +43,19 @@ def purchase_item(barcode, quantity):
         else:
             print(f"\n❌ Not enough stock for {name}")
 
-    conn.close()
-
 
 # -------- MAIN PROGRAM --------
 
-conn = sqlite3.connect("cart_database.db")
-cursor = conn.cursor()
-
-cursor.execute("SELECT barcode FROM products")
-all_barcodes = [row[0] for row in cursor.fetchall()]
-
-conn.close()
+# Best sellers turn up as often as they do at the till
+sampler = ProductSampler(weighted=True)
+product_count = get_connection().execute("SELECT COUNT(*) FROM products").fetchone()[0]
+if not product_count:
+    raise SystemExit("No products in the database.")
 
 # Randomly select number of products
-number_of_products = random.randint(1, len(all_barcodes))
-selected_products = random.sample(all_barcodes, number_of_products)
+number_of_products = random.randint(1, product_count)
+selected_products = sampler.sample_barcodes(number_of_products)
+number_of_products = len(selected_products)
 
 print("\n🧾 SUPERMARKET TRANSACTION STARTED")
 print("Total Products Selected:", number_of_products)
@@ -0,0 +1,120 @@
+"""Catalog-driven symbology profile and read validation.
+
+The profile is computed from the barcodes in the products table. It tells
+the decoder which symbologies to look for and rejects reads that cannot
+be a catalog code (wrong length, bad EAN/UPC check digit, letters in a
+numeric-only symbology) before they reach a lookup or a beep.
+
+    python symbology.py [cart_database.db]
+"""
+import sys
+from collections import defaultdict
+
+from database import get_connection
+from decoders import DEFAULT_SYMBOLS
+
+# GTIN symbologies and the code length each one carries
+GTIN_LENGTHS = {"EAN8": 8, "UPCA": 12, "EAN13": 13}
+GTIN_BY_LENGTH = {length: symbology for symbology, length in GTIN_LENGTHS.items()}
+
+
+def gtin_check_digit(digits):
+    """GS1 check digit for a GTIN payload (the code without its last digit)."""
+    total = sum(int(d) * (3 if i % 2 == 0 else 1) for i, d in enumerate(reversed(digits)))
+    return (10 - total % 10) % 10
+
+
+def is_valid_gtin(code):
+    """True for an all-digit EAN-8/UPC-A/EAN-13/GTIN-14 with a correct check digit."""
+    return (code.isdigit() and len(code) in (8, 12, 13, 14)
+            and gtin_check_digit(code[:-1]) == int(code[-1]))
+
+
+def symbology_for(code):
+    """The symbology a catalog code must be printed in.
+
+    Codes that are valid GTINs are EAN/UPC; anything else (including
+    13-digit codes with a wrong check digit, which no EAN-13 label can
+    carry) has to be a CODE128 label.
+    """
+    if is_valid_gtin(code):
+        for symbology, length in GTIN_LENGTHS.items():
+            if len(code) == length:
+                return symbology
+    return "CODE128"
+
+
+class SymbologyProfile:
+    """Symbologies and code shapes the catalog actually uses.
+
+    symbols is the list to request from the decoder. accepts(data, symbology)
+    is the read filter: the symbology must be in the profile, the length must
+    match a catalog code of that symbology, GTINs must carry a valid check
+    digit and symbologies whose catalog codes are all digits only accept digits.
+
+    All-digit codes of a GTIN length whose check digit is wrong are most
+    likely mis-keyed EAN/UPC codes, so their GTIN symbology stays in the
+    profile next to CODE128.
+    """
+
+    def __init__(self, codes, extra_symbols=()):
+        self.lengths = defaultdict(set)
+        self.numeric = {}
+        for code in codes:
+            symbology = symbology_for(code)
+            self._add(symbology, code)
+            if symbology == "CODE128" and code.isdigit() and len(code) in GTIN_BY_LENGTH:
+                self._add(GTIN_BY_LENGTH[len(code)], code)
+        for symbology in extra_symbols:
+            self.lengths.setdefault(symbology, set())
+        self.symbols = sorted(self.lengths) or list(DEFAULT_SYMBOLS)
+
+    def _add(self, symbology, code):
+        self.lengths[symbology].add(len(code))
+        self.numeric[symbology] = self.numeric.get(symbology, True) and code.isdigit()
+
+    @classmethod
+    def from_database(cls, db_path="cart_database.db", extra_symbols=()):
+        codes = [row[0] for row in get_connection(db_path).execute("SELECT barcode FROM products")]
+        return cls(codes, extra_symbols)
+
+    @classmethod
+    def for_catalog(cls, catalog, extra_symbols=()):
+        """Profile for a CatalogCache or a catalog snapshot, which stores a precomputed describe()."""
+        description = getattr(catalog, "symbology", None)
+        if description is None:
+            return cls(catalog.barcodes(), extra_symbols)
+        profile = cls((), extra_symbols)
+        for symbology, shape in description.items():
+            profile.lengths[symbology].update(shape["lengths"])
+            profile.numeric[symbology] = shape["numeric"]
+        profile.symbols = sorted(profile.lengths) or list(DEFAULT_SYMBOLS)
+        return profile
+
+    def accepts(self, data, symbology):
+        if symbology not in self.lengths:
+            return False
+        lengths = self.lengths[symbology]
+        if lengths and len(data) not in lengths:
+            return False
+        if symbology in GTIN_LENGTHS:
+            return is_valid_gtin(data)
+        if self.numeric.get(symbology) and not data.isdigit():
+            return False
+        return True
+
+    def filter(self, barcodes):
+        """Drops decoded barcodes that cannot be a catalog code."""
+        return [b for b in barcodes if self.accepts(b.data.decode("utf-8", "replace"), b.type)]
+
+    def describe(self):
+        return {sym: {"lengths": sorted(self.lengths[sym]), "numeric": self.numeric.get(sym, False)}
+                for sym in self.symbols if sym in self.lengths}
+
+
+if __name__ == "__main__":
+    profile = SymbologyProfile.from_database(sys.argv[1] if len(sys.argv) > 1 else "cart_database.db")
+    print(f"Symbologies: {', '.join(profile.symbols)}")
+    for symbology, shape in profile.describe().items():
+        kind = "digits" if shape["numeric"] else "any characters"
+        print(f"  {symbology:<8} lengths {shape['lengths']}, {kind}")
@@ -1,17 +1,19 @@
+import os
+import sys
 import cv2
-from pyzbar.pyzbar import decode, ZBarSymbol
-import winsound
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from audio_feedback import AudioFeedback
+from decoders import get_decoder
+from frame_sources import CameraSource
+from scanner import ROITracker, ScanDebouncer, SCANNER_CONFIG
 
 def find_working_camera():
     # Try indices in order of likelihood
-    for index in [1, 2, 0]:
-        cap = cv2.VideoCapture(index)
-        if cap.isOpened():
-            success, frame = cap.read()
-            if success:
-                print(f"Successfully started stream on Camera Index: {index}")
-                return cap, index
-            cap.release()
+    cap = CameraSource(indices=[1, 2, 0])
+    if cap.isOpened():
+        print(f"Successfully started stream on Camera Index: {cap.index}")
+        return cap, cap.index
     return None, None
 
 cap, active_index = find_working_camera()
@@ -20,7 +22,11 @@ if not cap:
     print("Could not find an active camera stream. Please ensure DroidCam Client is 'Started'.")
     exit()
 
-last_barcode = None
+debouncer = ScanDebouncer(SCANNER_CONFIG["dedupe_hold"], SCANNER_CONFIG["dedupe_rearm"])
+roi = ROITracker()
+audio = AudioFeedback()
+# Use specific symbols to avoid the 'databar' error
+decoder = get_decoder(SCANNER_CONFIG["decoder"], SCANNER_CONFIG["symbols"])
 
 while True:
     success, frame = cap.read()
@@ -32,29 +38,22 @@ while True:
     display_frame = cv2.resize(frame, (640, 480))
     gray = cv2.cvtColor(display_frame, cv2.COLOR_BGR2GRAY)
 
-    # Use specific symbols to avoid the 'databar' error
-    detectedBarcodes = decode(gray, symbols=[
-        ZBarSymbol.QRCODE, 
-        ZBarSymbol.EAN13, 
-        ZBarSymbol.CODE128
-    ])
+    # Decode a crop around the last hit first, the full frame only on a miss
+    detectedBarcodes = roi.decode(gray, decoder)
+
+    for barcode in detectedBarcodes:
+        barcode_data = barcode.data.decode('utf-8')
+        
+        # Draw bounding box and text
+        (x, y, w, h) = barcode.rect
+        cv2.rectangle(display_frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        cv2.putText(display_frame, barcode_data, (x, y - 10), 
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
 
-    if not detectedBarcodes:
-        last_barcode = None
-    else:
-        for barcode in detectedBarcodes:
-            barcode_data = barcode.data.decode('utf-8')
-            
-            # Draw bounding box and text
-            (x, y, w, h) = barcode.rect
-            cv2.rectangle(display_frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
-            cv2.putText(display_frame, barcode_data, (x, y - 10), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
-            
-            if barcode_data != last_barcode:
-                print(f"Scanned: {barcode_data}")
-                winsound.Beep(1000, 200) 
-                last_barcode = barcode_data
+    # One beep per physical presentation, even if a frame or two misses the code
+    for barcode_data in debouncer.update([b.data.decode('utf-8') for b in detectedBarcodes]):
+        print(f"Scanned: {barcode_data}")
+        audio.beep()
 
     cv2.imshow(f'Scanner (Camera {active_index})', display_frame)
 
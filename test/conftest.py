@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cart_database import setup_database
+from database import close_connection
+
+
+def make_database(path):
+    """A seeded, fully migrated cart database at path (a str)."""
+    setup_database(path)
+    return path
+
+
+@pytest.fixture
+def cart_db(tmp_path):
+    path = make_database(str(tmp_path / "cart.db"))
+    yield path
+    close_connection()
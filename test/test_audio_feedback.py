@@ -0,0 +1,38 @@
+import io
+import subprocess
+import time
+import wave
+
+import audio_feedback
+from audio_feedback import AudioFeedback, NullBackend, WavBackend, make_tone_wav
+
+
+def test_tone_is_a_valid_wav():
+    with wave.open(io.BytesIO(make_tone_wav(duration=0.1, rate=8000))) as wav:
+        assert (wav.getnchannels(), wav.getframerate(), wav.getnframes()) == (1, 8000, 800)
+
+
+def test_beeps_play_on_the_audio_thread():
+    backend = NullBackend()
+    feedback = AudioFeedback(backend)
+    feedback.beep()
+    deadline = time.monotonic() + 2
+    while backend.played < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    feedback.stop()
+    assert backend.played == 1
+
+
+def test_wav_backend_writes_no_files(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(audio_feedback.sys, "platform", "linux")
+    monkeypatch.setattr(audio_feedback.shutil, "which", lambda name: "/usr/bin/aplay" if name == "aplay" else None)
+    monkeypatch.setattr(audio_feedback.subprocess, "run", lambda args, **kwargs: calls.append((args, kwargs)))
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+
+    backend = WavBackend(duration=0.05)
+    backend.play()
+    assert list(tmp_path.iterdir()) == []
+    args, kwargs = calls[0]
+    assert args == ["/usr/bin/aplay"] and kwargs["input"] == backend.wav
+    assert kwargs["stdout"] is subprocess.DEVNULL
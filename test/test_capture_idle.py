@@ -0,0 +1,101 @@
+import time
+
+import cv2
+import numpy as np
+
+from frame_sources import CameraSource, FrameSource
+from scanner import ScannerEngine
+
+
+class FakeCamera(FrameSource):
+    """Static scene until move() is called; records the idle/flush hints it gets."""
+
+    def __init__(self):
+        self.image = np.zeros((120, 160, 3), np.uint8)
+        self.hints = []
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        time.sleep(0.005)
+        return True, self.image.copy()
+
+    def set_idle(self, idle, fps=None):
+        self.hints.append(("idle", idle, fps))
+
+    def flush(self):
+        self.hints.append(("flush",))
+
+    def move(self):
+        self.image = np.full_like(self.image, 200)
+
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_idle_slows_the_camera_and_wake_flushes_it():
+    camera = FakeCamera()
+    engine = ScannerEngine(lambda barcode, frame: None,
+                           {"decoder": "opencv", "idle_after": 0.1, "idle_fps": 20, "motion_hold": 0.05,
+                            "stats_interval": 0},
+                           source=camera)
+    assert engine.start()
+    try:
+        assert wait_for(lambda: ("idle", True, 20) in camera.hints)
+        camera.move()
+        assert wait_for(lambda: ("idle", False, None) in camera.hints)
+        assert wait_for(lambda: camera.hints[-1] == ("flush",))
+    finally:
+        engine.stop()
+
+
+class FakeCapture:
+    """cv2.VideoCapture stand-in with a driver buffer of `buffered` frames."""
+
+    def __init__(self, buffered, fps=30.0):
+        self.buffered = buffered
+        self.props = {}
+        self.fps = fps
+        self.grabs = 0
+
+    def grab(self):
+        self.grabs += 1
+        if self.buffered:
+            self.buffered -= 1
+        else:
+            time.sleep(0.03)   # Waits for the next frame
+        return True
+
+    def get(self, prop):
+        return self.fps
+
+    def set(self, prop, value):
+        self.props[prop] = value
+
+
+def camera_with(capture):
+    camera = CameraSource(indices=())
+    camera._cap = capture
+    return camera
+
+
+def test_camera_flush_stops_once_the_buffer_is_empty():
+    capture = FakeCapture(buffered=3)
+    camera_with(capture).flush()
+    assert capture.grabs == 4
+
+
+def test_camera_idle_lowers_and_restores_fps():
+    capture = FakeCapture(buffered=0)
+    camera = camera_with(capture)
+    camera.set_idle(True, 2)
+    assert capture.props[cv2.CAP_PROP_FPS] == 2
+    camera.set_idle(False)
+    assert capture.props[cv2.CAP_PROP_FPS] == 30.0
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from cart_engine import Cart, line_amounts, unit_price
+from catalog import CatalogCache
+from catalog_snapshot import SnapshotCatalog, export_snapshot
+from compact_catalog import CompactCatalog
+from database import get_connection
+
+
+def recomputed(cart):
+    amounts = [line_amounts(line) for _, line in cart]
+    return tuple(sum(a[i] for a in amounts) for i in range(3))
+
+
+def test_totals_of_a_small_cart():
+    cart = Cart()
+    cart.add("1", "Noodles", 14.0, 5.0, 70, "g", quantity=2, tax_rate=12)
+    cart.add("2", "Soap", 45.0, 0.0, 75, "g", tax_rate=5)
+    assert cart.totals() == {"subtotal": 73.0, "discount": 1.4, "tax": 4.99, "grand_total": 71.6,
+                             "lines": 2, "units": 3}
+    assert cart.line_total("1") == (28.0, 1.4, 26.6)
+    assert unit_price(14.0, 5.0) == pytest.approx(13.3)
+
+
+def test_running_totals_match_a_full_recount():
+    rng = random.Random(3)
+    cart = Cart()
+    for _ in range(5000):
+        code = str(rng.randrange(300))
+        if code not in cart or rng.random() < 0.6:
+            cart.add(code, "x", round(rng.uniform(1, 500), 2), rng.choice((0, 5, 12.5)), 1, "pcs",
+                     rng.randint(1, 4), rng.choice((0, 5, 18)))
+        elif rng.random() < 0.5:
+            cart.remove(code)
+        else:
+            cart.set_quantity(code, rng.randint(0, 5))
+    subtotal, discount, tax = recomputed(cart)
+    assert cart.subtotal == pytest.approx(subtotal)
+    assert cart.discount == pytest.approx(discount)
+    assert cart.tax == pytest.approx(tax)
+    assert cart.units == sum(line["quantity"] for _, line in cart)
+
+
+def test_quantity_changes_and_removal():
+    changes = []
+    cart = Cart(on_change=lambda code, line: changes.append((code, line and line["quantity"])))
+    cart.add("1", "Jam", 140.0, 50.0, 500, "g", quantity=3)
+    cart.remove("1")
+    cart.set_quantity("1", 5)
+    cart.set_quantity("1", 0)
+    assert changes == [("1", 3), ("1", 2), ("1", 5), ("1", None)]
+    assert "1" not in cart
+    assert cart.totals()["grand_total"] == 0.0
+    with pytest.raises(KeyError):
+        cart.remove("1")
+
+
+def test_clear_returns_to_exact_zero():
+    cart = Cart()
+    for i in range(50):
+        cart.add(str(i), "x", 0.1 * i, 3.3, 1, "pcs", tax_rate=18)
+    cart.clear()
+    assert (cart.subtotal, cart.discount, cart.tax, cart.units) == (0.0, 0.0, 0.0, 0)
+
+
+def test_every_catalog_backend_reports_the_same_tax_rate(cart_db, tmp_path):
+    cache = CatalogCache(cart_db).load()
+    compact = CompactCatalog.from_database(cart_db)
+    snapshot_path = str(tmp_path / "catalog.snapshot")
+    export_snapshot(cart_db, snapshot_path)
+    snapshot = SnapshotCatalog(snapshot_path)
+    for code in cache.barcodes():
+        assert cache.tax_rate(code) == compact.tax_rate(code) == snapshot.tax_rate(code)
+    assert cache.tax_rate("8901302009876") == 12
+    cache.stop()
+
+
+def test_catalog_cache_picks_up_tax_changes(cart_db):
+    cache = CatalogCache(cart_db).load()
+    with get_connection(cart_db) as conn:
+        conn.execute("UPDATE products SET tax_rate = 28 WHERE barcode = '8901302009876'")
+    assert cache.refresh()
+    assert cache.tax_rate("8901302009876") == 28
+    assert len(cache.get("8901302009876")) == 6
+    cache.stop()
@@ -0,0 +1,97 @@
+from cart import CartTreeRenderer
+from cart_engine import Cart
+
+
+class FakeTree:
+    """Records Treeview calls; after_idle callbacks run only when run_idle() is called."""
+
+    def __init__(self):
+        self.rows = {}
+        self.order = []
+        self.idle = []
+        self.calls = []
+
+    def after_idle(self, callback):
+        self.idle.append(callback)
+        return f"idle#{len(self.idle)}"
+
+    def run_idle(self):
+        pending, self.idle = self.idle, []
+        for callback in pending:
+            callback()
+
+    def exists(self, iid):
+        return iid in self.rows
+
+    def insert(self, parent, index, iid, values):
+        self.calls.append(("insert", iid))
+        self.rows[iid] = values
+        self.order.append(iid)
+
+    def item(self, iid, values):
+        self.calls.append(("item", iid))
+        self.rows[iid] = values
+
+    def delete(self, iid):
+        self.calls.append(("delete", iid))
+        del self.rows[iid]
+        self.order.remove(iid)
+
+
+def make(on_flush=None):
+    tree = FakeTree()
+    cart = Cart()
+    renderer = CartTreeRenderer(tree, cart, on_flush)
+    cart.on_change = renderer.changed
+    return tree, cart
+
+
+def test_burst_of_changes_is_one_idle_flush():
+    tree, cart = make()
+    for _ in range(10):
+        cart.add("A", "Tea", 100.0, 10, 250, "g")
+    cart.add("B", "Jam", 50.0, 0, 500, "g")
+    assert len(tree.idle) == 1 and not tree.rows
+    tree.run_idle()
+    assert tree.calls == [("insert", "A"), ("insert", "B")]
+    assert tree.rows["A"] == ("Tea", 10, "₹100.0", "₹100.0", "₹900.0")
+
+
+def test_existing_rows_are_updated_in_place_and_others_left_alone():
+    tree, cart = make()
+    cart.add("A", "Tea", 100.0, 0, 250, "g")
+    cart.add("B", "Jam", 50.0, 0, 500, "g")
+    tree.run_idle()
+    tree.calls.clear()
+    cart.set_quantity("B", 3)
+    tree.run_idle()
+    assert tree.calls == [("item", "B")]
+    assert tree.rows["B"][1] == 3
+    assert tree.order == ["A", "B"]
+
+
+def test_removed_lines_delete_their_row():
+    tree, cart = make()
+    cart.add("A", "Tea", 100.0, 0, 250, "g")
+    tree.run_idle()
+    cart.remove("A")
+    tree.run_idle()
+    assert tree.calls[-1] == ("delete", "A") and not tree.rows
+
+
+def test_added_and_removed_before_a_flush_never_touches_the_tree():
+    tree, cart = make()
+    cart.add("A", "Tea", 100.0, 0, 250, "g")
+    cart.discard("A")
+    tree.run_idle()
+    assert tree.calls == []
+
+
+def test_on_flush_receives_the_changed_barcodes():
+    flushed = []
+    tree, cart = make(flushed.append)
+    cart.add("A", "Tea", 100.0, 0, 250, "g")
+    cart.add("B", "Jam", 50.0, 0, 500, "g")
+    cart.add("A", "Tea", 100.0, 0, 250, "g")
+    tree.run_idle()
+    assert flushed == [{"A", "B"}]
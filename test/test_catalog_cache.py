@@ -0,0 +1,78 @@
+import sqlite3
+
+import pytest
+
+from catalog import CatalogCache
+
+
+def write(db, sql, params=()):
+    conn = sqlite3.connect(db)
+    try:
+        conn.execute(sql, params)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def cache(cart_db):
+    cache = CatalogCache(cart_db).load()
+    yield cache
+    cache.stop()
+
+
+def test_refresh_without_commits_reads_nothing(cache):
+    assert not cache.refresh()
+    assert (cache.full_loads, cache.incremental_loads) == (1, 0)
+
+
+def test_refresh_applies_only_the_changed_rows(cache, cart_db):
+    code = cache.barcodes()[0]
+    write(cart_db, "UPDATE products SET mrp = 123.5, tax_rate = 28 WHERE barcode = ?", (code,))
+    write(cart_db, "INSERT INTO products (barcode, product_name, mrp, discount, tax_rate, quantity_value, "
+                   "quantity_unit, stock_quantity, reorder_level) VALUES ('900001', 'New', 10, 0, 5, 1, 'pcs', 0, 0)")
+    assert cache.refresh()
+    assert (cache.full_loads, cache.incremental_loads) == (1, 1)
+    assert cache.get(code)[2] == 123.5 and cache.tax_rate(code) == 28
+    assert cache.get("900001")[1] == "New"
+
+
+def test_stock_only_updates_do_not_reload(cache, cart_db):
+    write(cart_db, "UPDATE products SET stock_quantity = stock_quantity + 1")
+    assert not cache.refresh()
+    assert cache.incremental_loads == 0
+
+
+def test_deleted_products_leave_the_cache(cache, cart_db):
+    code = cache.barcodes()[0]
+    write(cart_db, "DELETE FROM products WHERE barcode = ?", (code,))
+    assert cache.refresh()
+    assert code not in cache and cache.tax_rate(code) is None
+    assert cache.incremental_loads == 1
+
+
+def test_refresh_swaps_dicts_instead_of_mutating_them(cache, cart_db):
+    before = cache.products
+    snapshot = dict(before)
+    write(cart_db, "DELETE FROM products WHERE barcode = ?", (cache.barcodes()[0],))
+    cache.refresh()
+    assert cache.products is not before
+    assert before == snapshot
+
+
+def test_empty_catalog_is_not_reloaded_on_every_poll(cart_db):
+    write(cart_db, "DELETE FROM products")
+    cache = CatalogCache(cart_db).load()
+    assert len(cache) == 0
+    for _ in range(3):
+        assert not cache.refresh()
+    assert cache.full_loads == 1
+    cache.stop()
+
+
+def test_pruned_log_falls_back_to_a_full_load(cache, cart_db):
+    write(cart_db, "UPDATE products SET mrp = 1 WHERE rowid = 1")
+    write(cart_db, "UPDATE products SET mrp = 2 WHERE rowid = 2")
+    write(cart_db, "DELETE FROM product_changes WHERE version = (SELECT MIN(version) FROM product_changes)")
+    assert cache.refresh()
+    assert cache.full_loads == 2
@@ -0,0 +1,104 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from catalog_import import RowError, import_catalog, normalise, validate
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEADER = "barcode,name,price,discount,tax,quantity_value,unit,stock\n"
+
+
+def price_of(db, barcode):
+    conn = sqlite3.connect(db)
+    try:
+        row = conn.execute("SELECT mrp, quantity_unit FROM products WHERE barcode = ?", (barcode,)).fetchone()
+    finally:
+        conn.close()
+    return row
+
+
+@pytest.mark.parametrize("price", ["nan", "inf", "-inf", "NaN", "abc", "-5"])
+def test_invalid_prices_are_rejected(price):
+    with pytest.raises(RowError):
+        validate(normalise({"barcode": "1", "name": "x", "price": price}))
+
+
+def test_infinite_stock_is_rejected():
+    with pytest.raises(RowError):
+        validate(normalise({"barcode": "1", "name": "x", "price": "1", "stock": "inf"}))
+
+
+def test_bad_rows_are_rejected_not_fatal(cart_db, tmp_path):
+    path = tmp_path / "prices.csv"
+    path.write_text(HEADER +
+                    "900001,Good,10,0,5,1,pcs,4\n"
+                    "900002,Nan price,nan,0,5,1,pcs,4\n"
+                    "900003,Inf tax,10,0,inf,1,pcs,4\n"
+                    ",No barcode,10,0,5,1,pcs,4\n"
+                    "900004,Also good,12.5,0,5,1,pcs,4\n", encoding="utf-8")
+    rejects = []
+    report = import_catalog(str(path), cart_db, rejects=rejects)
+    assert (report["rows"], report["upserted"], report["rejected"]) == (5, 2, 3)
+    assert [line for line, _, _ in rejects] == [3, 4, 5]
+    assert price_of(cart_db, "900004") == (12.5, "pcs")
+    assert price_of(cart_db, "900002") is None
+
+
+def test_malformed_jsonl_lines_are_rejected_with_line_numbers(cart_db, tmp_path):
+    path = tmp_path / "prices.jsonl"
+    path.write_text('{"barcode": "900010", "name": "Ok", "price": 3}\n'
+                    '\n'
+                    '{"barcode": "900011", "name": "Broken", "price": \n'
+                    '[1, 2]\n'
+                    '{"barcode": "900012", "name": "Ok too", "price": 4}\n', encoding="utf-8")
+    rejects = []
+    report = import_catalog(str(path), cart_db, rejects=rejects)
+    assert (report["upserted"], report["rejected"]) == (2, 2)
+    assert [line for line, _, _ in rejects] == [3, 4]
+    assert "invalid JSON" in rejects[0][1]
+    assert rejects[0][2].startswith('{"barcode": "900011"')
+
+
+def test_blank_cells_keep_existing_values(cart_db, tmp_path):
+    path = tmp_path / "prices.csv"
+    path.write_text("barcode,name,price,unit\n8901057512345,Aashirvaad Atta,400,\n", encoding="utf-8")
+    import_catalog(str(path), cart_db)
+    assert price_of(cart_db, "8901057512345") == (400, "kg")
+
+
+def test_reimport_counts_only_rows_that_changed(cart_db, tmp_path):
+    path = tmp_path / "prices.csv"
+    path.write_text(HEADER + "900001,Tea,10,0,5,1,pcs,4\n900002,Jam,20,0,5,1,pcs,4\n", encoding="utf-8")
+    assert import_catalog(str(path), cart_db)["upserted"] == 2
+    assert import_catalog(str(path), cart_db)["upserted"] == 0
+    path.write_text(HEADER + "900001,Tea,11,0,5,1,pcs,4\n900002,Jam,20,0,5,1,pcs,4\n", encoding="utf-8")
+    assert import_catalog(str(path), cart_db)["upserted"] == 1
+
+
+@pytest.mark.parametrize("rebuild", [True, False])
+def test_new_products_are_searchable_either_way(cart_db, tmp_path, rebuild):
+    path = tmp_path / "prices.csv"
+    path.write_text(HEADER + "900001,Zanzibar Clove Tea,10,0,5,1,pcs,4\n", encoding="utf-8")
+    report = import_catalog(str(path), cart_db, rebuild_indexes=rebuild)
+    assert report["search_rebuilt"] is rebuild
+    conn = sqlite3.connect(cart_db)
+    try:
+        hits = conn.execute("SELECT rowid FROM products_fts WHERE products_fts MATCH 'zanzibar'").fetchall()
+        triggers = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' "
+                                "AND name LIKE 'products_fts%'").fetchone()[0]
+    finally:
+        conn.close()
+    assert len(hits) == 1
+    assert triggers == 3
+
+
+def test_cli_reports_a_badly_encoded_file(cart_db, tmp_path):
+    path = tmp_path / "prices.csv"
+    path.write_bytes(HEADER.encode() + "900001,Caf\xe9,10,0,5,1,pcs,4\n".encode("latin-1"))
+    result = subprocess.run([sys.executable, "catalog_import.py", str(path), "--db", cart_db],
+                            cwd=REPO_DIR, capture_output=True, text=True)
+    assert result.returncode == 1
+    assert "Import failed" in result.stderr and "Traceback" not in result.stderr
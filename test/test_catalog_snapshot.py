@@ -0,0 +1,58 @@
+import os
+import sqlite3
+
+import pytest
+
+from catalog import CatalogCache
+from catalog_snapshot import SnapshotCatalog, SnapshotError, data_file, export_snapshot, load_snapshot
+from database import get_connection
+
+
+def test_snapshot_matches_the_database(cart_db, tmp_path):
+    path = str(tmp_path / "catalog.snapshot")
+    version = export_snapshot(cart_db, path)
+    snapshot = load_snapshot(path)
+    cache = CatalogCache(cart_db)
+    cache.load()
+    assert snapshot.version == version
+    assert sorted(snapshot.barcodes()) == sorted(cache.barcodes())
+    for code in cache.barcodes():
+        assert snapshot.get(code) == cache.get(code)
+        assert snapshot.tax_rate(code) == cache.tax_rate(code)
+    assert snapshot.symbology
+
+
+def test_reexport_swaps_the_pointer_and_prunes_old_data_files(cart_db, tmp_path):
+    path = str(tmp_path / "catalog.snapshot")
+    export_snapshot(cart_db, path)
+    catalog = SnapshotCatalog(path)
+    code = catalog.barcodes()[0]
+    assert not catalog.refresh()
+
+    conn = sqlite3.connect(cart_db)
+    conn.execute("UPDATE products SET mrp = 999.5 WHERE barcode = ?", (code,))
+    conn.commit()
+    conn.close()
+    export_snapshot(cart_db, path)
+
+    assert catalog.refresh()
+    assert catalog.generation == 2
+    assert catalog.get(code)[2] == 999.5
+    data_files = [name for name in os.listdir(tmp_path) if name.startswith("catalog.snapshot.")]
+    assert data_files == [os.path.basename(data_file(path))]
+
+
+def test_rejects_files_that_are_not_snapshots(tmp_path):
+    (tmp_path / "catalog.snapshot.1").write_bytes(b"NOTASNAP" + b"\0" * 64)
+    (tmp_path / "catalog.snapshot").write_text("catalog.snapshot.1", encoding="utf-8")
+    with pytest.raises(SnapshotError):
+        load_snapshot(str(tmp_path / "catalog.snapshot"))
+
+
+def test_export_joins_an_open_transaction(cart_db, tmp_path):
+    conn = get_connection(cart_db)
+    conn.execute("UPDATE products SET mrp = 1.5 WHERE rowid = 1")
+    assert conn.in_transaction
+    export_snapshot(cart_db, str(tmp_path / "catalog.snapshot"))
+    assert conn.in_transaction
+    conn.rollback()
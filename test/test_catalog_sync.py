@@ -0,0 +1,131 @@
+import sqlite3
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import catalog_sync
+from catalog import CatalogCache
+from conftest import make_database
+from database import close_connection, get_connection
+
+
+@pytest.fixture
+def master_and_cart(tmp_path):
+    master = make_database(str(tmp_path / "master.db"))
+    cart = make_database(str(tmp_path / "cart.db"))
+    yield master, cart
+    close_connection()
+
+
+def products(path):
+    conn = sqlite3.connect(path)
+    try:
+        return dict((row[0], row[1:]) for row in conn.execute(
+            "SELECT barcode, product_name, mrp, discount, tax_rate FROM products"))
+    finally:
+        conn.close()
+
+
+def write(path, sql, params=()):
+    with get_connection(path) as conn:
+        conn.execute(sql, params)
+
+
+def test_migrated_database_logs_catalog_updates(cart_db):
+    write(cart_db, "UPDATE products SET mrp = 99 WHERE barcode = '8901057512345'")
+    write(cart_db, "UPDATE products SET stock_quantity = stock_quantity + 1")
+    rows = get_connection(cart_db).execute("SELECT barcode, op FROM product_changes").fetchall()
+    assert rows == [("8901057512345", "upsert")]
+
+
+def test_pull_applies_only_the_changes(master_and_cart):
+    master, cart = master_and_cart
+    write(master, "UPDATE products SET mrp = 333 WHERE barcode = '8901057512345'")
+    write(master, "UPDATE products SET tax_rate = 18 WHERE barcode = '8901725187654'")
+    write(master, "DELETE FROM products WHERE barcode = '8906003012345'")
+    write(master, "INSERT INTO products (barcode, product_name, mrp, discount, tax_rate, quantity_value, "
+                  "quantity_unit, stock_quantity, reorder_level) VALUES ('111', 'New', 10, 0, 5, 1, 'pcs', 3, 0)")
+
+    report = catalog_sync.sync(catalog_sync.LocalTransport(master), cart)
+    assert (report["upserts"], report["deletes"], report["reset"]) == (3, 1, False)
+    assert products(cart) == products(master)
+
+    again = catalog_sync.sync(catalog_sync.LocalTransport(master), cart)
+    assert (again["upserts"], again["deletes"], again["from_version"]) == (0, 0, report["version"])
+
+
+def test_pull_reaches_the_cart_catalog_cache(master_and_cart):
+    master, cart = master_and_cart
+    cache = CatalogCache(cart).load()
+    write(master, "UPDATE products SET mrp = 1.5 WHERE barcode = '8901057512345'")
+    catalog_sync.sync(catalog_sync.LocalTransport(master), cart)
+    assert cache.refresh()
+    assert cache.get("8901057512345")[2] == 1.5
+    cache.stop()
+
+
+def test_pull_pages_through_long_logs(master_and_cart):
+    master, cart = master_and_cart
+    for i in range(7):
+        write(master, "UPDATE products SET discount = ? WHERE product_id = ?", (i + 1, i + 1))
+    report = catalog_sync.sync(catalog_sync.LocalTransport(master), cart, page_size=3)
+    assert report["pages"] == 3
+    assert products(cart) == products(master)
+
+
+def test_pruned_log_resets_the_cart(master_and_cart):
+    master, cart = master_and_cart
+    write(master, "UPDATE products SET mrp = 7 WHERE product_id = 1")
+    write(master, "UPDATE products SET mrp = 8 WHERE product_id = 2")
+    write(master, "DELETE FROM product_changes WHERE version = 1")
+    write(cart, "INSERT INTO products (barcode, product_name, mrp, discount, tax_rate, quantity_value, "
+                "quantity_unit, stock_quantity, reorder_level) VALUES ('stray', 'Stray', 1, 0, 0, 1, 'pcs', 0, 0)")
+
+    report = catalog_sync.sync(catalog_sync.LocalTransport(master), cart)
+    assert report["reset"] and report["deletes"] == 1
+    assert products(cart) == products(master)
+
+
+def test_pull_over_http(master_and_cart):
+    master, cart = master_and_cart
+    server = ThreadingHTTPServer(("127.0.0.1", 0), catalog_sync.make_handler(master))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        write(master, "UPDATE products SET mrp = 42 WHERE barcode = '8901057512345'")
+        transport = catalog_sync.HttpTransport(f"http://127.0.0.1:{server.server_address[1]}")
+        report = catalog_sync.sync(transport, cart)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert report["upserts"] == 1
+    assert products(cart)["8901057512345"][1] == 42
+
+
+def test_changes_since_joins_an_open_transaction(master_and_cart):
+    master, _ = master_and_cart
+    conn = get_connection(master)
+    # Python's sqlite3 opened an implicit transaction for this uncommitted write
+    conn.execute("UPDATE products SET mrp = 77 WHERE barcode = '8901057512345'")
+    assert conn.in_transaction
+    page = catalog_sync.changes_since(conn, 0)
+    assert ["8901057512345"] == [row[0] for row in page["upserts"]]
+    assert conn.in_transaction
+    conn.commit()
+
+
+def test_sync_reexports_the_cart_snapshot(master_and_cart, tmp_path):
+    from catalog_snapshot import SnapshotCatalog, export_snapshot
+    master, cart = master_and_cart
+    snapshot = str(tmp_path / "catalog.snapshot")
+    export_snapshot(cart, snapshot)
+    catalog = SnapshotCatalog(snapshot)
+
+    report = catalog_sync.sync(catalog_sync.LocalTransport(master), cart, snapshot_path=snapshot)
+    assert report["snapshot_version"] is None  # Nothing changed, nothing re-exported
+
+    write(master, "UPDATE products SET mrp = 77 WHERE barcode = '8901057512345'")
+    report = catalog_sync.sync(catalog_sync.LocalTransport(master), cart, snapshot_path=snapshot)
+    assert report["snapshot_version"] is not None
+    assert catalog.refresh()
+    assert catalog.get("8901057512345")[2] == 77
@@ -0,0 +1,64 @@
+from catalog import CatalogCache
+from compact_catalog import CompactCatalog, barcode_key, key_barcode, synthetic_rows
+
+ROWS = [
+    ("8901058851298", "Maggi Noodles", 14.0, 5, 12, 70, "g"),
+    ("0736211234567", "Imported Jam", 350.0, 0, 18, 340, "g"),
+    ("736211234567", "Local Jam", 120.0, 10, 12, 500, "g"),
+    ("SKU-LOOSE-01", "Loose Rice", 60.0, 0, 0, 1, "kg"),
+    ("8901030000001", "Maggi Noodles", 14.0, 5, 12, 70, "g"),
+]
+
+
+def test_keys_keep_leading_zeros():
+    for code in ("0736211234567", "736211234567", "0", "00000000000000000"):
+        assert key_barcode(barcode_key(code)) == code
+    assert barcode_key("0736211234567") != barcode_key("736211234567")
+
+
+def test_non_numeric_and_overlong_codes_have_no_key():
+    assert barcode_key("SKU-LOOSE-01") is None
+    assert barcode_key("1" * 18) is None
+    assert barcode_key("١٢٣") is None
+
+
+def test_get_matches_the_row_shape_of_catalog_cache():
+    catalog = CompactCatalog.from_rows(ROWS)
+    assert catalog.get("8901058851298") == ("8901058851298", "Maggi Noodles", 14.0, 5.0, 70.0, "g")
+    assert catalog.get("0736211234567")[1] == "Imported Jam"
+    assert catalog.get("736211234567")[1] == "Local Jam"
+    assert catalog.get("SKU-LOOSE-01") == ("SKU-LOOSE-01", "Loose Rice", 60.0, 0.0, 1.0, "kg")
+    assert catalog.get("0000000000000") is None
+    assert catalog.tax_rate("0736211234567") == 18.0
+    assert catalog.tax_rate("missing") is None
+
+
+def test_lookup_contains_len_and_barcodes():
+    catalog = CompactCatalog.from_rows(ROWS)
+    assert len(catalog) == 5
+    assert "SKU-LOOSE-01" in catalog and "nope" not in catalog
+    assert set(catalog.lookup(["736211234567", "nope", "SKU-LOOSE-01"])) == {"736211234567", "SKU-LOOSE-01"}
+    assert sorted(catalog.barcodes()) == sorted(row[0] for row in ROWS)
+
+
+def test_identical_names_are_stored_once():
+    catalog = CompactCatalog.from_rows(ROWS)
+    assert len(catalog.name_offsets) - 1 == 4
+    assert catalog.units == ["g", "kg"]
+
+
+def test_agrees_with_catalog_cache_on_the_seeded_database(cart_db):
+    cache = CatalogCache(cart_db)
+    cache.load()
+    compact = CompactCatalog.from_database(cart_db)
+    assert len(compact) == len(cache.barcodes())
+    for code in cache.barcodes():
+        assert compact.get(code) == cache.get(code)
+        assert compact.tax_rate(code) == cache.tax_rate(code)
+
+
+def test_synthetic_rows_round_trip():
+    rows = list(synthetic_rows(1000))
+    catalog = CompactCatalog.from_rows(rows)
+    for row in rows[::97]:
+        assert catalog.get(row[0])[:4] == (row[0], row[1], row[2], row[3])
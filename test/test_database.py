@@ -0,0 +1,89 @@
+import sqlite3
+import threading
+
+import pytest
+
+from database import PRAGMAS, close_connection, connect, get_connection, read_transaction, transaction
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "shared.db")
+    yield path
+    close_connection()
+
+
+def pragma(conn, name):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def test_connections_are_tuned(db_path):
+    conn = get_connection(db_path)
+    assert pragma(conn, "journal_mode") == "wal"
+    assert pragma(conn, "synchronous") == 1          # NORMAL
+    assert pragma(conn, "busy_timeout") == PRAGMAS["busy_timeout"]
+    assert pragma(conn, "cache_size") == PRAGMAS["cache_size"]
+    assert pragma(conn, "temp_store") == 2           # MEMORY
+
+
+def test_each_thread_reuses_its_own_connection(db_path):
+    conn = get_connection(db_path)
+    assert get_connection(db_path) is conn
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(get_connection(db_path)))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+
+def test_close_connection_opens_a_fresh_one_next_time(db_path):
+    conn = get_connection(db_path)
+    close_connection(db_path)
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    assert get_connection(db_path) is not conn
+
+
+def test_transaction_commits_or_rolls_back(db_path):
+    with transaction(db_path) as conn:
+        conn.execute("CREATE TABLE items (name TEXT)")
+        conn.execute("INSERT INTO items VALUES ('tea')")
+    with pytest.raises(RuntimeError):
+        with transaction(db_path) as conn:
+            conn.execute("INSERT INTO items VALUES ('coffee')")
+            raise RuntimeError
+    assert get_connection(db_path).execute("SELECT name FROM items").fetchall() == [("tea",)]
+
+
+def test_readers_do_not_block_the_writer(db_path):
+    with transaction(db_path) as conn:
+        conn.execute("CREATE TABLE items (name TEXT)")
+    reader = get_connection(db_path)
+    writer = connect(db_path)
+    try:
+        reader.execute("BEGIN")
+        assert reader.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+        with writer:
+            writer.execute("INSERT INTO items VALUES ('tea')")
+        assert reader.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0   # Still its snapshot
+        reader.rollback()
+        assert reader.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+    finally:
+        writer.close()
+
+
+def test_read_transaction_ends_its_own_transaction_but_joins_an_open_one(db_path):
+    with transaction(db_path) as conn:
+        conn.execute("CREATE TABLE items (name TEXT)")
+    conn = get_connection(db_path)
+    with read_transaction(conn):
+        assert conn.in_transaction
+    assert not conn.in_transaction
+
+    conn.execute("INSERT INTO items VALUES ('tea')")   # Opens an implicit transaction
+    with read_transaction(conn):
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+    assert conn.in_transaction                         # Still the writer's to commit
+    conn.commit()
+    assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
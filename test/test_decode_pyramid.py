@@ -0,0 +1,55 @@
+import numpy as np
+
+from decoders import DecodedBarcode, Rect
+from scanner import DecodePyramid
+
+
+class SizeDecoder:
+    """Finds a barcode only in images at least min_width wide; records the widths it was given."""
+
+    def __init__(self, min_width):
+        self.min_width = min_width
+        self.widths = []
+
+    def __call__(self, image):
+        self.widths.append(image.shape[1])
+        if image.shape[1] >= self.min_width:
+            return [DecodedBarcode(b"123", "EAN13", Rect(10, 10, 40, 20), [])]
+        return []
+
+
+def barcode_like_frame():
+    """A 1280x720 frame with vertical bars in the middle, so misses escalate."""
+    frame = np.full((720, 1280), 255, np.uint8)
+    frame[250:470, 400:880:16] = 0
+    frame[250:470, 401:880:16] = 0
+    return frame
+
+
+def test_hard_frame_escalates_and_is_remembered():
+    pyramid = DecodePyramid((320, 640, 0), hold_frames=5)
+    decoder = SizeDecoder(1280)
+    barcodes = pyramid.decode(barcode_like_frame(), decoder)
+    assert decoder.widths == [320, 640, 1280]
+    assert barcodes[0].rect == Rect(10, 10, 40, 20)
+    assert pyramid.start_level() == 2
+
+
+def test_learned_level_expires_back_to_the_coarse_level():
+    pyramid = DecodePyramid((320, 640, 0), hold_frames=5)
+    frame = barcode_like_frame()
+    pyramid.decode(frame, SizeDecoder(1280))
+    easy = SizeDecoder(320)
+    for _ in range(4):
+        pyramid.decode(frame, easy)
+    # Still held: every frame so far went straight to native resolution
+    assert easy.widths == [1280] * 4
+    pyramid.decode(frame, easy)
+    assert easy.widths[-1] == 320
+    assert pyramid.start_level() == 0
+
+
+def test_coarse_success_is_scaled_back_to_frame_coordinates():
+    pyramid = DecodePyramid((320, 640, 0))
+    barcodes = pyramid.decode(barcode_like_frame(), SizeDecoder(320))
+    assert barcodes[0].rect == Rect(40, 40, 160, 80)
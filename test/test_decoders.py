@@ -0,0 +1,72 @@
+import csv
+
+import cv2
+import numpy as np
+import pytest
+
+from decoder_benchmark import percentile, run_benchmark
+from decoders import DecodedBarcode, OpenCVBackend, Point, Rect, get_decoder
+
+
+def qr_image(data, scale=6, border=40):
+    """A gray image of a QR code for data, drawn with OpenCV's own encoder."""
+    code = cv2.QRCodeEncoder.create().encode(data)
+    code = cv2.resize(code, None, fx=scale, fy=scale, interpolation=cv2.INTER_NEAREST)
+    return cv2.copyMakeBorder(code, border, border, border, border, cv2.BORDER_CONSTANT, value=255)
+
+
+class StubBarcodeDetector:
+    """Stands in for cv2.barcode.BarcodeDetector with one fixed EAN-13 read."""
+
+    def detectAndDecodeWithType(self, gray):
+        quad = np.array([[[10, 20], [110, 20], [110, 60], [10, 60]]], np.float32)
+        return True, ("4006381333931",), ("EAN_13",), quad
+
+
+def test_opencv_backend_reads_a_qr_code():
+    barcodes = get_decoder("opencv")(qr_image("8901234567890"))
+    assert [(b.data, b.type) for b in barcodes] == [(b"8901234567890", "QRCODE")]
+    rect = barcodes[0].rect
+    assert isinstance(rect, Rect) and rect.width > 0 and rect.height > 0
+    assert all(isinstance(p, Point) for p in barcodes[0].polygon)
+
+
+def test_opencv_symbologies_are_reported_under_zbar_names():
+    decoder = OpenCVBackend(["EAN13"])
+    decoder._barcode = StubBarcodeDetector()
+    assert decoder(np.zeros((80, 120), np.uint8)) == [
+        DecodedBarcode(b"4006381333931", "EAN13", Rect(10, 20, 100, 40),
+                       [Point(10, 20), Point(110, 20), Point(110, 60), Point(10, 60)])]
+
+
+def test_symbologies_that_were_not_requested_are_dropped():
+    decoder = OpenCVBackend(["CODE128"])
+    decoder._barcode = StubBarcodeDetector()
+    assert decoder._qr is None
+    assert decoder(qr_image("8901234567890")) == []
+
+
+def test_unknown_decoder_names_are_rejected():
+    with pytest.raises(ValueError, match="opencv"):
+        get_decoder("zxing")
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) == 0.0
+
+
+def test_benchmark_measures_read_rate_against_the_manifest(tmp_path):
+    cv2.imwrite(str(tmp_path / "a.png"), qr_image("SKU-1"))
+    cv2.imwrite(str(tmp_path / "b.png"), np.full((200, 200), 255, np.uint8))   # Nothing to read
+    with open(tmp_path / "manifest.csv", "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([("file", "data", "symbology"), ("a.png", "SKU-1", "QRCODE"),
+                                 ("b.png", "SKU-2", "QRCODE")])
+
+    stats = run_benchmark(str(tmp_path), ["opencv"], repeat=2)["opencv"]
+    assert stats["frames"] == 4
+    assert stats["reads"] == {"QRCODE": 2}
+    assert stats["read_rate"] == {"QRCODE": 0.5}
+    assert stats["success_rate"] == 0.5
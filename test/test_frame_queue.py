@@ -0,0 +1,40 @@
+import threading
+
+from scanner import FrameQueue, RateMeter
+
+
+def test_full_queue_drops_the_oldest_frame():
+    queue = FrameQueue(maxsize=2)
+    for seq in range(5):
+        queue.put(seq)
+    assert queue.dropped == 3
+    assert [queue.get(timeout=0), queue.get(timeout=0)] == [3, 4]
+    assert queue.get(timeout=0) is None
+
+
+def test_get_wakes_up_when_a_frame_arrives():
+    queue = FrameQueue()
+    got = []
+    reader = threading.Thread(target=lambda: got.append(queue.get(timeout=2)))
+    reader.start()
+    queue.put("frame")
+    reader.join(2)
+    assert got == ["frame"]
+
+
+def test_close_releases_waiting_readers():
+    queue = FrameQueue()
+    got = []
+    reader = threading.Thread(target=lambda: got.append(queue.get(timeout=2)))
+    reader.start()
+    queue.close()
+    reader.join(2)
+    assert got == [None] and queue.closed
+
+
+def test_rate_meter_counts_over_its_window():
+    meter = RateMeter(window=2.0)
+    for i in range(10):
+        meter.tick(now=100 + i * 0.1)
+    assert meter.rate(now=101.0) == 5.0
+    assert meter.rate(now=104.0) == 0.0
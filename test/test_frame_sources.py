@@ -0,0 +1,105 @@
+import time
+
+import cv2
+import numpy as np
+
+from frame_sources import ImageDirectorySource, RecordingSource, VideoFileSource, open_source
+
+
+def shade(value):
+    return np.full((48, 64, 3), value, np.uint8)
+
+
+def write_frames(folder, names):
+    """Writes one flat frame per name, shaded by its position in names."""
+    for i, name in enumerate(names):
+        cv2.imwrite(str(folder / name), shade(40 * (i + 1)))
+
+
+def read_all(source, limit=50):
+    """Mean brightness of every frame source delivers, up to limit frames."""
+    shades = []
+    for _ in range(limit):
+        ok, image = source.read()
+        if not ok:
+            break
+        shades.append(int(round(image.mean())))
+    return shades
+
+
+class CountingSource:
+    """Endless source of ever brighter frames."""
+
+    finished = False
+
+    def __init__(self):
+        self.count = 0
+        self.released = False
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        self.count += 1
+        return True, shade(20 * self.count)
+
+    def release(self):
+        self.released = True
+
+
+def test_image_directory_replays_images_in_name_order(tmp_path):
+    write_frames(tmp_path, ["frame_2.png", "frame_1.png", "frame_3.jpg"])
+    (tmp_path / "manifest.csv").write_text("file,data,symbology\n")
+    source = ImageDirectorySource(str(tmp_path), realtime=False)
+    assert source.files == sorted(str(tmp_path / name) for name in ["frame_1.png", "frame_2.png", "frame_3.jpg"])
+    assert read_all(source) == [80, 40, 120]
+    assert source.finished
+
+
+def test_looping_replay_never_finishes(tmp_path):
+    write_frames(tmp_path, ["a.png", "b.png"])
+    source = ImageDirectorySource(str(tmp_path), realtime=False, loop=True)
+    assert read_all(source, limit=5) == [40, 80, 40, 80, 40]
+    assert not source.finished
+
+
+def test_realtime_replay_is_paced_to_its_frame_rate(tmp_path):
+    write_frames(tmp_path, ["a.png", "b.png", "c.png", "d.png", "e.png"])
+    started = time.monotonic()
+    read_all(ImageDirectorySource(str(tmp_path), fps=50))
+    assert time.monotonic() - started >= 0.07   # Four 20 ms gaps between five frames
+
+
+def test_missing_or_empty_folders_do_not_open(tmp_path):
+    assert not ImageDirectorySource(str(tmp_path / "missing")).isOpened()
+    assert not ImageDirectorySource(str(tmp_path)).isOpened()
+
+
+def test_recording_to_a_folder_replays_the_same_frames(tmp_path):
+    live = CountingSource()
+    recorder = RecordingSource(live, str(tmp_path / "session"))
+    assert read_all(recorder, limit=3) == [20, 40, 60]
+    recorder.release()
+    assert live.released
+
+    replay = open_source(str(tmp_path / "session"), realtime=False)
+    assert isinstance(replay, ImageDirectorySource)
+    assert read_all(replay) == [20, 40, 60]
+
+
+def test_recording_to_a_video_file_replays_every_frame(tmp_path):
+    path = str(tmp_path / "session.mp4")
+    recorder = RecordingSource(CountingSource(), path, fps=10)
+    read_all(recorder, limit=4)
+    recorder.release()
+
+    replay = open_source(f"video:{path}", realtime=False)
+    assert isinstance(replay, VideoFileSource)
+    assert len(read_all(replay)) == 4
+    assert replay.finished
+
+
+def test_spec_prefixes_choose_the_source(tmp_path):
+    write_frames(tmp_path, ["a.png"])
+    source = open_source(f"images:{tmp_path}")
+    assert isinstance(source, ImageDirectorySource) and source.isOpened()
@@ -0,0 +1,28 @@
+import cv2
+import numpy as np
+
+from headless_scan import run
+
+
+def save_presentation(folder, start, code, frames):
+    """Writes frames images of code held still on a white canvas, numbered from start."""
+    image = cv2.QRCodeEncoder.create().encode(code)
+    image = cv2.resize(image, None, fx=6, fy=6, interpolation=cv2.INTER_NEAREST)
+    canvas = np.full((480, 640), 255, np.uint8)
+    canvas[100:100 + image.shape[0], 150:150 + image.shape[1]] = image
+    for i in range(frames):
+        cv2.imwrite(str(folder / f"frame_{start + i:04d}.png"), canvas)
+    return start + frames
+
+
+def test_recorded_session_builds_the_cart_with_no_camera_or_display(tmp_path, cart_db):
+    frames = tmp_path / "session"
+    frames.mkdir()
+    end = save_presentation(frames, 0, "8901057512345", 6)   # Aashirvaad Atta, held for six frames
+    save_presentation(frames, end, "0000000000000", 3)       # Not in the catalog
+
+    summary = run(f"images:{frames}", realtime=False, decoder="opencv", db_path=cart_db)
+
+    assert [item["name"] for item in summary["cart_items"].values()] == ["Aashirvaad Atta"]
+    assert next(iter(summary["cart_items"].values()))["quantity"] == 1
+    assert summary["not_found"] == ["0000000000000"]
@@ -0,0 +1,63 @@
+import pytest
+
+from latency import STAGES, LatencyHistogram, LatencyTracker
+
+
+def test_percentiles_keep_two_significant_digits():
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+    assert histogram.count == 1000
+    assert histogram.percentile(50) == pytest.approx(0.5, rel=0.02)
+    assert histogram.percentile(99) == pytest.approx(0.99, rel=0.02)
+    assert histogram.percentile(100) == pytest.approx(1.0, rel=0.02)
+
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram()
+    for us in (3, 7, 42):
+        histogram.record(us / 1_000_000)
+    assert histogram.percentile(50) == 7 / 1_000_000
+    assert histogram.min_us == 3 and histogram.max_us == 42
+
+
+def test_values_are_clamped_to_the_range():
+    histogram = LatencyHistogram(highest=1.0)
+    histogram.record(-1.0)
+    histogram.record(5.0)
+    assert histogram.min_us == 0
+    assert histogram.max_us == 1_000_000
+
+
+def test_empty_summary():
+    assert LatencyHistogram().summary() == {
+        "count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p90_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0,
+    }
+
+
+def test_tracker_records_stage_gaps_and_end_to_end():
+    tracker = LatencyTracker()
+    for i, stage in enumerate(STAGES):
+        tracker.mark("A", stage, at=10.0 + i * 0.01)
+    summary = tracker.summary()
+    assert summary["capture->decode"]["count"] == 1
+    assert summary["confirm->display"]["p50_ms"] == pytest.approx(10.0, rel=0.02)
+    assert summary["capture->display"]["p50_ms"] == pytest.approx(60.0, rel=0.02)
+    assert not tracker._traces
+
+
+def test_tracker_skipped_stages_record_the_gap_from_the_last_one():
+    tracker = LatencyTracker()
+    tracker.mark("A", "capture", at=0.0)
+    tracker.mark("A", "lookup", at=0.02)
+    assert set(tracker.summary()) == {"capture->lookup"}
+
+
+def test_tracker_drops_discarded_and_oldest_traces():
+    tracker = LatencyTracker(max_traces=2)
+    for code in "ABC":
+        tracker.mark(code, "capture", at=0.0)
+    assert list(tracker._traces) == ["B", "C"]
+    tracker.discard("B")
+    tracker.mark("B", "display", at=1.0)
+    assert "capture->display" not in tracker.summary()
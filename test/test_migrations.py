@@ -0,0 +1,68 @@
+import sqlite3
+
+import pytest
+
+from migrations import current_version, discover, migrate, pending
+
+
+def write(folder, name, sql):
+    (folder / name).write_text(sql, encoding="utf-8")
+
+
+def test_discover_orders_by_version_and_ignores_other_files(tmp_path):
+    write(tmp_path, "0002_second.sql", "")
+    write(tmp_path, "0001_first.sql", "")
+    write(tmp_path, "notes.txt", "")
+    assert [(v, name) for v, name, _ in discover(str(tmp_path))] == [(1, "first"), (2, "second")]
+
+
+def test_discover_rejects_duplicate_versions(tmp_path):
+    write(tmp_path, "0001_a.sql", "")
+    write(tmp_path, "0001_b.sql", "")
+    with pytest.raises(ValueError):
+        discover(str(tmp_path))
+
+
+def test_migrate_applies_pending_in_order_once(tmp_path):
+    write(tmp_path, "0001_table.sql", "CREATE TABLE t (a INTEGER);")
+    write(tmp_path, "0002_row.sql", "INSERT INTO t VALUES (1);")
+    conn = sqlite3.connect(":memory:")
+    assert migrate(conn, str(tmp_path), target=1) == [1]
+    assert current_version(conn) == 1
+    assert [v for v, _, _ in pending(conn, str(tmp_path))] == [2]
+    assert migrate(conn, str(tmp_path)) == [2]
+    assert migrate(conn, str(tmp_path)) == []
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+
+
+def test_failed_migration_rolls_back_to_the_previous_version(tmp_path):
+    write(tmp_path, "0001_table.sql", "CREATE TABLE t (a INTEGER);")
+    write(tmp_path, "0002_broken.sql", "INSERT INTO t VALUES (1);\nINSERT INTO missing VALUES (1);")
+    conn = sqlite3.connect(":memory:")
+    with pytest.raises(sqlite3.Error):
+        migrate(conn, str(tmp_path))
+    assert current_version(conn) == 1
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+
+def test_fresh_database_is_fully_migrated(cart_db):
+    conn = sqlite3.connect(cart_db)
+    assert current_version(conn) == discover()[-1][0]
+    types = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(users)")}
+    assert types["phone_no"] == "TEXT"
+    assert types["avg_spend"] == types["total_purchase"] == "REAL"
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_users_email", "idx_users_phone_no", "idx_orders_user_id"} <= indexes
+    conn.close()
+
+
+def test_fresh_database_gets_the_change_log_and_sync_state(cart_db):
+    conn = sqlite3.connect(cart_db)
+    assert current_version(conn) == discover()[-1][0]
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")}
+    assert {"product_changes", "sync_state", "products_log_insert", "products_log_update",
+            "products_log_delete"} <= tables
+    logged = conn.execute("SELECT COUNT(*) FROM product_changes").fetchone()[0]
+    conn.execute("UPDATE products SET tax_rate = tax_rate + 1 WHERE rowid = 1")
+    assert conn.execute("SELECT COUNT(*) FROM product_changes").fetchone()[0] == logged + 1
+    conn.close()
@@ -0,0 +1,40 @@
+import numpy as np
+
+from scanner import MotionGate
+
+EMPTY = np.zeros((480, 640, 3), np.uint8)
+ITEM = np.full((480, 640, 3), 180, np.uint8)
+
+
+def test_static_scene_stops_decoding_after_the_hold():
+    gate = MotionGate(hold=1.0, idle_after=10.0)
+    assert gate.check(EMPTY, now=0.0)          # First frame always counts as a change
+    assert gate.check(EMPTY, now=1.0)
+    assert not gate.check(EMPTY, now=1.5)
+    assert gate.check(ITEM, now=2.0)           # Scene changed
+    assert not gate.check(ITEM, now=3.5)
+
+
+def test_sensor_noise_below_the_threshold_is_not_motion():
+    gate = MotionGate(threshold=4.0, hold=1.0)
+    noisy = (EMPTY + np.random.default_rng(0).integers(0, 3, EMPTY.shape, np.uint8)).astype(np.uint8)
+    gate.check(EMPTY, now=0.0)
+    assert not gate.check(noisy, now=2.0)
+
+
+def test_item_in_view_keeps_decoding_and_prevents_idle():
+    gate = MotionGate(hold=1.0, idle_after=5.0)
+    gate.check(ITEM, now=0.0)
+    gate.item_in_view = True
+    assert gate.check(ITEM, now=30.0)
+    assert not gate.idle(now=30.0)
+
+
+def test_idle_starts_after_quiet_period_and_motion_wakes_it():
+    gate = MotionGate(hold=1.0, idle_after=5.0)
+    gate.check(EMPTY, now=0.0)
+    assert not gate.idle(now=4.9)
+    gate.check(EMPTY, now=5.0)
+    assert gate.idle(now=5.0)
+    gate.check(ITEM[:, :, 0], now=6.0)         # Gray frames are gated the same way
+    assert not gate.idle(now=6.0)
@@ -0,0 +1,158 @@
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+import cart
+from scanner import Frame, ScannerEngine
+
+
+class StillCamera:
+    finished = False
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        time.sleep(0.005)
+        return True, np.zeros((120, 160, 3), np.uint8)
+
+    def release(self):
+        pass
+
+    def set_idle(self, idle, fps=None):
+        pass
+
+    def flush(self):
+        pass
+
+
+def test_scanner_loop_never_touches_highgui(monkeypatch):
+    calls = []
+    for name in ("imshow", "waitKey", "namedWindow", "destroyAllWindows"):
+        monkeypatch.setattr(cv2, name, lambda *args, name=name: calls.append(name))
+
+    engine = ScannerEngine(lambda barcode, frame: None, {"decoder": "opencv", "stats_interval": 0},
+                           source=StillCamera())
+    assert engine.start()
+    try:
+        deadline = time.monotonic() + 3
+        while engine.latest_frame() is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        engine.stop()
+
+    frame, barcodes = engine.latest_frame()
+    assert frame.image.shape == (120, 160, 3) and barcodes == []
+    assert calls == []
+
+
+class FakeScanner:
+    def __init__(self):
+        self.latest = None
+        self.started = self.paused = 0
+        self.opens = True
+
+    def latest_frame(self):
+        return self.latest
+
+    def start(self):
+        self.started += 1
+        return self.opens
+
+    def pause(self):
+        self.paused += 1
+
+
+def frame(seq):
+    return Frame(seq, 0.0, np.zeros((120, 160, 3), np.uint8)), []
+
+
+@pytest.fixture
+def preview():
+    """A CameraPreview whose Tk timer is a list of pending callbacks."""
+    scanner = FakeScanner()
+    preview = cart.CameraPreview.__new__(cart.CameraPreview)
+    preview.get_scanner = lambda: scanner
+    preview.interval = 100
+    preview._shown_seq = None
+    preview._job = None
+    preview.scanner = scanner
+    preview.jobs = []
+    preview.rendered = []
+    preview.after = lambda ms, callback: preview.jobs.append((ms, callback)) or len(preview.jobs)
+    preview.after_cancel = lambda job: preview.jobs.clear()
+
+    def render(frame, barcodes):
+        preview.rendered.append(frame.seq)
+        preview._shown_seq = frame.seq
+
+    preview._render = render
+    return preview
+
+
+def tick(preview):
+    _, callback = preview.jobs.pop(0)
+    callback()
+
+
+def test_preview_renders_each_decoded_frame_once_at_its_interval(preview):
+    preview.start()
+    assert preview.rendered == [] and preview.jobs[0][0] == 100
+
+    preview.scanner.latest = frame(1)
+    tick(preview)
+    tick(preview)                       # Same frame again: nothing to redraw
+    preview.scanner.latest = frame(7)
+    tick(preview)
+    assert preview.rendered == [1, 7]
+    assert len(preview.jobs) == 1       # Always exactly one pending refresh
+
+
+def test_preview_start_is_idempotent_and_stop_cancels_the_refresh(preview):
+    preview.start()
+    preview.start()
+    assert len(preview.jobs) == 1
+    preview.stop()
+    assert preview.jobs == [] and preview._job is None
+    preview.stop()
+
+
+class FakePreview:
+    def __init__(self):
+        self.running = False
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+
+@pytest.fixture
+def app():
+    app = cart.SmartCartApp.__new__(cart.SmartCartApp)
+    app.scanner = FakeScanner()
+    app.preview = FakePreview()
+    app.statuses = []
+    app.update_status = lambda message, *args: app.statuses.append(message)
+    return app
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_preview_follows_the_config_toggle(app, monkeypatch, enabled):
+    monkeypatch.setitem(cart.SCANNER_CONFIG, "preview", enabled)
+    app.scan_with_camera()
+    assert app.scanner.started == 1
+    assert app.preview.running is enabled
+
+    app.pause_scanner()
+    assert app.scanner.paused == 1 and not app.preview.running
+
+
+def test_preview_stays_off_when_the_camera_does_not_open(app):
+    app.scanner.opens = False
+    app.scan_with_camera()
+    assert not app.preview.running
+    assert app.statuses == ["Scanner Error: Camera not found."]
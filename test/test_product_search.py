@@ -0,0 +1,44 @@
+from database import get_connection
+from product_search import TARGET_MS, fts_query, run_benchmark, search_products
+
+
+def test_fts_query_requires_every_word_as_a_prefix():
+    assert fts_query("Sun  oi!") == '"sun"* "oi"*'
+    assert fts_query("  ") is None
+
+
+def test_word_prefixes_find_products(cart_db):
+    names = [row[1] for row in search_products("sun oi", db_path=cart_db)]
+    assert names == ["Sunflower Oil"]
+
+
+def test_digits_match_barcode_prefixes(cart_db):
+    codes = [row[0] for row in search_products("890600", db_path=cart_db)]
+    assert codes == ["8906003012345", "8906003098765"]
+
+
+def test_best_match_comes_first_among_many_matches(cart_db):
+    with get_connection(cart_db) as conn:
+        conn.executemany(
+            "INSERT INTO products (barcode, product_name, mrp, discount, tax_rate, quantity_value, quantity_unit, "
+            "stock_quantity, reorder_level) VALUES (?, ?, 10, 0, 5, 1, 'pcs', 1, 0)",
+            [(f"77{i:04d}", f"Masala chai blend assorted gift box number {i}") for i in range(20)]
+            + [("779999", "Masala Chai")])
+    assert search_products("masala chai", limit=1, db_path=cart_db)[0][1] == "Masala Chai"
+
+
+def test_renamed_products_are_found_by_their_new_name(cart_db):
+    with get_connection(cart_db) as conn:
+        conn.execute("UPDATE products SET product_name = 'Zesty Lime Soap' WHERE product_name = 'Dove Soap'")
+    assert [row[1] for row in search_products("zesty", db_path=cart_db)] == ["Zesty Lime Soap"]
+    assert "Dove Soap" not in [row[1] for row in search_products("soap", db_path=cart_db)]
+
+
+def test_shorter_names_rank_first(cart_db):
+    names = [row[1] for row in search_products("soap", db_path=cart_db)]
+    assert names == sorted(names, key=len)
+
+
+def test_every_keystroke_is_under_target_on_200k_products():
+    report = run_benchmark(200_000)
+    assert report["max_ms"] < TARGET_MS, report
@@ -0,0 +1,59 @@
+import numpy as np
+
+from decoders import DecodedBarcode, Point, Rect
+from scanner import ROITracker
+
+
+def hit(left, top, width=100, height=40):
+    return DecodedBarcode(b"123", "EAN13", Rect(left, top, width, height), [Point(left, top)])
+
+
+class RecordingDecoder:
+    """Returns results for each call in turn and records the image shapes it was given."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.shapes = []
+
+    def __call__(self, image):
+        self.shapes.append(image.shape)
+        return self.results.pop(0) if self.results else []
+
+
+def test_full_frame_until_something_is_found():
+    tracker = ROITracker()
+    assert tracker.region((480, 640)) is None
+    tracker.update([hit(200, 200)])
+    assert tracker.region((480, 640)) == (150, 176, 200, 88)
+
+
+def test_crop_is_clipped_to_the_frame():
+    tracker = ROITracker()
+    tracker.update([hit(0, 0, 50, 20)])
+    assert tracker.region((480, 640)) == (0, 0, 50 + 25, 20 + 24)
+
+
+def test_every_nth_frame_is_full_frame():
+    tracker = ROITracker(full_frame_every=3)
+    tracker.update([hit(200, 200)])
+    regions = [tracker.region((480, 640)) for _ in range(6)]
+    assert [r is None for r in regions] == [False, False, True, False, False, True]
+
+
+def test_crop_hits_map_back_to_frame_coordinates():
+    tracker = ROITracker()
+    tracker.update([hit(200, 200)])
+    decoder = RecordingDecoder([hit(50, 24)])
+    barcodes = tracker.decode(np.zeros((480, 640), np.uint8), decoder)
+    assert decoder.shapes == [(88, 200)]
+    assert barcodes[0].rect == Rect(200, 200, 100, 40)
+    assert barcodes[0].polygon == [Point(200, 200)]
+
+
+def test_crop_miss_falls_back_to_the_full_frame_and_clears_the_region():
+    tracker = ROITracker()
+    tracker.update([hit(200, 200)])
+    decoder = RecordingDecoder([], [])
+    assert tracker.decode(np.zeros((480, 640), np.uint8), decoder) == []
+    assert decoder.shapes == [(88, 200), (480, 640)]
+    assert tracker.region((480, 640)) is None
@@ -0,0 +1,57 @@
+import json
+import random
+import sqlite3
+from collections import Counter
+
+import pytest
+
+from sampling import AliasTable, ProductSampler
+
+
+def test_alias_table_draws_in_proportion_to_weight():
+    table = AliasTable([1, 0, 3, 6])
+    rng = random.Random(1)
+    counts = Counter(table.sample(rng) for _ in range(20000))
+    assert counts[1] == 0
+    assert counts[0] / 20000 == pytest.approx(0.1, abs=0.02)
+    assert counts[3] / 20000 == pytest.approx(0.6, abs=0.02)
+
+
+def test_alias_table_needs_a_positive_weight():
+    with pytest.raises(ValueError):
+        AliasTable([])
+    with pytest.raises(ValueError):
+        AliasTable([0, 0])
+
+
+def test_uniform_sampler_skips_gaps(cart_db):
+    conn = sqlite3.connect(cart_db)
+    kept = conn.execute("SELECT MIN(product_id), MAX(product_id) FROM products").fetchone()
+    conn.execute("DELETE FROM products WHERE product_id NOT IN (?, ?)", kept)
+    conn.commit()
+    conn.close()
+    sampler = ProductSampler(cart_db, rng=random.Random(3), max_retries=1)
+    assert len({sampler.random_product()[0] for _ in range(50)}) == 2
+    assert len(sampler.sample_barcodes(5)) == 2
+
+
+def test_empty_catalog_returns_none(cart_db):
+    conn = sqlite3.connect(cart_db)
+    conn.execute("DELETE FROM products")
+    conn.commit()
+    conn.close()
+    sampler = ProductSampler(cart_db)
+    assert sampler.random_product() is None
+    assert sampler.sample_barcodes(3) == []
+
+
+def test_weighted_sampler_follows_sales(cart_db):
+    conn = sqlite3.connect(cart_db)
+    best_id, best_code = conn.execute("SELECT product_id, barcode FROM products LIMIT 1").fetchone()
+    conn.execute("INSERT INTO bills (user_id, items_json) VALUES (1, ?)",
+                 (json.dumps([{"id": best_id, "qty": 1000}]),))
+    conn.commit()
+    conn.close()
+    sampler = ProductSampler(cart_db, weighted=True, rng=random.Random(5))
+    draws = Counter(sampler.random_product()[0] for _ in range(500))
+    assert draws[best_code] > 400
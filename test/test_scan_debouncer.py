@@ -0,0 +1,49 @@
+from scanner import ScanDebouncer
+
+
+def test_code_fires_once_while_it_stays_in_view():
+    debouncer = ScanDebouncer(hold_time=0.6, rearm_delay=0.4)
+    assert debouncer.update(["A"], now=0.0) == ["A"]
+    for i in range(1, 20):
+        assert debouncer.update(["A"], now=i * 0.1) == []
+
+
+def test_missed_frames_within_hold_time_do_not_refire():
+    debouncer = ScanDebouncer(hold_time=0.6, rearm_delay=0.4)
+    debouncer.update(["A"], now=0.0)
+    debouncer.update([], now=0.3)
+    assert debouncer.update(["A"], now=0.5) == []
+
+
+def test_code_rearms_after_it_left_for_hold_plus_rearm():
+    debouncer = ScanDebouncer(hold_time=0.6, rearm_delay=0.4)
+    debouncer.update(["A"], now=0.0)
+    debouncer.update([], now=0.7)
+    assert debouncer.present() == []
+    # Released at 0.6; coming back before 1.0 continues the old presentation
+    assert debouncer.update(["A"], now=0.9) == []
+    debouncer.update([], now=1.6)
+    assert debouncer.update(["A"], now=2.1) == ["A"]
+
+
+def test_codes_in_one_frame_are_tracked_independently():
+    debouncer = ScanDebouncer(hold_time=0.6, rearm_delay=0.4)
+    assert debouncer.update(["A", "B"], now=0.0) == ["A", "B"]
+    assert debouncer.update(["A", "C"], now=0.1) == ["C"]
+    assert sorted(debouncer.present()) == ["A", "B", "C"]
+
+
+def test_reset_forgets_every_code():
+    debouncer = ScanDebouncer()
+    debouncer.update(["A"], now=0.0)
+    debouncer.reset()
+    assert debouncer.update(["A"], now=0.1) == ["A"]
+
+
+def test_window_edges():
+    debouncer = ScanDebouncer(hold_time=1.0, rearm_delay=0.5)
+    debouncer.update(["A"], now=0.0)
+    assert debouncer.update(["A"], now=1.0) == []       # Seen exactly hold_time later: same presentation
+    debouncer.update([], now=2.25)                      # Gone since 1.0, released at 2.0
+    assert debouncer.present() == []
+    assert debouncer.update(["A"], now=2.5) == ["A"]    # Re-armed exactly rearm_delay after release
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import pytest
+
+import cart
+from cart_engine import Cart
+from latency import LatencyTracker
+
+MAGGI = ("8901058851298", "Maggi Noodles", 14.0, 5.0, 70, "g")
+
+
+class FakePopup:
+    def __init__(self, parent, product, callback):
+        self.product = product
+        self.callback = callback
+
+    def bind(self, event, handler):
+        self.on_destroy = handler
+
+    def confirm(self, quantity=1):
+        self.callback(self.product, quantity)
+        self.close()
+
+    def close(self):
+        self.on_destroy(SimpleNamespace(widget=self))
+
+
+class FakeCatalog:
+    def lookup(self, codes):
+        return {code: MAGGI for code in codes if code == MAGGI[0]}
+
+    def tax_rate(self, barcode):
+        return 12.0
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """A SmartCartApp without Tk: only the scan -> popup -> cart path is wired up."""
+    monkeypatch.setattr(cart, "ProductPopup", FakePopup)
+    app = cart.SmartCartApp.__new__(cart.SmartCartApp)
+    app.cart = Cart()
+    app.catalog = FakeCatalog()
+    app.latency = LatencyTracker()
+    app._pending_products = []
+    app._active_popup = None
+    app._traced_popup = None
+    app._awaiting_display = set()
+    app.update_status = lambda *args: None
+    app.after_idle = lambda callback: callback()
+    app._update_totals = app._toggle_cart_view = lambda: None
+    return app
+
+
+def scan(app, code=MAGGI[0]):
+    app.latency.mark(code, "capture", at=0.0)
+    app._process_scan_batch([SimpleNamespace(barcode=code)])
+    return app._active_popup
+
+
+def test_confirmed_scan_is_traced_to_the_display(app):
+    scan(app).confirm()
+    app._on_cart_rendered({MAGGI[0]})
+    assert app.latency.summary()["capture->display"]["count"] == 1
+
+
+def test_cancelled_popup_drops_its_trace(app):
+    scan(app).close()
+    assert not app.latency._traces
+    app.add_searched_product(MAGGI)
+    app._active_popup.confirm()
+    app._on_cart_rendered({MAGGI[0]})
+    summary = app.latency.summary()
+    assert "popup->popup" not in summary and "capture->display" not in summary
+    assert MAGGI[0] in app.cart
+
+
+def test_search_panel_adds_are_not_traced(app):
+    app.add_searched_product(MAGGI)
+    app._active_popup.confirm()
+    app._on_cart_rendered({MAGGI[0]})
+    assert app.latency.summary() == {}
+    assert not app._awaiting_display
@@ -0,0 +1,125 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import scanner
+from frame_sources import FrameSource
+from scanner import ScannerEngine, ScannerService
+
+CONFIG = {"decoder": "opencv", "stats_interval": 0, "motion_gate": False}
+
+
+class FakeCamera(FrameSource):
+    """Blank frames every few ms; read() blocks while `stuck` is cleared."""
+
+    def __init__(self):
+        self.reads = 0
+        self.released = False
+        self.stuck = threading.Event()
+        self.stuck.set()
+
+    def isOpened(self):
+        # Like ImageDirectorySource, still "open" after release()
+        return True
+
+    def read(self):
+        self.stuck.wait()
+        time.sleep(0.005)
+        self.reads += 1
+        return True, np.zeros((60, 80, 3), np.uint8)
+
+    def release(self):
+        self.released = True
+
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def cameras(monkeypatch):
+    opened = []
+
+    def open_source(spec, realtime=True, loop=False):
+        opened.append(FakeCamera())
+        return opened[-1]
+
+    monkeypatch.setattr(scanner, "open_source", open_source)
+    return opened
+
+
+@pytest.fixture
+def service(cameras):
+    service = ScannerService(lambda barcode, frame: None, CONFIG)
+    yield service
+    service.stop()
+
+
+def test_start_is_idempotent(service, cameras):
+    assert service.start() and service.start()
+    assert service.state == "running"
+    assert len(cameras) == 1
+    assert len(service.engine._threads) == 1 + scanner.SCANNER_CONFIG["decode_workers"]
+
+
+def test_pause_keeps_the_camera_open_and_resume_continues(service, cameras):
+    service.start()
+    assert wait_for(lambda: cameras[0].reads > 0)
+    service.pause()
+    assert service.state == "paused"
+    time.sleep(0.05)
+    reads = cameras[0].reads
+    time.sleep(0.1)
+    assert cameras[0].reads == reads and not cameras[0].released
+    assert service.resume()
+    assert service.state == "running"
+    assert wait_for(lambda: cameras[0].reads > reads)
+    assert len(cameras) == 1
+
+
+def test_stop_releases_the_camera_and_start_reopens_it(service, cameras):
+    service.start()
+    service.stop()
+    service.stop()
+    assert service.state == "stopped" and cameras[0].released
+    assert service.start()
+    assert len(cameras) == 2 and service.state == "running"
+
+
+def test_pause_while_stopped_does_nothing(service, cameras):
+    service.pause()
+    assert service.state == "stopped" and not cameras
+
+
+def test_no_restart_while_a_stuck_capture_thread_is_alive(cameras):
+    engine = ScannerEngine(lambda barcode, frame: None, CONFIG)
+    assert engine.start()
+    assert wait_for(lambda: cameras[0].reads > 0)
+    cameras[0].stuck.clear()
+    time.sleep(0.05)
+    engine.stop(timeout=0.1)
+    assert engine.stopping
+    assert not engine.start()
+    assert len(cameras) == 1
+
+    cameras[0].stuck.set()
+    assert wait_for(lambda: not engine.running)
+    assert engine.start()
+    engine.stop()
+    assert len(cameras) == 2
+
+
+def test_a_caller_supplied_source_serves_one_run():
+    camera = FakeCamera()
+    engine = ScannerEngine(lambda barcode, frame: None, CONFIG, source=camera)
+    assert engine.start()
+    engine.stop()
+    assert camera.released
+    assert not engine.start()
@@ -0,0 +1,59 @@
+import pytest
+
+from scanner import SCANNER_CONFIG, ScannerEngine
+from symbology import SymbologyProfile, gtin_check_digit, is_valid_gtin, symbology_for
+
+
+@pytest.mark.parametrize("code", ["4006381333931", "96385074", "036000291452", "5901234123457"])
+def test_valid_gtins(code):
+    assert gtin_check_digit(code[:-1]) == int(code[-1])
+    assert is_valid_gtin(code)
+
+
+@pytest.mark.parametrize("code", ["4006381333932", "400638133393", "40063813339a1", ""])
+def test_invalid_gtins(code):
+    assert not is_valid_gtin(code)
+
+
+def test_symbology_for():
+    assert symbology_for("4006381333931") == "EAN13"
+    assert symbology_for("036000291452") == "UPCA"
+    assert symbology_for("96385074") == "EAN8"
+    assert symbology_for("4006381333932") == "CODE128"
+    assert symbology_for("SKU-42") == "CODE128"
+
+
+def test_seed_catalog_keeps_qr_and_ean13(cart_db):
+    profile = SymbologyProfile.from_database(cart_db, SCANNER_CONFIG["extra_symbols"])
+    assert {"QRCODE", "EAN13", "CODE128"} <= set(profile.symbols)
+    assert profile.accepts("any text at all", "QRCODE")
+    assert profile.accepts("8901057512345", "CODE128")
+
+
+def test_reads_that_cannot_be_catalog_codes_are_rejected():
+    profile = SymbologyProfile(["4006381333931", "SKU-42"])
+    assert profile.accepts("4006381333931", "EAN13")
+    assert not profile.accepts("4006381333932", "EAN13")     # bad check digit
+    assert not profile.accepts("96385074", "EAN13")          # wrong length
+    assert not profile.accepts("SKU-42", "QRCODE")           # symbology not in the profile
+    assert profile.accepts("SKU-43", "CODE128")
+
+
+def test_describe_round_trips_through_a_snapshot_description():
+    profile = SymbologyProfile(["4006381333931", "SKU-42"], ["QRCODE"])
+
+    class Snapshot:
+        symbology = profile.describe()
+
+    restored = SymbologyProfile.for_catalog(Snapshot(), ["QRCODE"])
+    assert restored.symbols == profile.symbols
+    assert restored.describe() == profile.describe()
+
+
+def test_engine_swaps_profile_and_decoder():
+    engine = ScannerEngine(lambda barcode, frame: None, {"decoder": "opencv"},
+                           profile=SymbologyProfile(["SKU-42"]))
+    assert engine.decoder.symbols == ["CODE128"]
+    engine.set_profile(SymbologyProfile(["4006381333931"], ["QRCODE"]))
+    assert engine.decoder.symbols == ["EAN13", "QRCODE"]
+    assert engine.profile.accepts("4006381333931", "EAN13")
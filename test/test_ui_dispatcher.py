@@ -0,0 +1,62 @@
+from ui_dispatcher import ScanEventQueue
+
+
+class FakeWidget:
+    """Stands in for a Tk widget: after() callbacks run only when run_pending() is called."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.next_id = 0
+
+    def after(self, ms, callback):
+        self.next_id += 1
+        self.jobs[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run_pending(self):
+        jobs, self.jobs = self.jobs, {}
+        for callback in jobs.values():
+            callback()
+
+
+def test_events_are_delivered_in_batches():
+    widget, batches = FakeWidget(), []
+    queue = ScanEventQueue(widget, batches.append)
+    queue.start()
+    queue.post("111")
+    queue.post("222")
+    widget.run_pending()
+    queue.post("333")
+    widget.run_pending()
+    assert [[e.barcode for e in batch] for batch in batches] == [["111", "222"], ["333"]]
+    assert queue.latency_summary()["batches"] == 2
+
+
+def test_failing_handler_does_not_stop_delivery(capsys):
+    widget, delivered = FakeWidget(), []
+
+    def handler(events):
+        if not delivered:
+            delivered.append(None)
+            raise RuntimeError("lookup failed")
+        delivered.extend(e.barcode for e in events)
+
+    queue = ScanEventQueue(widget, handler)
+    queue.start()
+    queue.post("111")
+    widget.run_pending()
+    queue.post("222")
+    widget.run_pending()
+    assert delivered == [None, "222"]
+    assert "lookup failed" in capsys.readouterr().err
+
+
+def test_stop_cancels_the_tick():
+    widget = FakeWidget()
+    queue = ScanEventQueue(widget, lambda events: None)
+    queue.start()
+    queue.stop()
+    assert widget.jobs == {}
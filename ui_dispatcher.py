@@ -0,0 +1,77 @@
+import threading
+import time
+import traceback
+from collections import deque, namedtuple
+
+from latency import LatencyHistogram
+
+# A barcode handed from the scanner to the UI, with timestamps (time.monotonic)
+ScanEvent = namedtuple("ScanEvent", ["barcode", "captured_at", "enqueued_at"])
+
+
+class ScanEventQueue:
+    """Coalesces scan events from scanner threads into batched Tk updates.
+
+    Scanner threads call post() instead of scheduling their own after(0, ...)
+    callbacks. The Tk loop drains everything pending every tick_ms and hands
+    the whole batch to handler(events), so a burst of scans costs one lookup
+    round and one UI update instead of flooding the Tk event queue.
+
+    Latency is recorded on both sides of the queue: capture -> enqueue
+    (scanner side) and enqueue -> handled (UI side).
+    """
+
+    def __init__(self, widget, handler, tick_ms=50):
+        self.widget = widget
+        self.handler = handler
+        self.tick_ms = tick_ms
+        self.scanner_side = LatencyHistogram()
+        self.ui_side = LatencyHistogram()
+        self.batches = 0
+        self._events = deque()
+        self._lock = threading.Lock()
+        self._job = None
+
+    def post(self, barcode, captured_at=None):
+        """Thread-safe; never touches Tk."""
+        now = time.monotonic()
+        captured_at = now if captured_at is None else captured_at
+        with self._lock:
+            self._events.append(ScanEvent(barcode, captured_at, now))
+            self.scanner_side.record(now - captured_at)
+
+    def start(self):
+        if self._job is None:
+            self._tick()
+
+    def stop(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def latency_summary(self):
+        with self._lock:
+            return {"scanner_side": self.scanner_side.summary(), "ui_side": self.ui_side.summary(), "batches": self.batches}
+
+    def _drain(self):
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+        return events
+
+    def _tick(self):
+        events = self._drain()
+        try:
+            if events:
+                self.handler(events)
+        except Exception:
+            # A failing batch is reported, but must not stop later scans being delivered
+            traceback.print_exc()
+        finally:
+            if events:
+                done = time.monotonic()
+                with self._lock:
+                    self.batches += 1
+                    for event in events:
+                        self.ui_side.record(done - event.enqueued_at)
+            self._job = self.widget.after(self.tick_ms, self._tick)
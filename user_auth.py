@@ -6,6 +6,7 @@ from supabase import create_client
 import os
 import datetime
 from payment_page import PaymentPage
+from database import get_connection, transaction
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -96,8 +97,7 @@ class EmailPage(tk.Frame):
         
         # Sync with SQLite
         try:
-            conn = sqlite3.connect("cart_database.db")
-            cursor = conn.cursor()
+            cursor = get_connection().cursor()
             
             # Save to local AuthApp and global MainApp
             self.controller.shared_data["email"] = email
@@ -105,7 +105,6 @@ class EmailPage(tk.Frame):
             
             cursor.execute("SELECT username, phone_no FROM users WHERE email=?", (email,))
             result = cursor.fetchone()
-            conn.close()
 
             if result:
                 self.controller.shared_data["username"] = result[0]
@@ -164,23 +163,20 @@ class RegisterPage(tk.Frame):
             self.controller.controller.shared_data["user_info"]["name"] = username
             self.controller.controller.shared_data["user_info"]["phone"] = mobile
             total_amount = main_app.shared_data["cart_info"].get("grand_total", 0.0)
-            user_data = (mobile, username, email, mobile, "NULL", "NULL", total_amount, "NULL", "NULL", "0", "2025-12-23 19:21:06.361401+00")
+            user_data = (mobile, username, email, mobile, None, None, total_amount, None, None, 0, "2025-12-23 19:21:06.361401+00")
                         
             try:
-                conn = sqlite3.connect("cart_database.db")
-                cursor = conn.cursor()
                 # url = os.getenv("SUPABASE_URL")
                 # key = os.getenv("SUPABASE_KEY")
                 # supabase = create_client(url, key)
 
-                cursor.execute("""
-                    INSERT INTO users
-                        (id, username, email, phone_no, last_time_spend, avg_time, last_spend, avg_spend,
-                        last_purchase, total_purchase, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, user_data)
-                conn.commit()
-                conn.close()
+                with transaction() as conn:
+                    conn.execute("""
+                        INSERT INTO users
+                            (id, username, email, phone_no, last_time_spend, avg_time, last_spend, avg_spend,
+                            last_purchase, total_purchase, created_at)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            """, user_data)
                 # currentDate = datetime.datetime.now()
                 # user_info = {"id": mobile, "username": username,"email": email, "phoneNumber": mobile, "last_purchase": str(currentDate)}
                 # response = supabase.table("users").insert(user_info).execute()